@@ -0,0 +1,173 @@
+"""Shake analytics over the composited rotation of a camera's layers.
+
+Requires NumPy. All layers are sampled for the whole frame range at once and
+composed with `evaluate`, so no scene time needs to be changed.
+"""
+
+from __future__ import annotations
+
+import csv
+import dataclasses
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+
+from shot_shaker import evaluate
+from shot_shaker.curves import Curve
+
+# Frames are reported as spikes when their angular speed or acceleration
+# exceeds this multiple of its RMS over the range.
+SPIKE_FACTOR = 3
+
+CSV_FIELDS = (
+    'camera',
+    'start_frame',
+    'end_frame',
+    'threshold',
+    'peak_x',
+    'peak_y',
+    'peak_z',
+    'rms_x',
+    'rms_y',
+    'rms_z',
+    'peak_angle',
+    'peak_velocity',
+    'peak_acceleration',
+    'velocity_spikes',
+    'acceleration_spikes',
+    'frames_over',
+)
+
+
+@dataclasses.dataclass
+class ShakeStats:
+    start_frame: int
+    end_frame: int
+    threshold: float
+    # Per axis in degrees.
+    peak: tuple[float, float, float]
+    rms: tuple[float, float, float]
+    # Largest total rotation in degrees.
+    peak_angle: float
+    # Angular speed in degrees/second and acceleration in degrees/second².
+    peak_velocity: float
+    peak_acceleration: float
+    velocity_spikes: tuple[int, ...]
+    acceleration_spikes: tuple[int, ...]
+    # Frames whose total rotation exceeds the threshold.
+    frames_over: tuple[int, ...]
+
+    def to_row(self) -> dict:
+        return {
+            'start_frame': self.start_frame,
+            'end_frame': self.end_frame,
+            'threshold': self.threshold,
+            'peak_x': self.peak[0],
+            'peak_y': self.peak[1],
+            'peak_z': self.peak[2],
+            'rms_x': self.rms[0],
+            'rms_y': self.rms[1],
+            'rms_z': self.rms[2],
+            'peak_angle': self.peak_angle,
+            'peak_velocity': self.peak_velocity,
+            'peak_acceleration': self.peak_acceleration,
+            'velocity_spikes': frame_ranges(self.velocity_spikes),
+            'acceleration_spikes': frame_ranges(self.acceleration_spikes),
+            'frames_over': frame_ranges(self.frames_over),
+        }
+
+
+def composite(
+    layers: Sequence[tuple[Sequence[Curve], float | Curve]], times: np.ndarray
+) -> np.ndarray:
+    """Compose weighted layer curves into quaternions of shape (frames, 4).
+
+    Weights are either constant or animated curves.
+    """
+
+    result = np.zeros((len(times), 4))
+    result[:, 0] = 1
+    for curves, weight in layers:
+        rotation = evaluate.euler_to_quaternion(evaluate.sample_rotation(curves, times))
+        weight = evaluate.sample_weight(weight, times)
+        result = evaluate.multiply(result, evaluate.weighted(rotation, weight))
+    return result
+
+
+def analyze(
+    layers: Sequence[tuple[Sequence[Curve], float | Curve]],
+    start_frame: int,
+    end_frame: int,
+    fps: float,
+    threshold: float,
+) -> ShakeStats:
+    """Analyze the shake of weighted layer curves between two frames."""
+
+    frames = np.arange(start_frame, end_frame + 1)
+    times = frames / fps
+    quaternions = composite(layers, times)
+    angles = evaluate.quaternion_to_euler(quaternions)
+    angles = np.degrees(np.unwrap(np.radians(angles), axis=0))
+    # Total rotation angle of every frame.
+    w = np.clip(np.abs(quaternions[:, 0]), 0, 1)
+    total = np.degrees(2 * np.arccos(w))
+
+    if len(frames) > 1:
+        velocity = np.gradient(angles, times, axis=0)
+        acceleration = np.gradient(velocity, times, axis=0)
+    else:
+        velocity = acceleration = np.zeros_like(angles)
+    speed = np.linalg.norm(velocity, axis=1)
+    acceleration = np.linalg.norm(acceleration, axis=1)
+
+    return ShakeStats(
+        start_frame=start_frame,
+        end_frame=end_frame,
+        threshold=threshold,
+        peak=tuple(np.abs(angles).max(axis=0).tolist()),
+        rms=tuple(np.sqrt(np.mean(angles**2, axis=0)).tolist()),
+        peak_angle=float(total.max()),
+        peak_velocity=float(speed.max()),
+        peak_acceleration=float(acceleration.max()),
+        velocity_spikes=_spikes(frames, speed),
+        acceleration_spikes=_spikes(frames, acceleration),
+        frames_over=tuple(frames[total > threshold].tolist()),
+    )
+
+
+def _spikes(frames: np.ndarray, values: np.ndarray) -> tuple[int, ...]:
+    rms = np.sqrt(np.mean(values**2))
+    if not rms:
+        return ()
+    return tuple(frames[values > SPIKE_FACTOR * rms].tolist())
+
+
+def frame_ranges(frames: Sequence[int]) -> str:
+    """Format frames as ranges, e.g. '1-3 7 9-10'."""
+
+    ranges = []
+    start = previous = None
+    for frame in frames:
+        if previous is not None and frame == previous + 1:
+            previous = frame
+            continue
+        if start is not None:
+            ranges.append(_format_range(start, previous))
+        start = previous = frame
+    if start is not None:
+        ranges.append(_format_range(start, previous))
+    return ' '.join(ranges)
+
+
+def _format_range(start: int, end: int) -> str:
+    return str(start) if start == end else f'{start}-{end}'
+
+
+def write_csv(path: str, stats: Iterable[tuple[str, ShakeStats]]) -> None:
+    """Write a row of stats per camera name."""
+
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for name, camera_stats in stats:
+            writer.writerow({'camera': name, **camera_stats.to_row()})
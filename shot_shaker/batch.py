@@ -0,0 +1,307 @@
+"""Apply shake presets to cameras across many scene files without the GUI.
+
+A manifest lists jobs, each applying a preset to the cameras of a scene that
+match a name pattern:
+
+    {
+        "jobs": [
+            {
+                "scene": "D:/shots/sh010.max",
+                "cameras": "sh010_cam*",
+                "preset": "D:/presets/Handheld.fbx",
+                "start_frame": 1001,
+                "weight": 0.5
+            }
+        ]
+    }
+
+Every scene is opened once by a 3dsmaxbatch worker process, which applies all
+jobs of that scene, saves it and writes a report. Scenes are processed by up to
+`--workers` processes at a time.
+
+Usage: python -m shot_shaker.batch MANIFEST [--workers N] [--report FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import dataclasses
+import json
+import logging
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+from collections.abc import Iterable, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Script run by 3dsmaxbatch for every scene.
+WORKER_SCRIPT = os.path.join(os.path.dirname(__file__), 'batch_worker.py')
+
+
+class BatchError(Exception):
+    pass
+
+
+@dataclasses.dataclass
+class BatchJob:
+    scene: str
+    preset: str
+    # Case-insensitive wildcard pattern of the camera names.
+    cameras: str = '*'
+    start_frame: int = 0
+    weight: float = 1
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BatchJob:
+        fields = {field.name for field in dataclasses.fields(cls)}
+        unknown = set(data) - fields
+        if unknown:
+            raise BatchError(f'Unknown job keys: {", ".join(sorted(unknown))}')
+        try:
+            return cls(**data)
+        except TypeError as e:
+            raise BatchError(f'Invalid job {data}: {e}') from None
+
+
+@dataclasses.dataclass
+class JobReport:
+    job: BatchJob
+    # Created layers as {'camera': name, 'layer': name} in camera order. Names
+    # of cameras are not unique, so a camera can be listed more than once.
+    layers: list[dict[str, str]] = dataclasses.field(default_factory=list)
+    errors: list[str] = dataclasses.field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {
+            'job': dataclasses.asdict(self.job),
+            'ok': self.ok,
+            'layers': self.layers,
+            'errors': self.errors,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> JobReport:
+        return cls(
+            job=BatchJob.from_dict(data['job']),
+            layers=list(data.get('layers', [])),
+            errors=list(data.get('errors', [])),
+        )
+
+
+def load_manifest(path: str) -> tuple[BatchJob, ...]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BatchError(f'Could not read manifest {path!r}: {e}') from None
+    if not isinstance(data, dict) or not isinstance(data.get('jobs'), list):
+        raise BatchError(f'The manifest {path!r} has no list of jobs.')
+    return tuple(BatchJob.from_dict(job) for job in data['jobs'])
+
+
+def write_manifest(path: str, jobs: Iterable[BatchJob]) -> None:
+    data = {'jobs': [dataclasses.asdict(job) for job in jobs]}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def group_jobs(jobs: Iterable[BatchJob]) -> dict[str, list[BatchJob]]:
+    """Group jobs by scene, keeping the order of jobs within a scene."""
+
+    scenes = {}
+    for job in jobs:
+        scene = os.path.normcase(os.path.abspath(job.scene))
+        scenes.setdefault(scene, []).append(job)
+    return scenes
+
+
+# Worker
+
+
+def apply_jobs(scene: str, jobs: Sequence[BatchJob]) -> list[JobReport]:
+    """Open `scene`, apply all jobs in a single pass and save it.
+
+    Runs inside 3ds Max. Undo is disabled since the scene is saved right away.
+    """
+
+    from pymxs import runtime as rt
+
+    from shot_shaker import core, lib
+
+    reports = [JobReport(job=job) for job in jobs]
+    if not rt.loadMaxFile(scene, quiet=True):
+        for report in reports:
+            report.errors.append(f'Could not open {scene!r}.')
+        return reports
+
+    with lib.transaction(undo=False, redraw=False):
+        for report in reports:
+            job = report.job
+            cameras = core.get_cameras(pattern=job.cameras)
+            if not cameras:
+                report.errors.append(f'No cameras match {job.cameras!r}.')
+                continue
+            data = core.CreateShakeData(
+                preset=job.preset, start_frame=job.start_frame, weight=job.weight
+            )
+            try:
+                results = core.create_shakes(cameras, data)
+            except (RuntimeError, core.ShakeError) as e:
+                report.errors.append(str(e))
+                continue
+            for result in results:
+                if result.error:
+                    report.errors.append(f'{result.camera.name}: {result.error}')
+                else:
+                    report.layers.append(
+                        {'camera': result.camera.name, 'layer': result.layer}
+                    )
+
+    if not rt.saveMaxFile(scene, quiet=True):
+        for report in reports:
+            report.errors.append(f'Could not save {scene!r}.')
+    return reports
+
+
+def worker_main(manifest_path: str, report_path: str) -> int:
+    """Apply the jobs of a manifest holding a single scene and write the report."""
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    jobs = load_manifest(manifest_path)
+    reports = []
+    for scene, scene_jobs in group_jobs(jobs).items():
+        reports.extend(apply_jobs(scene, scene_jobs))
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump([report.to_dict() for report in reports], f, indent=2)
+    return 0 if all(report.ok for report in reports) else 1
+
+
+# Driver
+
+
+def default_maxbatch() -> list[str]:
+    return shlex.split(os.environ.get('SHOT_SHAKER_MAXBATCH', '3dsmaxbatch'))
+
+
+def run_scene(
+    jobs: Sequence[BatchJob],
+    maxbatch: Sequence[str],
+    timeout: float | None = None,
+) -> list[JobReport]:
+    """Run the jobs of one scene in a 3dsmaxbatch process."""
+
+    with tempfile.TemporaryDirectory(prefix='shot_shaker_') as temp_dir:
+        manifest_path = os.path.join(temp_dir, 'manifest.json')
+        report_path = os.path.join(temp_dir, 'report.json')
+        write_manifest(manifest_path, jobs)
+        command = [
+            *maxbatch,
+            WORKER_SCRIPT,
+            '-mxsString',
+            f'manifest:{manifest_path}',
+            '-mxsString',
+            f'report:{report_path}',
+        ]
+        logger.debug(f'Running {command}')
+        error = ''
+        try:
+            process = subprocess.run(
+                command, capture_output=True, text=True, timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            error = f'Worker failed: {e}'
+        else:
+            if process.returncode and not os.path.exists(report_path):
+                output = (process.stderr or process.stdout).strip()
+                logger.debug(output)
+                last_line = output.splitlines()[-1] if output else ''
+                error = f'Worker exited with {process.returncode}: {last_line}'
+
+        if not error:
+            try:
+                with open(report_path, 'r', encoding='utf-8') as f:
+                    return [JobReport.from_dict(data) for data in json.load(f)]
+            except (OSError, ValueError, KeyError, BatchError) as e:
+                error = f'Could not read the worker report: {e}'
+    return [JobReport(job=job, errors=[error]) for job in jobs]
+
+
+def run(
+    jobs: Iterable[BatchJob],
+    workers: int = 2,
+    maxbatch: Sequence[str] | None = None,
+    timeout: float | None = None,
+) -> list[JobReport]:
+    """Run all jobs with up to `workers` scenes processed at a time.
+
+    Reports are returned in the order of the jobs.
+    """
+
+    jobs = tuple(jobs)
+    if maxbatch is None:
+        maxbatch = default_maxbatch()
+
+    reports: dict[int, JobReport] = {}
+    indexes = {id(job): i for i, job in enumerate(jobs)}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_scene, scene_jobs, maxbatch, timeout): scene_jobs
+            for scene_jobs in group_jobs(jobs).values()
+        }
+        for future in concurrent.futures.as_completed(futures):
+            scene_jobs = futures[future]
+            for job, report in zip(scene_jobs, future.result()):
+                if report.ok:
+                    logger.info(f'{job.scene}: {len(report.layers)} layers created')
+                else:
+                    for error in report.errors:
+                        logger.error(f'{job.scene}: {error}')
+                reports[indexes[id(job)]] = report
+    return [reports[i] for i in range(len(jobs))]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m shot_shaker.batch',
+        description='Apply shake presets to the cameras of many scene files.',
+    )
+    parser.add_argument('manifest', help='JSON file listing the jobs')
+    parser.add_argument(
+        '--workers', type=int, default=2, help='number of scenes processed at a time'
+    )
+    parser.add_argument('--report', help='JSON file to write the job reports to')
+    parser.add_argument(
+        '--maxbatch',
+        help='3dsmaxbatch command, defaults to $SHOT_SHAKER_MAXBATCH or 3dsmaxbatch',
+    )
+    parser.add_argument('--timeout', type=float, help='seconds allowed per scene')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    try:
+        jobs = load_manifest(args.manifest)
+    except BatchError as e:
+        logger.error(e)
+        return 2
+
+    maxbatch = shlex.split(args.maxbatch) if args.maxbatch else None
+    reports = run(jobs, args.workers, maxbatch, args.timeout)
+    data = [report.to_dict() for report in reports]
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+    else:
+        json.dump(data, sys.stdout, indent=2)
+    return 0 if all(report.ok for report in reports) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
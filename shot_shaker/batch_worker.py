@@ -0,0 +1,19 @@
+"""Entry point run by 3dsmaxbatch for a single scene of a batch.
+
+Expects the `manifest` and `report` paths as -mxsString arguments.
+"""
+
+import os
+import sys
+
+from pymxs import runtime as rt
+
+path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+from shot_shaker import batch  # noqa: E402
+
+args = rt.maxOps.mxsCmdLineArgs
+code = batch.worker_main(str(args[rt.Name('manifest')]), str(args[rt.Name('report')]))
+rt.quitMax(rt.Name('noPrompt'), exitCode=code)
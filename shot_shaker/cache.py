@@ -0,0 +1,228 @@
+"""Process-wide caches.
+
+This module is skipped by `lib.reload()` so cached data survives reloading the
+package. Keep it free of imports from the rest of the package.
+"""
+
+from __future__ import annotations
+
+import collections
+import dataclasses
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 64 * 1024 * 1024
+
+
+def nbytes(value: Any) -> int:
+    """Estimate the memory used by the arrays in `value`."""
+
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(nbytes(v) for v in value.values())
+    if dataclasses.is_dataclass(value):
+        return sum(nbytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    try:
+        return memoryview(value).nbytes
+    except TypeError:
+        return 8
+
+
+@dataclasses.dataclass
+class _Entry:
+    mtime: int
+    size: int
+    value: Any
+    nbytes: int
+
+
+class FileCache:
+    """LRU cache of data decoded from files, keyed by path, mtime and size."""
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: collections.OrderedDict[str, _Entry] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path: str) -> bool:
+        return self._lookup(os.path.abspath(path), count=False) is not None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry.nbytes for entry in self._entries.values())
+
+    def get(self, path: str, loader: Callable[[str], Any]) -> Any:
+        path = os.path.abspath(path)
+        entry = self._lookup(path)
+        if entry is not None:
+            return entry.value
+
+        stat = os.stat(path)
+        value = loader(path)
+        entry = _Entry(stat.st_mtime_ns, stat.st_size, value, nbytes(value))
+        with self._lock:
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            self._evict()
+        return value
+
+    def set_budget(self, budget: int) -> None:
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self._entries),
+            'nbytes': self.nbytes,
+            'budget': self.budget,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _lookup(self, path: str, count: bool = True) -> _Entry | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            stat = None
+        with self._lock:
+            entry = self._entries.get(path)
+            if (
+                entry is not None
+                and stat is not None
+                and entry.mtime == stat.st_mtime_ns
+                and entry.size == stat.st_size
+            ):
+                if count:
+                    self.hits += 1
+                    self._entries.move_to_end(path)
+                return entry
+            if entry is not None:
+                del self._entries[path]
+            if count:
+                self.misses += 1
+        return None
+
+    def _evict(self) -> None:
+        # The most recent entry is always kept, even if it exceeds the budget.
+        total = self.nbytes
+        while total > self.budget and len(self._entries) > 1:
+            path, entry = self._entries.popitem(last=False)
+            total -= entry.nbytes
+            self.evictions += 1
+            logger.debug(f'Evicted {path!r} from cache.')
+
+
+@dataclasses.dataclass
+class _Snapshot:
+    scene: str
+    revision: int
+    value: Any
+
+
+class SceneCache:
+    """Snapshots of scene nodes keyed by scene path and anim handle.
+
+    Every node has a revision that `touch` increments whenever the node changes.
+    A snapshot is valid while the scene path and the revision of its node are
+    unchanged. Revisions are only counted while `tracker` is set, so nothing is
+    cached without it. `reset` drops everything when a scene is opened or reset,
+    since anim handles are reassigned.
+    """
+
+    def __init__(self) -> None:
+        # Object that reports node changes, e.g. a NodeEventCallback. It is kept
+        # here so it survives reloading the package.
+        self.tracker: Any = None
+        self.hits = 0
+        self.misses = 0
+        self._revisions: dict[int, int] = {}
+        self._snapshots: dict[int, _Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def tracking(self) -> bool:
+        return self.tracker is not None
+
+    def revision(self, handle: int) -> int:
+        return self._revisions.get(handle, 0)
+
+    def touch(self, event: Any, handles: Iterable[int]) -> None:
+        with self._lock:
+            for handle in handles:
+                self._revisions[handle] = self._revisions.get(handle, 0) + 1
+
+    def get(self, scene: str, handle: int) -> Any:
+        with self._lock:
+            snapshot = self._snapshots.get(handle)
+            if (
+                snapshot is not None
+                and self.tracking
+                and snapshot.scene == scene
+                and snapshot.revision == self._revisions.get(handle, 0)
+            ):
+                self.hits += 1
+                return snapshot.value
+            if snapshot is not None:
+                del self._snapshots[handle]
+            self.misses += 1
+        return None
+
+    def has(self, handle: int) -> bool:
+        """Return whether a snapshot was stored for `handle`, even if outdated."""
+
+        return handle in self._snapshots
+
+    def set(self, scene: str, handle: int, revision: int, value: Any) -> None:
+        """Store a snapshot read while the node was at `revision`."""
+
+        if not self.tracking:
+            return
+        with self._lock:
+            self._snapshots[handle] = _Snapshot(scene, revision, value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._revisions.clear()
+            self._snapshots.clear()
+
+    def clear(self) -> None:
+        self.reset()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'entries': len(self._snapshots),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+presets = FileCache()
+scenes = SceneCache()
@@ -0,0 +1,129 @@
+"""Animated channels of a shake preset.
+
+Presets hold the curves of any of the channels below by channel name, e.g.
+`{'rotation': (x, y, z), 'fov': (fov,)}`. Every channel is read from an FBX
+property and transferred onto the layer of the matching track of a camera.
+Angles are in degrees, the FOV is horizontal like in 3ds Max and distances are
+in centimeters.
+
+Layers add their values to the camera. The FOV and target distance of a preset
+camera are absolute, so `to_offsets` makes them relative to their first key
+before they are added.
+"""
+
+from __future__ import annotations
+
+import array
+import dataclasses
+from collections.abc import Mapping, Sequence
+
+from shot_shaker.curves import Curve
+
+XYZ = ('d|X', 'd|Y', 'd|Z')
+
+
+@dataclasses.dataclass(frozen=True)
+class Channel:
+    name: str
+    # FBX property holding the animation and the curve names of its axes.
+    fbx_property: str
+    fbx_axes: tuple[str, ...]
+    # Property of the camera the channel is transferred to, either on the
+    # transform controller or on the camera object.
+    track: str
+    object_track: bool = False
+    # Whether presets hold absolute values instead of offsets.
+    absolute: bool = False
+    # Whether the values are distances.
+    distance: bool = False
+
+    @property
+    def size(self) -> int:
+        return len(self.fbx_axes)
+
+
+ROTATION = Channel('rotation', 'Lcl Rotation', XYZ, 'Rotation')
+POSITION = Channel('position', 'Lcl Translation', XYZ, 'Position', distance=True)
+FOV = Channel(
+    'fov', 'FieldOfView', ('d|FieldOfView',), 'fov', object_track=True, absolute=True
+)
+TARGET_DISTANCE = Channel(
+    'target_distance',
+    'FocusDistance',
+    ('d|FocusDistance',),
+    'targetDistance',
+    object_track=True,
+    absolute=True,
+    distance=True,
+)
+CHANNELS = (POSITION, ROTATION, FOV, TARGET_DISTANCE)
+BY_NAME = {channel.name: channel for channel in CHANNELS}
+
+
+def flatten(
+    channels: Mapping[str, Sequence[Curve]],
+) -> tuple[list[Curve], list[int]]:
+    """Return the curves of all channels in order and the axis of every curve."""
+
+    curves = []
+    axes = []
+    for channel_curves in channels.values():
+        curves.extend(channel_curves)
+        axes.extend(range(len(channel_curves)))
+    return curves, axes
+
+
+def unflatten(
+    channels: Mapping[str, Sequence[Curve]], curves: Sequence[Curve]
+) -> dict[str, tuple[Curve, ...]]:
+    """Split `curves`, ordered like `flatten(channels)`, back into channels."""
+
+    result = {}
+    offset = 0
+    for name, channel_curves in channels.items():
+        size = len(channel_curves)
+        result[name] = tuple(curves[offset : offset + size])
+        offset += size
+    return result
+
+
+def to_offsets(channels: Mapping[str, Sequence[Curve]]) -> dict[str, tuple[Curve, ...]]:
+    """Return the channels with the curves of absolute channels moved so their
+    first key is 0. Channels that already are offsets are returned as is.
+    """
+
+    result = {}
+    for name, curves in channels.items():
+        channel = BY_NAME.get(name)
+        if channel is not None and channel.absolute:
+            curves = tuple(
+                _transform(curve, offset=-curve.values[0]) if len(curve) else curve
+                for curve in curves
+            )
+        result[name] = tuple(curves)
+    return result
+
+
+def scale_distances(
+    channels: Mapping[str, Sequence[Curve]], factor: float
+) -> dict[str, tuple[Curve, ...]]:
+    """Return the channels with all distances multiplied by `factor`, e.g. to
+    convert centimeters to system units.
+    """
+
+    result = {}
+    for name, curves in channels.items():
+        channel = BY_NAME.get(name)
+        if channel is not None and channel.distance and factor != 1:
+            curves = tuple(_transform(curve, scale=factor) for curve in curves)
+        result[name] = tuple(curves)
+    return result
+
+
+def _transform(curve: Curve, scale: float = 1, offset: float = 0) -> Curve:
+    return Curve(
+        times=curve.times,
+        values=array.array('d', (v * scale + offset for v in curve.values)),
+        in_tangents=array.array('d', (t * scale for t in curve.in_tangents)),
+        out_tangents=array.array('d', (t * scale for t in curve.out_tangents)),
+    )
@@ -0,0 +1,170 @@
+"""Binary format of compiled presets.
+
+A compiled preset stores the curves of all channels of a preset next to its
+source with the `.shake` extension. The layout is little-endian:
+
+- header: magic `SHAK`, uint16 version, uint16 channel count
+- per channel: uint8 name length, utf-8 name, uint8 axis count, padded with
+  zeros to a multiple of 4 bytes after the last channel
+- uint32 key count per axis of all channels
+- per axis: float32 times, values, in tangents and out tangents
+
+Version 1 files have no channel table and hold the rotation axes only.
+Version 2 files held distances in the units of the FBX file and the FOV as
+stored in it, they are not supported.
+
+Times are in seconds and tangents in units/second, like `Curve`. Compiled
+files are read in a single call and the curves reference the read bytes
+without copying them. Use `shot_shaker.compiler` to create them.
+"""
+
+from __future__ import annotations
+
+import array
+import os
+import struct
+import sys
+from collections.abc import Mapping, Sequence
+
+from shot_shaker.curves import Curve
+
+EXTENSION = '.shake'
+MAGIC = b'SHAK'
+VERSION = 3
+HEADER = struct.Struct('<4sHH')
+FIELDS = ('times', 'values', 'in_tangents', 'out_tangents')
+
+
+class FormatError(Exception):
+    pass
+
+
+def compiled_path(path: str) -> str:
+    name, ext = os.path.splitext(path)
+    return name + EXTENSION
+
+
+def is_up_to_date(path: str) -> bool:
+    """Return whether the compiled file of `path` is newer than the source."""
+
+    try:
+        return os.stat(compiled_path(path)).st_mtime_ns >= os.stat(path).st_mtime_ns
+    except OSError:
+        return False
+
+
+def read_version(path: str) -> int | None:
+    """Return the version of a compiled preset, or None if it is not one."""
+
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, _ = HEADER.unpack(header)
+    return version if magic == MAGIC else None
+
+
+def encode(channels: Mapping[str, Sequence[Curve]]) -> bytes:
+    chunks = [HEADER.pack(MAGIC, VERSION, len(channels))]
+    table = bytearray()
+    for name, curves in channels.items():
+        data = name.encode('utf-8')
+        table += struct.pack('<B', len(data)) + data + struct.pack('<B', len(curves))
+    table += bytes(-len(table) % 4)
+    chunks.append(bytes(table))
+
+    curves = [curve for channel_curves in channels.values() for curve in channel_curves]
+    chunks.append(struct.pack(f'<{len(curves)}I', *(len(curve) for curve in curves)))
+    for curve in curves:
+        for field in FIELDS:
+            data = array.array('f', getattr(curve, field))
+            if sys.byteorder != 'little':
+                data.byteswap()
+            chunks.append(data.tobytes())
+    return b''.join(chunks)
+
+
+def decode(buffer) -> dict[str, tuple[Curve, ...]]:
+    """Decode the curves of all channels from a buffer. Arrays are views into
+    `buffer`.
+    """
+
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise FormatError('The file is too short for a compiled preset.')
+    magic, version, channel_count = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise FormatError('The file is not a compiled preset.')
+    if version not in (1, VERSION):
+        raise FormatError(f'Unsupported compiled preset version: {version}')
+
+    offset = HEADER.size
+    if version == 1:
+        sizes = {'rotation': channel_count}
+    else:
+        sizes = {}
+        try:
+            for _ in range(channel_count):
+                length = view[offset]
+                name = bytes(view[offset + 1 : offset + 1 + length]).decode('utf-8')
+                offset += 1 + length
+                sizes[name] = view[offset]
+                offset += 1
+        except (IndexError, UnicodeDecodeError):
+            raise FormatError('The channel table is corrupt.') from None
+        offset += -(offset - HEADER.size) % 4
+
+    axis_count = sum(sizes.values())
+    if len(view) < offset + 4 * axis_count:
+        raise FormatError('The compiled preset is truncated.')
+    counts = struct.unpack_from(f'<{axis_count}I', view, offset)
+    offset += 4 * axis_count
+    if len(view) < offset + sum(counts) * 4 * len(FIELDS):
+        raise FormatError('The compiled preset is truncated.')
+
+    curves = []
+    for count in counts:
+        arrays = []
+        for field in FIELDS:
+            size = count * 4
+            data = view[offset : offset + size]
+            if sys.byteorder == 'little':
+                arrays.append(data.cast('f'))
+            else:
+                values = array.array('f', data.tobytes())
+                values.byteswap()
+                arrays.append(values)
+            offset += size
+        curves.append(Curve(*arrays))
+
+    channels = {}
+    index = 0
+    for name, size in sizes.items():
+        channels[name] = tuple(curves[index : index + size])
+        index += size
+    return channels
+
+
+def read(path: str) -> dict[str, tuple[Curve, ...]]:
+    """Read a compiled preset and decode it without copying the curves.
+
+    The file is closed before returning, so it can be replaced while the
+    curves are in use.
+    """
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return decode(data)
+    except (ValueError, struct.error) as e:
+        raise FormatError(f'The compiled preset is corrupt: {e}') from None
+
+
+def write(path: str, channels: Mapping[str, Sequence[Curve]]) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(encode(channels))
+    os.replace(tmp_path, path)
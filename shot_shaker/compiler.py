@@ -0,0 +1,81 @@
+"""Compile all FBX presets below a directory into binary presets.
+
+Usage: python -m shot_shaker.compiler PRESET_DIR [--workers N] [--force]
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import logging
+import sys
+from collections.abc import Sequence
+
+from shot_shaker import compiled, fbx, presets
+
+logger = logging.getLogger(__name__)
+
+
+def compile_preset(path: str) -> str:
+    """Compile a single FBX preset and return the compiled path."""
+
+    channels = fbx.read_channels(path, presets.preset_name(path))
+    output_path = compiled.compiled_path(path)
+    compiled.write(output_path, channels)
+    return output_path
+
+
+def _is_compiled(path: str) -> bool:
+    # Presets compiled in an older format are compiled again.
+    version = compiled.read_version(compiled.compiled_path(path))
+    return version == compiled.VERSION and compiled.is_up_to_date(path)
+
+
+def compile_presets(
+    root: str, workers: int | None = None, force: bool = False
+) -> dict[str, str]:
+    """Compile all presets below `root` in a process pool.
+
+    Returns a dict of source paths to error messages for failed presets.
+    """
+
+    paths = [
+        path for path in presets.find_presets(root) if force or not _is_compiled(path)
+    ]
+    errors = {}
+    if not paths:
+        return errors
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(compile_preset, path): path for path in paths}
+        for future in concurrent.futures.as_completed(futures):
+            path = futures[future]
+            try:
+                output_path = future.result()
+            except (OSError, fbx.FBXError) as e:
+                logger.error(f'Failed to compile {path!r}: {e}')
+                errors[path] = str(e)
+            else:
+                logger.info(f'Compiled {output_path!r}')
+    return errors
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog='python -m shot_shaker.compiler',
+        description='Compile FBX presets into binary .shake files.',
+    )
+    parser.add_argument('root', help='directory to search for presets')
+    parser.add_argument('--workers', type=int, help='number of processes')
+    parser.add_argument(
+        '--force', action='store_true', help='recompile up to date presets'
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    errors = compile_presets(args.root, workers=args.workers, force=args.force)
+    return 1 if errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
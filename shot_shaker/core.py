@@ -5,200 +5,1122 @@ import json
 import logging
 import os
 import random
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING
 
+import pymxs
 from pymxs import runtime as rt
 
-from shot_shaker import lib
+from shot_shaker import cache, channels, lib, presets, profiling
+from shot_shaker.curves import Curve
+
+if TYPE_CHECKING:
+    # Requires NumPy, so it is only imported when needed.
+    from shot_shaker.analysis import ShakeStats
 
 logger = logging.getLogger(__name__)
 
 
+class ShakeError(Exception):
+    pass
+
+
 @dataclasses.dataclass
 class CreateShakeData:
     preset: str
     start_frame: int
     weight: float
+    # Maximum error when reducing keys, in degrees for rotation and in the units
+    # of the track for other channels. 0 keeps all keys.
+    tolerance: float = 0
+    # Per camera variation: up to `time_offset` frames are skipped at the start
+    # of the preset, amplitude and playback rate are scaled by up to +/- the
+    # jitter. Camera i uses `seed + i`.
+    time_offset: int = 0
+    amplitude_jitter: float = 0
+    rate_jitter: float = 0
+    seed: int = 0
+
+    @property
+    def varied(self) -> bool:
+        return bool(self.time_offset or self.amplitude_jitter or self.rate_jitter)
+
+
+@dataclasses.dataclass
+class ProceduralShakeData:
+    profile: str = 'handheld'
+    start_frame: int = 0
+    duration: int = 100
+    weight: float = 1
+    # Per axis frequency in Hz and amplitude in degrees. Settings left as None
+    # are taken from the profile in `procedural.PROFILES`.
+    frequency: tuple[float, float, float] | None = None
+    amplitude: tuple[float, float, float] | None = None
+    octaves: int | None = None
+    decay: float | None = None
+    seed: int = 0
+
+
+@dataclasses.dataclass
+class EnvelopeData:
+    # 'fade' or 'speed'
+    mode: str = 'fade'
+    start_frame: int = 0
+    # Peak weight of the envelope.
+    weight: float = 1
+    # Fade mode, lengths in frames.
+    fade_in: int = 10
+    hold: int = 80
+    fade_out: int = 10
+    easing: str = 'smooth'
+    # Speed mode: the weight follows the speed of the `driver` node until
+    # `end_frame`. Speeds are in units/second.
+    end_frame: int = 100
+    driver: str = ''
+    low_speed: float = 0
+    high_speed: float = 100
+    smoothing: int = 2
+
+
+@dataclasses.dataclass
+class CreateShakeResult:
+    camera: Camera
+    layer: str = ''
+    error: str = ''
+
+
+@dataclasses.dataclass
+class BakeResult:
+    camera: Camera
+    error: str = ''
+
+
+@dataclasses.dataclass
+class EnvelopeResult:
+    camera: Camera
+    layer: str
+    keys: int = 0
+    error: str = ''
+
+
+@dataclasses.dataclass
+class AnalysisResult:
+    camera: Camera
+    stats: ShakeStats | None = None
+    error: str = ''
+
+
+@dataclasses.dataclass
+class SimplifyResult:
+    camera: Camera
+    layer: str
+    before: int = 0
+    after: int = 0
+    error: str = ''
 
 
 class Layer:
-    def __init__(self, name: str, camera: Camera) -> None:
+    """Snapshot of a shake layer. Setters apply to the scene and the snapshot."""
+
+    __slots__ = (
+        'name',
+        'camera',
+        'index',
+        'manager_index',
+        'weight',
+        'start_frame',
+        'preset',
+        'preset_path',
+        'animated',
+        'muted',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        camera: Camera,
+        index: int = 0,
+        manager_index: int = 0,
+        weight: float = 0,
+        start_frame: int = 0,
+        preset_path: str = '',
+        animated: bool = False,
+        muted: bool = False,
+    ) -> None:
         self.name = name
         self.camera = camera
-        self.weight = self.get_weight()
-        self.start_frame = self.get_start_frame()
-        self.preset = self.get_preset()
-        self.animated = self.is_animated()
-        self.muted = self.get_muted()
+        # 1-based index in the layer controllers and AnimLayerManager.
+        self.index = index
+        self.manager_index = manager_index
+        self.weight = weight
+        self.start_frame = start_frame
+        self.preset_path = preset_path
+        self.preset = presets.preset_name(preset_path) if preset_path else ''
+        self.animated = animated
+        self.muted = muted
 
     def get_muted(self) -> bool:
-        indexes = rt.AnimLayerManager.getNodesLayers((self.camera.node,))
-        for i in indexes:
-            layer = rt.AnimLayerManager.getLayerName(i)
-            if layer == self.name:
-                return rt.AnimLayerManager.getLayerMute(i)
+        index = self._manager_index()
+        if index:
+            return rt.AnimLayerManager.getLayerMute(index)
         return False
 
     def set_muted(self, muted: bool) -> None:
-        indexes = rt.AnimLayerManager.getNodesLayers((self.camera.node,))
-        for i in indexes:
-            layer = rt.AnimLayerManager.getLayerName(i)
-            if layer == self.name:
-                rt.AnimLayerManager.setLayerMute(i, muted)
+        lib.submit(('muted', self.camera.handle, self.name), self._apply_muted, muted)
+
+    def _apply_muted(self, muted: bool) -> None:
+        index = self._manager_index()
+        if index:
+            rt.AnimLayerManager.setLayerMute(index, muted)
+        self.muted = muted
 
     def get_preset(self) -> str:
-        layers_string = rt.getUserProp(self.camera.node, 'layers')
-        if not layers_string:
-            return ''
-        layers = json.loads(layers_string)
-        layer = layers.get(self.name, {})
+        layer = self.camera.get_metadata().get(self.name, {})
         preset_path = layer.get('preset', '')
         name, ext = os.path.splitext(os.path.basename(preset_path))
         return name
 
     def get_weight(self) -> float:
-        controller = rt.getPropertyController(self.camera.node.controller, 'Rotation')
-        if rt.classof(controller) == rt.Rotation_layer:
-            for i in range(controller.count):
-                name = controller.getLayerName(i + 1)
-                if name == self.name:
-                    weight = controller.getLayerWeight(i + 1, rt.slidertime)
-                    return weight
+        controller = self.camera.get_rotation_controller()
+        index = self._index(controller)
+        if index:
+            return controller.getLayerWeight(index, rt.slidertime)
         return 0
 
     def set_weight(self, weight: float) -> None:
-        controller = rt.getPropertyController(self.camera.node.controller, 'Rotation')
-        if rt.classof(controller) == rt.Rotation_layer:
-            for i in range(controller.count):
-                name = controller.getLayerName(i + 1)
-                if name == self.name:
-                    controller.setLayerWeight(i + 1, rt.slidertime, weight)
-        self.animated = self.is_animated()
+        """Set a constant weight on the tracks of all channels of the layer."""
+
+        key = ('weight', self.camera.handle, self.name)
+        lib.submit(key, self._apply_weight, weight)
+
+    @profiling.operation('set_weight')
+    def _apply_weight(self, weight: float) -> None:
+        # A constant weight replaces a weight envelope.
+        for sub_anim in self._weight_sub_anims():
+            if _is_keyed(sub_anim):
+                sub_anim.controller = rt.Bezier_Float()
+        for controller in lib.get_layer_controllers(self.camera.node).values():
+            index = self._index(controller)
+            if index:
+                controller.setLayerWeight(index, rt.slidertime, weight)
+        self.weight = weight
+        self.animated = False
+
+    def get_weight_keys(self) -> Curve | None:
+        """Return the animated weight of the layer, or None if it is constant."""
+
+        sub_anims = self._weight_sub_anims()
+        if not sub_anims or not _is_keyed(sub_anims[0]):
+            return None
+        return lib.read_keys(sub_anims[0].controller)
+
+    def set_weight_keys(self, curve: Curve) -> None:
+        """Replace the weight tracks of all channels of the layer with the keys
+        of `curve`.
+        """
+
+        key = ('weight', self.camera.handle, self.name)
+        lib.submit(key, self._apply_weight_keys, curve)
+
+    @profiling.operation('set_weight')
+    def _apply_weight_keys(self, curve: Curve) -> None:
+        for sub_anim in self._weight_sub_anims():
+            lib.replace_keys(sub_anim, curve)
+        self.animated = True
 
     def get_start_frame(self) -> int:
         layers = lib.get_sub_animtables(self.camera.node, self.name)
-        for layer in layers:
-            if rt.classof(layer.controller) == rt.Euler_XYZ:
-                if len(layer.controller.keys):
-                    time = rt.getkeytime(layer.controller, 1)
-                    return int(time)
-                break
-        return 0
+        return _get_start_frame(layers)
 
     def set_start_frame(self, start_frame: int) -> None:
+        # The last start frame of a layer wins, applied as a single move.
+        key = ('start_frame', self.camera.handle, self.name)
+        lib.submit(key, self._apply_start_frame, start_frame)
+
+    @profiling.operation('set_start_frame')
+    def _apply_start_frame(self, start_frame: int) -> None:
         offset = start_frame - self.start_frame
-        lib.offset_keys(self.camera.node, self.name, offset)
+        if offset:
+            lib.offset_keys(self.camera.node, self.name, offset)
+            # A weight envelope moves with the layer.
+            lib.offset_keys(self.camera.node, _weight_name(self.name), offset)
         self.start_frame = start_frame
 
     def is_animated(self) -> bool:
-        controller = rt.getPropertyController(self.camera.node.controller, 'Rotation')
-        if rt.classof(controller) == rt.Rotation_layer:
-            for i in range(controller.count):
-                name = controller.getLayerName(i + 1)
-                # if name == self.name:
-                # logger.debug(f'{rt.classof(controller)=}')
-                # weight_controller = controller.weight[i].controller
-                # return (
-                #     weight_controller is not None
-                #     and weight_controller.keys.count > 1
-                # )
-        return False
+        sub_anims = self._weight_sub_anims()
+        return bool(sub_anims) and _is_keyed(sub_anims[0])
+
+    def simplify(self, tolerance: float) -> tuple[int, int]:
+        """Reduce the keys of all channel tracks of the layer within
+        `tolerance`, in degrees for rotation and in the units of the channel
+        otherwise.
+
+        Returns the key counts before and after. Requires NumPy.
+        """
+
+        from shot_shaker import simplify
+
+        before = after = 0
+        tracks = lib.get_layer_tracks(self.camera.node, self.name)
+        for name, track in tracks.items():
+            controller = track.controller
+            if name == 'rotation' and rt.classof(controller) != rt.Euler_XYZ:
+                continue
+            size = channels.BY_NAME[name].size
+            axes = (track,) if size == 1 else tuple(controller[i] for i in range(size))
+            # Unkeyed tracks are read as a single key holding their value.
+            if not any(_is_keyed(axis) for axis in axes):
+                continue
+            curves = lib.read_track_keys(track, size)
+            reduced = simplify.simplify_curves(curves, tolerance)
+            track_before = simplify.key_count(curves)
+            track_after = simplify.key_count(reduced)
+            if track_after < track_before:
+                lib.write_track_keys(track, reduced)
+            before += track_before
+            after += track_after
+        return before, after
+
+    def _weight_sub_anims(self) -> tuple:
+        # A weight track per channel track of the layer.
+        return lib.get_sub_animtables(self.camera.node, _weight_name(self.name))
+
+    def _index(self, controller) -> int:
+        if controller is None:
+            return 0
+        if self.index and controller.getLayerName(self.index) == self.name:
+            return self.index
+        for i in range(controller.count):
+            if controller.getLayerName(i + 1) == self.name:
+                self.index = i + 1
+                return self.index
+        return 0
+
+    def _manager_index(self) -> int:
+        manager = rt.AnimLayerManager
+        if self.manager_index and manager.getLayerName(self.manager_index) == self.name:
+            return self.manager_index
+        for i in manager.getNodesLayers((self.camera.node,)):
+            if manager.getLayerName(i) == self.name:
+                self.manager_index = i
+                return i
+        return 0
+
+
+def _get_euler_controller(layers: tuple):
+    for layer in layers:
+        if rt.classof(layer.controller) == rt.Euler_XYZ:
+            return layer.controller
+    return None
+
+
+def _layer_snapshot(layer: Layer) -> dict:
+    return {
+        'name': layer.name,
+        'index': layer.index,
+        'manager_index': layer.manager_index,
+        'weight': layer.weight,
+        'start_frame': layer.start_frame,
+        'preset_path': layer.preset_path,
+        'preset': layer.preset,
+        'animated': layer.animated,
+        'muted': layer.muted,
+    }
+
+
+def _layer_from_snapshot(camera: Camera, data: dict) -> Layer:
+    data = dict(data)
+    preset = data.pop('preset')
+    layer = Layer(camera=camera, **data)
+    layer.preset = preset
+    return layer
+
+
+def _weight_name(layer_name: str) -> str:
+    return f'Weight: {layer_name}'
+
+
+def _is_keyed(sub_anim) -> bool:
+    controller = sub_anim.controller
+    return controller is not None and len(controller.keys) > 0
+
+
+def _get_start_frame(layers: tuple) -> int:
+    # The tracks of all channels of a layer start at the same frame.
+    for layer in layers:
+        controller = layer.controller
+        if controller is not None and len(controller.keys):
+            return int(rt.getkeytime(controller, 1))
+    return 0
 
 
 class Camera:
     def __init__(self, node) -> None:
         self.node = node
+        self.handle = rt.getHandleByAnim(node)
         self.name = node.name
-        self.layers = self.get_layers()
-        self.baked = False
+        self._baked: bool | None = None
+        self._layers: tuple[Layer, ...] | None = None
+
+    @property
+    def baked(self) -> bool:
+        if self._baked is None:
+            self._baked = bool(rt.getUserProp(self.node, 'bake'))
+        return self._baked
+
+    @property
+    def layers(self) -> tuple[Layer, ...]:
+        # Layers are only read from the scene when they are first needed.
+        if self._layers is None:
+            revision = cache.scenes.revision(self.handle)
+            self._layers = self.get_layers()
+            cache.scenes.set(
+                lib.get_scene_path(), self.handle, revision, self._snapshot()
+            )
+        return self._layers
+
+    @property
+    def layers_loaded(self) -> bool:
+        return self._layers is not None
+
+    def reload_layers(self) -> None:
+        self._layers = None
+        self._baked = None
+
+    def restore_layers(self, scene: str | None = None) -> bool:
+        """Use the cached layers if the node did not change since they were read
+        in `scene`, which defaults to the current scene path.
+
+        Returns whether the layers were restored.
+        """
+
+        if scene is None:
+            scene = lib.get_scene_path()
+        snapshot = cache.scenes.get(scene, self.handle)
+        if snapshot is None:
+            return False
+        self._baked = snapshot['baked']
+        self._layers = tuple(
+            _layer_from_snapshot(self, data) for data in snapshot['layers']
+        )
+        return True
+
+    def _snapshot(self) -> dict:
+        # Plain data, so snapshots stay usable after the package is reloaded.
+        return {
+            'baked': self.baked,
+            'layers': [_layer_snapshot(layer) for layer in self._layers],
+        }
 
     def set_name(self, name: str) -> None:
+        self.name = name
+        lib.submit(('name', self.handle), self._apply_name, name)
+
+    def _apply_name(self, name: str) -> None:
         self.node.name = name
         self.name = self.node.name
 
     def add_layer(
         self, preset_path: str, weight: float = 1, start_frame: int = 0
     ) -> None:
-        if not os.path.exists(preset_path):
-            logger.error(f'The preset {preset_path!r} does not exist.')
-            return
-
-        rt.ImportFile(preset_path, rt.Name('noPrompt'), using='FBXIMP')
+        data = CreateShakeData(
+            preset=preset_path, start_frame=start_frame, weight=weight
+        )
+        for result in _add_layers((self,), data):
+            if result.error:
+                logger.error(result.error)
 
-        preset_name, ext = os.path.splitext(os.path.basename(preset_path))
-
-        preset_camera = rt.getNodeByName(preset_name)
-        if not preset_camera:
-            logger.warning(f'The camera in the preset does not match the preset name.')
-            return
-
-        anim_names = lib.get_sub_animtable_names(self.node)
+    def _add_layer(
+        self,
+        layer_name: str,
+        base_name: str,
+        source: dict[str, tuple[Curve, ...]],
+        start_frame: int,
+        weight: float,
+        layer_metadata: dict,
+    ) -> str:
+        # Rename the temporary layer to a name that is unique on this node.
+        anim_names = lib.get_sub_anim_index(self.node)
         iteration = 1
-        name = preset_name
+        name = base_name
         if name in anim_names:
             while True:
-                name = preset_name + str(iteration)
+                name = base_name + str(iteration)
                 if name in anim_names:
                     iteration += 1
                     continue
                 break
+        lib.set_layer_name(self.node, layer_name, name)
 
-        rt.AnimLayerManager.enableLayers(self.node)
-        random_name = str(random.getrandbits(16))
-        rt.AnimLayerManager.addLayer(random_name, self.node, False)
-        lib.set_layer_name(self.node, random_name, name)
-
-        lib.copy_layer_controllers(self.node, name, preset_camera, start_frame)
-        rt.delete(preset_camera)
-        rt.select(self.node)
-
-        controller = rt.getPropertyController(self.node.controller, 'Rotation')
-        controller.setLayerActive(1)
+        written = lib.write_layer_keys(self.node, name, source, start_frame)
+        skipped = [channel for channel in source if channel not in written]
+        if skipped:
+            logger.warning(f'{self.name} has no layers on {", ".join(skipped)}.')
+        lib.set_layers_active(self.node, 1)
 
         # Update metadata
-        layers_string = rt.getUserProp(self.node, 'layers')
-        if layers_string:
-            layers = json.loads(layers_string)
-        else:
-            layers = {}
-        layers[name] = {'preset': preset_path}
-        rt.setUserProp(self.node, 'layers', json.dumps(layers))
+        metadata = self.get_metadata()
+        metadata[name] = layer_metadata
+        self.set_metadata(metadata)
 
-        layer = Layer(name=name, camera=self)
+        layer = Layer(
+            name=name,
+            camera=self,
+            start_frame=start_frame,
+            preset_path=layer_metadata.get('preset', ''),
+        )
         layer.set_weight(weight)
-        layer.start_frame = start_frame
+        return name
 
+    @profiling.operation('get_layers')
     def get_layers(self) -> tuple[Layer, ...]:
         logger.debug(f'Getting layers for {self.node}')
 
-        base_layer = rt.AnimLayerManager.getLayerName(1)
+        controller = self.get_rotation_controller()
+        if controller is None:
+            return ()
+
+        manager = rt.AnimLayerManager
+        base_layer = manager.getLayerName(1)
+        manager_indexes = {}
+        for i in manager.getNodesLayers((self.node,)):
+            manager_indexes[manager.getLayerName(i)] = i
+        metadata = self.get_metadata()
+        sub_anims = lib.get_sub_anim_index(self.node)
+        time = rt.slidertime
 
         layers = []
+        for i in range(controller.getCount()):
+            name = controller.getLayerName(i + 1)
+            if name == base_layer:
+                continue
+            manager_index = manager_indexes.get(name, 0)
+            weight_sub_anims = sub_anims.get(_weight_name(name))
+            layer = Layer(
+                name=name,
+                camera=self,
+                index=i + 1,
+                manager_index=manager_index,
+                weight=controller.getLayerWeight(i + 1, time),
+                start_frame=_get_start_frame(sub_anims.get(name)),
+                preset_path=metadata.get(name, {}).get('preset', ''),
+                muted=bool(manager_index and manager.getLayerMute(manager_index)),
+                animated=bool(weight_sub_anims) and _is_keyed(weight_sub_anims[0]),
+            )
+            if 'procedural' in metadata.get(name, {}):
+                layer.preset = metadata[name]['procedural'].get('profile', '')
+            layers.append(layer)
+        return tuple(layers)
+
+    def get_rotation_controller(self):
         controller = rt.getPropertyController(self.node.controller, 'Rotation')
         if rt.classof(controller) == rt.Rotation_layer:
-            for i in range(controller.getCount()):
-                name = controller.getLayerName(i + 1)
-                if name != base_layer:
-                    layer = Layer(name=name, camera=self)
-                    layers.append(layer)
-        return tuple(layers)
+            return controller
+        return None
+
+    def get_metadata(self) -> dict:
+        layers_string = rt.getUserProp(self.node, 'layers')
+        if layers_string:
+            return json.loads(layers_string)
+        return {}
+
+    def set_metadata(self, metadata: dict) -> None:
+        rt.setUserProp(self.node, 'layers', json.dumps(metadata))
+
+    def bake(self, start_frame: int, end_frame: int) -> None:
+        """Compose the base tracks and all unmuted layers into the base layer.
+
+        Rotations are composed in layer order, layers of the other channels are
+        added to their base track. The original base keys and layer weights
+        are stored on the node so the bake can be reverted with `unbake`.
+        Requires NumPy.
+        """
+
+        import numpy as np
+
+        from shot_shaker import evaluate
+
+        if self.baked:
+            raise ShakeError(f'{self.name} is already baked.')
+        base = self._get_base_rotation()
+
+        fps = rt.frameRate
+        times = np.arange(start_frame, end_frame + 1, dtype=np.float64) / fps
+        base_curves = lib.read_euler_keys(base)
+        layers = [
+            (
+                evaluate.sample_rotation(curves, times),
+                evaluate.sample_weight(weight, times),
+            )
+            for curves, weight in self.get_layer_curves()
+        ]
+        angles = evaluate.compose_layers(
+            evaluate.sample_rotation(base_curves, times), layers
+        )
+
+        base_tracks = self._get_base_tracks()
+        channel_curves = {}
+        baked_channels = {}
+        for name, track in base_tracks.items():
+            channel_layers = [
+                (
+                    evaluate.sample_channel(layer_curves, times),
+                    evaluate.sample_weight(weight, times),
+                )
+                for layer_curves, weight in self.get_layer_curves(name)
+            ]
+            if not channel_layers:
+                continue
+            curves = lib.read_track_keys(track, channels.BY_NAME[name].size)
+            values = evaluate.add_layers(
+                evaluate.sample_channel(curves, times), channel_layers
+            )
+            channel_curves[name] = curves
+            baked_channels[name] = [
+                evaluate.curve_from_samples(times, values[:, axis])
+                for axis in range(len(curves))
+            ]
+
+        data = {
+            'base': [curve.to_dict() for curve in base_curves],
+            'channels': {
+                name: [curve.to_dict() for curve in curves]
+                for name, curves in channel_curves.items()
+            },
+            'weights': {layer.name: layer.weight for layer in self.layers},
+            'weight_keys': {},
+        }
+        for layer in self.layers:
+            curve = layer.get_weight_keys() if layer.animated else None
+            if curve is not None:
+                data['weight_keys'][layer.name] = curve.to_dict()
+        rt.setUserProp(self.node, 'bake', json.dumps(data))
+        curves = [
+            evaluate.curve_from_samples(times, angles[:, axis]) for axis in range(3)
+        ]
+        lib.write_euler_keys(base, curves)
+        for name, curves in baked_channels.items():
+            lib.write_track_keys(base_tracks[name], curves)
+        for layer in self.layers:
+            layer.set_weight(0)
+        self._baked = True
+
+    def get_layer_curves(
+        self, channel: str = 'rotation'
+    ) -> list[tuple[tuple[Curve, ...], float | Curve]]:
+        """Return the curves of a channel and weight of all layers that
+        contribute to the shake, in layer order. Animated weights are returned
+        as curves.
+        """
+
+        sub_anims = lib.get_sub_anim_index(self.node)
+        size = channels.BY_NAME[channel].size
+        layers = []
+        for layer in self.layers:
+            if layer.muted or not (layer.weight or layer.animated):
+                continue
+            if channel == 'rotation':
+                rotation = _get_euler_controller(sub_anims.get(layer.name))
+                if rotation is None:
+                    continue
+                curves = lib.read_euler_keys(rotation)
+            else:
+                track = lib.get_layer_tracks(self.node, layer.name).get(channel)
+                if track is None:
+                    continue
+                curves = lib.read_track_keys(track, size)
+            weight = layer.get_weight_keys() if layer.animated else None
+            if weight is None:
+                weight = layer.weight
+            layers.append((curves, weight))
+        return layers
+
+    def analyze(self, start_frame: int, end_frame: int, threshold: float) -> ShakeStats:
+        """Analyze the composited shake of all layers. Requires NumPy."""
+
+        from shot_shaker import analysis
+
+        return analysis.analyze(
+            self.get_layer_curves(), start_frame, end_frame, rt.frameRate, threshold
+        )
+
+    def unbake(self) -> None:
+        """Restore the base keys and layer weights from before the bake."""
+
+        bake_string = rt.getUserProp(self.node, 'bake')
+        if not bake_string:
+            raise ShakeError(f'{self.name} is not baked.')
+        data = json.loads(bake_string)
+        base = self._get_base_rotation()
+
+        curves = [Curve.from_dict(curve) for curve in data['base']]
+        lib.write_euler_keys(base, curves)
+        base_tracks = self._get_base_tracks()
+        for name, channel_curves in data.get('channels', {}).items():
+            if name in base_tracks:
+                curves = [Curve.from_dict(curve) for curve in channel_curves]
+                lib.write_track_keys(base_tracks[name], curves)
+        weights = data.get('weights', {})
+        weight_keys = data.get('weight_keys', {})
+        for layer in self.layers:
+            if layer.name in weight_keys:
+                layer.set_weight_keys(Curve.from_dict(weight_keys[layer.name]))
+            elif layer.name in weights:
+                layer.set_weight(weights[layer.name])
+        rt.setUserProp(self.node, 'bake', '')
+        self._baked = False
+
+    def _get_base_rotation(self):
+        base_name = rt.AnimLayerManager.getLayerName(1)
+        sub_anims = lib.get_sub_anim_index(self.node)
+        rotation = _get_euler_controller(sub_anims.get(base_name))
+        if rotation is None:
+            raise ShakeError(f'{self.name} has no Euler XYZ base rotation layer.')
+        return rotation
+
+    def _get_base_tracks(self) -> dict:
+        # The base layer tracks of all channels except rotation.
+        base_name = rt.AnimLayerManager.getLayerName(1)
+        tracks = lib.get_layer_tracks(self.node, base_name)
+        tracks.pop('rotation', None)
+        return tracks
 
     def delete(self) -> None:
+        lib.invalidate_sub_anim_index(self.node)
         rt.delete(self.node)
 
     def create_shake(self, data: CreateShakeData) -> None:
-        with lib.suspended_refresh():
-            self.add_layer(
-                preset_path=data.preset,
-                weight=data.weight,
-                start_frame=data.start_frame,
+        for result in create_shakes((self,), data):
+            if result.error:
+                logger.error(result.error)
+
+
+def get_cameras(
+    selected: bool = False, layer: str = '', pattern: str = ''
+) -> tuple[Camera, ...]:
+    """Return the cameras of the scene, optionally filtered by selection, scene
+    layer or a wildcard name pattern.
+    """
+
+    # The scene might have been edited outside the tool since the last call.
+    lib.invalidate_sub_anim_index()
+
+    # The registry only caches the cameras while the tool window started it.
+    registry = lib.camera_registry
+    nodes = registry.nodes(selected=selected, layer=layer, pattern=pattern)
+    return tuple(Camera(node=node) for node in nodes)
+
+
+def scan_cameras(
+    batch_size: int = 256,
+) -> Iterator[tuple[tuple[Camera, ...], tuple[int, ...]]]:
+    """Yield the cameras of the scene in batches, with the layers of unchanged
+    cameras restored from the scene cache, and the handles of cached cameras
+    that changed since they were read. Layers are only cached while
+    `lib.track_revisions` is active.
+    """
+
+    lib.invalidate_sub_anim_index()
+    nodes = lib.camera_registry.nodes()
+    scene = lib.get_scene_path()
+    restored = 0
+    for i in range(0, len(nodes), batch_size):
+        cameras = tuple(Camera(node=node) for node in nodes[i : i + batch_size])
+        changed = []
+        for camera in cameras:
+            cached = cache.scenes.has(camera.handle)
+            if camera.restore_layers(scene):
+                restored += 1
+            elif cached:
+                changed.append(camera.handle)
+        yield cameras, tuple(changed)
+    logger.debug(f'Restored {restored} of {len(nodes)} cameras from the cache')
+
+
+def get_camera(handle: int) -> Camera | None:
+    """Return the camera for an anim handle, or None if it is not a camera."""
+
+    node = rt.GetAnimByHandle(handle)
+    if node is None or not rt.isValidNode(node):
+        return None
+    if not rt.isKindOf(node, rt.Camera):
+        return None
+    lib.invalidate_sub_anim_index(node)
+    return Camera(node=node)
+
+
+@profiling.operation('create_shake')
+def create_shakes(
+    cameras: Iterable[Camera], data: CreateShakeData
+) -> tuple[CreateShakeResult, ...]:
+    """Add a shake layer to all cameras in a single undoable operation."""
+
+    cameras = tuple(cameras)
+    if not cameras:
+        return ()
+    with lib.transaction('Create Shake'):
+        results = _add_layers(cameras, data)
+        rt.select([camera.node for camera in cameras])
+    return results
+
+
+@profiling.operation('create_shake')
+def create_procedural_shakes(
+    cameras: Iterable[Camera], data: ProceduralShakeData
+) -> tuple[CreateShakeResult, ...]:
+    """Add a generated shake layer to all cameras in a single undoable operation.
+
+    Every camera gets a distinct shake derived from `data.seed`.
+    """
+
+    from shot_shaker import procedural
+
+    cameras = tuple(cameras)
+    if not cameras:
+        return ()
+
+    defaults = procedural.PROFILES.get(data.profile, {})
+    missing = [
+        name
+        for name in ('frequency', 'amplitude', 'octaves', 'decay')
+        if getattr(data, name) is None
+    ]
+    if any(name not in defaults for name in missing):
+        error = f'Unknown shake profile: {data.profile!r}'
+        return tuple(
+            CreateShakeResult(camera=camera, error=error) for camera in cameras
+        )
+    data = dataclasses.replace(data, **{name: defaults[name] for name in missing})
+
+    shakes = procedural.generate(
+        count=len(cameras),
+        duration=data.duration,
+        fps=rt.frameRate,
+        frequency=data.frequency,
+        amplitude=data.amplitude,
+        octaves=data.octaves,
+        decay=data.decay,
+        seed=data.seed,
+    )
+    layer_metadata = []
+    for i in range(len(cameras)):
+        settings = dataclasses.asdict(data)
+        settings['seed'] = data.seed + i
+        layer_metadata.append({'procedural': settings})
+
+    with lib.transaction('Create Procedural Shake'):
+        results = _add_layer_sources(
+            cameras,
+            [{'rotation': shake} for shake in shakes],
+            layer_metadata,
+            base_name=data.profile.title(),
+            start_frame=data.start_frame,
+            weight=data.weight,
+        )
+        rt.select([camera.node for camera in cameras])
+    return results
+
+
+def bake_cameras(
+    cameras: Iterable[Camera],
+    start_frame: int | None = None,
+    end_frame: int | None = None,
+) -> tuple[BakeResult, ...]:
+    """Bake the shake layers of all cameras in a single undoable operation.
+
+    The frame range defaults to the scene animation range.
+    """
+
+    cameras = tuple(camera for camera in cameras if not camera.baked)
+    if not cameras:
+        return ()
+    if start_frame is None:
+        start_frame = int(rt.animationRange.start)
+    if end_frame is None:
+        end_frame = int(rt.animationRange.end)
+
+    results = []
+    with lib.transaction('Bake Shake'):
+        for camera in cameras:
+            try:
+                camera.bake(start_frame, end_frame)
+            except (RuntimeError, ShakeError) as e:
+                results.append(BakeResult(camera=camera, error=str(e)))
+            else:
+                results.append(BakeResult(camera=camera))
+    return tuple(results)
+
+
+def unbake_cameras(cameras: Iterable[Camera]) -> tuple[BakeResult, ...]:
+    """Revert the bake of all cameras in a single undoable operation."""
+
+    cameras = tuple(camera for camera in cameras if camera.baked)
+    if not cameras:
+        return ()
+
+    results = []
+    with lib.transaction('Unbake Shake'):
+        for camera in cameras:
+            try:
+                camera.unbake()
+            except (RuntimeError, ShakeError) as e:
+                results.append(BakeResult(camera=camera, error=str(e)))
+            else:
+                results.append(BakeResult(camera=camera))
+    return tuple(results)
+
+
+def apply_envelopes(
+    layers: Iterable[Layer], data: EnvelopeData
+) -> tuple[EnvelopeResult, ...]:
+    """Animate the weight of all layers with the same envelope in a single
+    undoable operation. Requires NumPy.
+    """
+
+    import numpy as np
+
+    from shot_shaker import envelope, evaluate, simplify
+
+    layers = tuple(layers)
+    if not layers:
+        return ()
+
+    if data.mode == 'speed':
+        frames = np.arange(data.start_frame, data.end_frame + 1)
+        driver = rt.getNodeByName(data.driver) if data.driver else None
+        if driver is None:
+            error = f'The driver {data.driver!r} does not exist.'
+            return tuple(
+                EnvelopeResult(camera=layer.camera, layer=layer.name, error=error)
+                for layer in layers
+            )
+        positions = lib.sample_positions(driver, frames.tolist())
+        weights = envelope.speed(
+            positions, rt.frameRate, data.low_speed, data.high_speed, data.smoothing
+        )
+    else:
+        end_frame = data.start_frame + data.fade_in + data.hold + data.fade_out
+        frames = np.arange(data.start_frame, end_frame + 1)
+        weights = envelope.fade(
+            frames,
+            data.start_frame,
+            data.fade_in,
+            data.hold,
+            data.fade_out,
+            data.easing,
+        )
+
+    # The same keys are written to every layer, without redundant keys.
+    curve = evaluate.curve_from_samples(frames / rt.frameRate, weights * data.weight)
+    curve = simplify.simplify_curve(curve, 1e-4)
+
+    results = []
+    with lib.transaction('Weight Envelope'):
+        for layer in layers:
+            layer.set_weight_keys(curve)
+            results.append(
+                EnvelopeResult(camera=layer.camera, layer=layer.name, keys=len(curve))
             )
+    return tuple(results)
+
+
+def analyze_cameras(
+    cameras: Iterable[Camera],
+    threshold: float,
+    start_frame: int | None = None,
+    end_frame: int | None = None,
+) -> tuple[AnalysisResult, ...]:
+    """Analyze the shake of all cameras against a comfort `threshold` in degrees.
+
+    The frame range defaults to the scene animation range. Requires NumPy.
+    """
+
+    if start_frame is None:
+        start_frame = int(rt.animationRange.start)
+    if end_frame is None:
+        end_frame = int(rt.animationRange.end)
+
+    results = []
+    for camera in cameras:
+        try:
+            stats = camera.analyze(start_frame, end_frame, threshold)
+        except RuntimeError as e:
+            results.append(AnalysisResult(camera=camera, error=str(e)))
+        else:
+            results.append(AnalysisResult(camera=camera, stats=stats))
+    return tuple(results)
+
 
+def simplify_layers(
+    layers: Iterable[Layer], tolerance: float
+) -> tuple[SimplifyResult, ...]:
+    """Reduce the keys of all layers in a single undoable operation."""
 
-def get_cameras() -> tuple[Camera, ...]:
-    cameras = []
-    for obj in rt.objects:
-        if not rt.isKindOf(obj, rt.Camera):
-            continue
-        camera = Camera(node=obj)
-        cameras.append(camera)
-    return tuple(cameras)
+    layers = tuple(layers)
+    if not layers:
+        return ()
+
+    results = []
+    with lib.transaction('Simplify Shake'):
+        for layer in layers:
+            result = SimplifyResult(camera=layer.camera, layer=layer.name)
+            try:
+                result.before, result.after = layer.simplify(tolerance)
+            except RuntimeError as e:
+                result.error = str(e)
+            else:
+                logger.debug(
+                    f'Simplified {layer.camera.name}.{layer.name}: '
+                    f'{result.before} to {result.after} keys'
+                )
+            results.append(result)
+    return tuple(results)
+
+
+def _add_layers(
+    cameras: tuple[Camera, ...], data: CreateShakeData
+) -> tuple[CreateShakeResult, ...]:
+    try:
+        source = load_preset(data.preset)
+        if data.tolerance:
+            # Reduce the keys once for all cameras.
+            source = _simplify_source(source, data)
+        count = len(cameras)
+        sources = (source,) * count
+        layer_metadata = ({'preset': data.preset},) * count
+        if data.varied:
+            sources, layer_metadata = _vary_source(source, count, data)
+        return _add_layer_sources(
+            cameras,
+            sources,
+            layer_metadata,
+            base_name=presets.preset_name(data.preset),
+            start_frame=data.start_frame,
+            weight=data.weight,
+        )
+    except (ShakeError, RuntimeError) as e:
+        # Errors that are not specific to a camera fail all of them.
+        return tuple(
+            CreateShakeResult(camera=camera, error=str(e)) for camera in cameras
+        )
+
+
+def _simplify_source(
+    source: dict[str, tuple[Curve, ...]], data: CreateShakeData
+) -> dict[str, tuple[Curve, ...]]:
+    from shot_shaker import simplify
+
+    reduced = {
+        name: simplify.simplify_curves(curves, data.tolerance)
+        for name, curves in source.items()
+    }
+    before = sum(simplify.key_count(curves) for curves in source.values())
+    after = sum(simplify.key_count(curves) for curves in reduced.values())
+    logger.info(
+        f'Simplified {presets.preset_name(data.preset)}: {before} to {after} keys'
+    )
+    return reduced
+
+
+def _vary_source(
+    source: dict[str, tuple[Curve, ...]], count: int, data: CreateShakeData
+) -> tuple[list[dict], list[dict]]:
+    from shot_shaker import variation
+
+    variations = [
+        variation.draw(
+            data.seed + i, data.time_offset, data.amplitude_jitter, data.rate_jitter
+        )
+        for i in range(count)
+    ]
+    # All channels are varied together so they stay in sync.
+    curves, axes = channels.flatten(source)
+    variants = variation.apply(curves, variations, rt.frameRate, axes)
+    sources = [channels.unflatten(source, variant) for variant in variants]
+    layer_metadata = [
+        {'preset': data.preset, 'variation': v.to_dict()} for v in variations
+    ]
+    return sources, layer_metadata
+
+
+def _add_layer_sources(
+    cameras: tuple[Camera, ...],
+    sources: Sequence,
+    layer_metadata: Sequence[dict],
+    base_name: str,
+    start_frame: int,
+    weight: float,
+) -> tuple[CreateShakeResult, ...]:
+    # Sources hold the curves of every channel by channel name. Layers are
+    # enabled on the tracks of all channels of the sources.
+    used = {name for source in sources for name in source}
+    nodes = [camera.node for camera in cameras]
+    rt.AnimLayerManager.enableLayers(
+        nodes,
+        pos='position' in used,
+        rot=True,
+        scale=False,
+        ik=False,
+        object=any(channels.BY_NAME[name].object_track for name in used),
+        cust=False,
+        mod=False,
+        mat=False,
+        other=False,
+    )
+    layer_name = str(random.getrandbits(16))
+    rt.AnimLayerManager.addLayer(layer_name, nodes, False)
+    for node in nodes:
+        lib.invalidate_sub_anim_index(node)
+
+    results = []
+    for camera, source, metadata in zip(cameras, sources, layer_metadata):
+        try:
+            name = camera._add_layer(
+                layer_name, base_name, source, start_frame, weight, metadata
+            )
+        except RuntimeError as e:
+            result = CreateShakeResult(camera=camera, error=str(e))
+        else:
+            result = CreateShakeResult(camera=camera, layer=name)
+        results.append(result)
+    return tuple(results)
+
+
+def load_preset(preset_path: str) -> dict[str, tuple[Curve, ...]]:
+    """Return the curves of all channels of a preset, read from the camera
+    imported by the FBX importer as a fallback.
+
+    Distances are in system units and all channels hold offsets.
+    """
+
+    from shot_shaker import fbx
+
+    if not os.path.exists(preset_path):
+        raise ShakeError(f'The preset {preset_path!r} does not exist.')
+
+    try:
+        source = presets.load_channels(preset_path)
+    except (OSError, fbx.FBXError) as e:
+        logger.debug(f'Falling back to the FBX importer: {e}')
+    else:
+        # Presets are read in centimeters, the importer converts units itself.
+        source = channels.scale_distances(source, lib.get_units_per_cm())
+        return channels.to_offsets(source)
+
+    try:
+        imported = rt.ImportFile(preset_path, rt.Name('noPrompt'), using='FBXIMP')
+    except RuntimeError as e:
+        raise ShakeError(f'Could not import the preset {preset_path!r}: {e}') from e
+    if not imported:
+        raise ShakeError(f'Could not import the preset {preset_path!r}.')
+    preset_camera = rt.getNodeByName(presets.preset_name(preset_path))
+    if not preset_camera:
+        raise ShakeError('The camera in the preset does not match the preset name.')
+    try:
+        source = lib.read_channels(preset_camera)
+    finally:
+        lib.invalidate_sub_anim_index(preset_camera)
+        rt.delete(preset_camera)
+    if not source:
+        raise ShakeError('The camera in the preset has no animation.')
+    return channels.to_offsets(source)
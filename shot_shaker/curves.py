@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Sequence
+
+
+@dataclasses.dataclass
+class Curve:
+    """A single animation curve. Times are in seconds, tangents in units/second."""
+
+    times: Sequence[float]
+    values: Sequence[float]
+    in_tangents: Sequence[float]
+    out_tangents: Sequence[float]
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def to_dict(self) -> dict[str, list[float]]:
+        return {
+            'times': list(self.times),
+            'values': list(self.values),
+            'in_tangents': list(self.in_tangents),
+            'out_tangents': list(self.out_tangents),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, list[float]]) -> Curve:
+        return cls(
+            times=data['times'],
+            values=data['values'],
+            in_tangents=data['in_tangents'],
+            out_tangents=data['out_tangents'],
+        )
@@ -0,0 +1,90 @@
+"""Weight envelopes that animate a shake layer in and out.
+
+Requires NumPy. Envelopes are computed for a whole frame range at once and
+returned as a weight per frame.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+import numpy as np
+
+
+def _linear(t: np.ndarray) -> np.ndarray:
+    return t
+
+
+def _smooth(t: np.ndarray) -> np.ndarray:
+    return t * t * (3 - 2 * t)
+
+
+def _ease_in(t: np.ndarray) -> np.ndarray:
+    return t * t
+
+
+def _ease_out(t: np.ndarray) -> np.ndarray:
+    return 1 - (1 - t) ** 2
+
+
+EASINGS: dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    'smooth': _smooth,
+    'linear': _linear,
+    'ease in': _ease_in,
+    'ease out': _ease_out,
+}
+
+
+def fade(
+    frames: np.ndarray,
+    start_frame: int,
+    fade_in: int,
+    hold: int,
+    fade_out: int,
+    easing: str = 'smooth',
+) -> np.ndarray:
+    """Fade from 0 to 1 over `fade_in` frames, hold for `hold` frames and fade
+    back to 0 over `fade_out` frames.
+    """
+
+    ease = EASINGS[easing]
+    frames = np.asarray(frames, dtype=np.float64)
+    hold_end = start_frame + fade_in + hold
+    rise = _ramp(frames - start_frame, fade_in)
+    fall = _ramp(hold_end + fade_out - frames, fade_out)
+    return np.minimum(ease(rise), ease(fall))
+
+
+def _ramp(x: np.ndarray, length: int) -> np.ndarray:
+    if length <= 0:
+        return (x >= 0).astype(np.float64)
+    return np.clip(x / length, 0, 1)
+
+
+def speed(
+    positions: np.ndarray,
+    fps: float,
+    low: float,
+    high: float,
+    smoothing: int = 0,
+) -> np.ndarray:
+    """Map the speed of positions of shape (frames, 3) to weights.
+
+    Speeds at or below `low` units/second map to 0, speeds at or above `high`
+    map to 1. `smoothing` averages the speed over that many frames on each side.
+    """
+
+    positions = np.asarray(positions, dtype=np.float64)
+    if len(positions) > 1:
+        velocity = np.gradient(positions, 1 / fps, axis=0)
+    else:
+        velocity = np.zeros_like(positions)
+    values = np.linalg.norm(velocity, axis=1)
+    if smoothing > 0 and len(values) > 1:
+        kernel = np.ones(2 * smoothing + 1) / (2 * smoothing + 1)
+        padded = np.pad(values, smoothing, mode='edge')
+        values = np.convolve(padded, kernel, mode='valid')
+    span = high - low
+    if span <= 0:
+        return (values > low).astype(np.float64)
+    return np.clip((values - low) / span, 0, 1)
@@ -0,0 +1,182 @@
+"""Vectorized evaluation of animation curves and layered rotations.
+
+Requires NumPy. Rotations are Euler XYZ angles in degrees, matching the
+Euler_XYZ controllers in 3ds Max. Layers of other channels are additive.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from shot_shaker.curves import Curve
+
+
+def sample_curve(curve: Curve, times: np.ndarray) -> np.ndarray:
+    """Evaluate a Hermite curve at `times` (seconds).
+
+    Values are held constant before the first and after the last key.
+    """
+
+    key_times = np.asarray(curve.times, dtype=np.float64)
+    values = np.asarray(curve.values, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    if not len(key_times):
+        return np.zeros_like(times)
+    if len(key_times) == 1:
+        return np.full_like(times, values[0])
+
+    out_tangents = np.asarray(curve.out_tangents, dtype=np.float64)
+    in_tangents = np.asarray(curve.in_tangents, dtype=np.float64)
+
+    index = np.searchsorted(key_times, times, side='right') - 1
+    index = np.clip(index, 0, len(key_times) - 2)
+    t0 = key_times[index]
+    t1 = key_times[index + 1]
+    duration = t1 - t0
+    s = np.clip((times - t0) / np.where(duration > 0, duration, 1), 0, 1)
+
+    s2 = s * s
+    s3 = s2 * s
+    h00 = 2 * s3 - 3 * s2 + 1
+    h10 = s3 - 2 * s2 + s
+    h01 = -2 * s3 + 3 * s2
+    h11 = s3 - s2
+    return (
+        h00 * values[index]
+        + h10 * duration * out_tangents[index]
+        + h01 * values[index + 1]
+        + h11 * duration * in_tangents[index + 1]
+    )
+
+
+def sample_rotation(curves: Sequence[Curve], times: np.ndarray) -> np.ndarray:
+    """Evaluate X, Y and Z curves into an array of shape (len(times), 3)."""
+
+    return np.stack([sample_curve(curve, times) for curve in curves[:3]], axis=-1)
+
+
+def sample_channel(curves: Sequence[Curve], times: np.ndarray) -> np.ndarray:
+    """Evaluate the curves of a channel into an array of shape
+    (len(times), len(curves)).
+    """
+
+    return np.stack([sample_curve(curve, times) for curve in curves], axis=-1)
+
+
+def sample_weight(weight: float | Curve, times: np.ndarray) -> float | np.ndarray:
+    """Evaluate an animated weight at `times`, constant weights are returned as is."""
+
+    if isinstance(weight, Curve):
+        return sample_curve(weight, times)
+    return weight
+
+
+# Quaternions are stored as (..., 4) arrays in (w, x, y, z) order.
+
+
+def euler_to_quaternion(angles: np.ndarray) -> np.ndarray:
+    """Convert Euler XYZ angles in degrees to quaternions."""
+
+    half = np.radians(angles) / 2
+    cx, cy, cz = np.cos(half[..., 0]), np.cos(half[..., 1]), np.cos(half[..., 2])
+    sx, sy, sz = np.sin(half[..., 0]), np.sin(half[..., 1]), np.sin(half[..., 2])
+    # Rotate about X, then Y, then Z: q = qz * qy * qx
+    return np.stack(
+        (
+            cx * cy * cz + sx * sy * sz,
+            sx * cy * cz - cx * sy * sz,
+            cx * sy * cz + sx * cy * sz,
+            cx * cy * sz - sx * sy * cz,
+        ),
+        axis=-1,
+    )
+
+
+def quaternion_to_euler(quaternions: np.ndarray) -> np.ndarray:
+    """Convert quaternions to Euler XYZ angles in degrees."""
+
+    w, x, y, z = np.moveaxis(quaternions, -1, 0)
+    angles = np.stack(
+        (
+            np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y)),
+            np.arcsin(np.clip(2 * (w * y - z * x), -1, 1)),
+            np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z)),
+        ),
+        axis=-1,
+    )
+    return np.degrees(angles)
+
+
+def multiply(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack(
+        (
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+        ),
+        axis=-1,
+    )
+
+
+def weighted(quaternions: np.ndarray, weights: np.ndarray | float) -> np.ndarray:
+    """Slerp from the identity rotation towards `quaternions` by `weights`."""
+
+    quaternions = np.where(quaternions[..., :1] < 0, -quaternions, quaternions)
+    w = np.clip(quaternions[..., 0], -1, 1)
+    angle = np.arccos(w)
+    sin_angle = np.sin(angle)
+    weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), w.shape)
+    scaled = angle * weights
+    safe = sin_angle > 1e-9
+    factor = np.where(safe, np.sin(scaled) / np.where(safe, sin_angle, 1), weights)
+    result = np.empty_like(quaternions)
+    result[..., 0] = np.cos(scaled)
+    result[..., 1:] = quaternions[..., 1:] * factor[..., None]
+    return result
+
+
+def compose_layers(
+    base: np.ndarray,
+    layers: Sequence[tuple[np.ndarray, np.ndarray | float]],
+) -> np.ndarray:
+    """Compose a base rotation with weighted layer rotations.
+
+    `base` and each layer's angles have shape (frames, 3) in degrees. Layers
+    are applied in order, each relative to the result of the previous ones.
+    Returns continuous Euler angles without 360 degree flips.
+    """
+
+    result = euler_to_quaternion(base)
+    for angles, weight in layers:
+        result = multiply(result, weighted(euler_to_quaternion(angles), weight))
+    angles = quaternion_to_euler(result)
+    return np.degrees(np.unwrap(np.radians(angles), axis=0))
+
+
+def add_layers(
+    base: np.ndarray,
+    layers: Sequence[tuple[np.ndarray, np.ndarray | float]],
+) -> np.ndarray:
+    """Add weighted layer values of shape (frames, axes) to the base values."""
+
+    result = np.array(base, dtype=np.float64)
+    for values, weight in layers:
+        result += np.reshape(weight, (-1, 1)) * values
+    return result
+
+
+def curve_from_samples(times: np.ndarray, values: np.ndarray) -> Curve:
+    """Create a curve with a key per sample and finite difference tangents."""
+
+    if len(times) > 1:
+        tangents = np.gradient(values, times)
+    else:
+        tangents = np.zeros_like(values)
+    return Curve(
+        times=times, values=values, in_tangents=tangents, out_tangents=tangents
+    )
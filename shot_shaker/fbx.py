@@ -0,0 +1,752 @@
+"""Minimal FBX reader for extracting animation curves without the FBX importer.
+
+Supports binary and ASCII files of FBX version 7.x. Anything else raises
+FBXError so callers can fall back to ``rt.ImportFile``.
+
+Files with another axis system than the Z-up one of 3ds Max, like the Y-up
+default of its FBX exporter, are converted the way the exporter converted
+them: the transform of a top-level node is rotated by the change of axes.
+
+Distances are converted from the units of the file to centimeters. The FOV is
+converted to the horizontal FOV of 3ds Max from the property the aperture mode
+of the camera uses, like its focal length.
+"""
+
+from __future__ import annotations
+
+import array
+import bisect
+import dataclasses
+import math
+import re
+import struct
+import sys
+import zlib
+from collections.abc import Callable, Iterator
+
+from shot_shaker import channels
+from shot_shaker.curves import Curve
+
+BINARY_MAGIC = b'Kaydara FBX Binary  \x00\x1a\x00'
+KTIME_PER_SECOND = 46186158000
+AXES = channels.XYZ
+DISTANCE_PROPERTIES = {
+    channel.fbx_property for channel in channels.CHANNELS if channel.distance
+}
+
+# Axis system of 3ds Max as (axis, sign) of the right, up and front vectors.
+MAX_AXIS_SYSTEM = ((0, 1), (2, 1), (1, -1))
+# Seconds between the samples that give the tangents of converted rotations.
+TANGENT_STEP = 1e-4
+
+# ApertureMode of cameras and the film size defaults in inches.
+APERTURE_HORIZONTAL_AND_VERTICAL = 0
+APERTURE_HORIZONTAL = 1
+APERTURE_VERTICAL = 2
+APERTURE_FOCAL_LENGTH = 3
+FILM_WIDTH = 0.816
+FILM_HEIGHT = 0.612
+MM_PER_INCH = 25.4
+
+# KeyAttrFlags
+INTERPOLATION_CONSTANT = 0x00000002
+INTERPOLATION_LINEAR = 0x00000004
+INTERPOLATION_CUBIC = 0x00000008
+
+
+class FBXError(Exception):
+    pass
+
+
+class NodeNotFoundError(FBXError):
+    pass
+
+
+@dataclasses.dataclass
+class Node:
+    name: str
+    properties: list
+    children: list[Node] = dataclasses.field(default_factory=list)
+
+    def find(self, name: str) -> Node | None:
+        for child in self.children:
+            if child.name == name:
+                return child
+        return None
+
+    def find_all(self, name: str) -> Iterator[Node]:
+        for child in self.children:
+            if child.name == name:
+                yield child
+
+    def array(self, name: str) -> list:
+        # Binary files store arrays as a single property, ASCII files as an
+        # `a` child node.
+        child = self.find(name)
+        if child is None:
+            return []
+        a = child.find('a')
+        if a is not None:
+            return a.properties
+        if child.properties and isinstance(child.properties[0], (list, array.array)):
+            return child.properties[0]
+        return child.properties
+
+
+def read(path: str) -> Node:
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data.startswith(BINARY_MAGIC):
+        return parse_binary(data)
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        raise FBXError(f'{path!r} is not a valid FBX file.') from e
+    return parse_ascii(text)
+
+
+# Binary
+
+
+_ARRAY_TYPES = {'f': 'f', 'd': 'd', 'l': 'q', 'i': 'i', 'b': 'b'}
+_SCALAR_TYPES = {'Y': '<h', 'C': '?', 'I': '<i', 'F': '<f', 'D': '<d', 'L': '<q'}
+
+
+def parse_binary(data: bytes) -> Node:
+    if len(data) < 27:
+        raise FBXError('Unexpected end of file.')
+    version = struct.unpack_from('<I', data, 23)[0]
+    if version < 7000:
+        raise FBXError(f'Unsupported FBX version: {version}')
+    header_format = '<QQQ' if version >= 7500 else '<III'
+    header_size = struct.calcsize(header_format)
+
+    def read_node(offset: int) -> tuple[Node | None, int]:
+        end_offset, property_count, _ = struct.unpack_from(header_format, data, offset)
+        offset += header_size
+        if end_offset == 0:
+            return None, offset + 1
+        name_length = data[offset]
+        offset += 1
+        name = data[offset : offset + name_length].decode('utf-8', 'replace')
+        offset += name_length
+
+        properties = []
+        for _ in range(property_count):
+            value, offset = read_property(offset)
+            properties.append(value)
+
+        node = Node(name, properties)
+        while offset < end_offset:
+            child, offset = read_node(offset)
+            if child is None:
+                break
+            node.children.append(child)
+        return node, end_offset
+
+    def read_property(offset: int) -> tuple[object, int]:
+        type_code = chr(data[offset])
+        offset += 1
+        if type_code in _SCALAR_TYPES:
+            fmt = _SCALAR_TYPES[type_code]
+            value = struct.unpack_from(fmt, data, offset)[0]
+            return value, offset + struct.calcsize(fmt)
+        if type_code in _ARRAY_TYPES:
+            length, encoding, compressed_length = struct.unpack_from(
+                '<III', data, offset
+            )
+            offset += 12
+            buffer = data[offset : offset + compressed_length]
+            if encoding == 1:
+                buffer = zlib.decompress(buffer)
+            values = array.array(_ARRAY_TYPES[type_code])
+            values.frombytes(buffer[: length * values.itemsize])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            return values, offset + compressed_length
+        if type_code in ('S', 'R'):
+            length = struct.unpack_from('<I', data, offset)[0]
+            offset += 4
+            value = data[offset : offset + length]
+            if type_code == 'S':
+                value = value.decode('utf-8', 'replace')
+            return value, offset + length
+        raise FBXError(f'Unknown property type: {type_code!r}')
+
+    root = Node('', [])
+    offset = 27
+    try:
+        while offset < len(data):
+            node, offset = read_node(offset)
+            if node is None:
+                break
+            root.children.append(node)
+    except (struct.error, IndexError, zlib.error) as e:
+        raise FBXError(f'Corrupt binary FBX: {e}') from e
+    return root
+
+
+# ASCII
+
+
+_TOKEN_PATTERN = re.compile(
+    r'''
+    (?P<comment>;[^\n]*)
+    |(?P<string>"[^"]*")
+    |(?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+    |(?P<key>[A-Za-z_|][\w|]*):
+    |(?P<identifier>[A-Za-z_][\w]*)
+    |(?P<symbol>[{},*])
+    |(?P<newline>\n)
+    |(?P<space>[ \t\r]+)
+    ''',
+    re.VERBOSE,
+)
+
+
+def _tokenize(text: str) -> Iterator[tuple[str, str]]:
+    position = 0
+    length = len(text)
+    while position < length:
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise FBXError(f'Unexpected character at offset {position}.')
+        position = match.end()
+        kind = match.lastgroup
+        if kind in ('comment', 'space'):
+            continue
+        value = match.group('key') if kind == 'key' else match.group(kind)
+        yield kind, value
+
+
+def parse_ascii(text: str) -> Node:
+    if 'FBXHeaderExtension' not in text:
+        raise FBXError('Not an FBX file.')
+    tokens = list(_tokenize(text))
+    position = 0
+
+    def parse_value(kind: str, value: str) -> object:
+        if kind == 'string':
+            return value[1:-1]
+        if kind == 'number':
+            if re.fullmatch(r'[-+]?\d+', value):
+                return int(value)
+            return float(value)
+        return value
+
+    def parse_children(parent: Node) -> None:
+        nonlocal position
+        while position < len(tokens):
+            kind, value = tokens[position]
+            position += 1
+            if kind == 'newline':
+                continue
+            if kind == 'symbol' and value == '}':
+                return
+            if kind != 'key':
+                raise FBXError(f'Unexpected token: {value!r}')
+
+            node = Node(value, [])
+            parent.children.append(node)
+            continuation = True
+            while position < len(tokens):
+                kind, value = tokens[position]
+                if kind == 'newline':
+                    position += 1
+                    if continuation:
+                        continue
+                    break
+                if kind == 'symbol' and value == '{':
+                    position += 1
+                    parse_children(node)
+                    break
+                if kind == 'symbol' and value == '}':
+                    break
+                if kind == 'key':
+                    break
+                position += 1
+                if kind == 'symbol' and value == ',':
+                    continuation = True
+                    continue
+                if kind == 'symbol' and value == '*':
+                    continue
+                node.properties.append(parse_value(kind, value))
+                continuation = False
+
+    root = Node('', [])
+    parse_children(root)
+    return root
+
+
+# Animation
+
+
+def _object_name(value: str) -> tuple[str, str]:
+    if '\x00\x01' in value:
+        name, class_name = value.split('\x00\x01', 1)
+        return name, class_name
+    if '::' in value:
+        class_name, name = value.split('::', 1)
+        return name, class_name
+    return value, ''
+
+
+def _property70(node: Node, name: str) -> list | None:
+    properties = node.find('Properties70')
+    if properties is None:
+        return None
+    for p in properties.find_all('P'):
+        if p.properties and p.properties[0] == name:
+            return p.properties[4:]
+    return None
+
+
+def read_curves(
+    path: str, node_name: str, channel: str = 'Lcl Rotation'
+) -> tuple[Curve, Curve, Curve]:
+    """Read the X, Y and Z curves of a node's channel."""
+
+    root = read(path)
+    return extract_curves(root, node_name, channel)
+
+
+def read_channels(path: str, node_name: str) -> dict[str, tuple[Curve, ...]]:
+    """Read the curves of all animated channels of a camera."""
+
+    root = read(path)
+    return extract_channels(root, node_name)
+
+
+def extract_curves(
+    root: Node, node_name: str, channel: str = 'Lcl Rotation'
+) -> tuple[Curve, Curve, Curve]:
+    animation = _Animation(root, node_name)
+    curves = animation.curves(animation.model_ids, channel, AXES)
+    if curves is None:
+        raise FBXError(f'{node_name!r} has no animation on {channel!r}.')
+    return curves
+
+
+def extract_channels(root: Node, node_name: str) -> dict[str, tuple[Curve, ...]]:
+    """Return the curves of every channel in `channels.CHANNELS` that is
+    animated on the node or its camera attribute.
+    """
+
+    animation = _Animation(root, node_name)
+    result = {}
+    for channel in channels.CHANNELS:
+        if channel is channels.FOV:
+            curves = animation.fov_curves()
+        else:
+            if channel.object_track:
+                parent_ids = animation.attribute_ids
+            else:
+                parent_ids = animation.model_ids
+            curves = animation.curves(
+                parent_ids, channel.fbx_property, channel.fbx_axes
+            )
+        if curves is not None:
+            result[channel.name] = curves
+    if not result:
+        raise FBXError(f'{node_name!r} has no animation.')
+    return result
+
+
+class _Animation:
+    """Animation curves connected to a model, indexed for channel lookups."""
+
+    def __init__(self, root: Node, node_name: str) -> None:
+        global_settings = root.find('GlobalSettings')
+        conversion = None
+        # Centimeters per unit of the file.
+        self.unit_scale = 1.0
+        if global_settings is not None:
+            conversion = _axis_conversion(global_settings)
+            unit_scale = _property70(global_settings, 'UnitScaleFactor')
+            if unit_scale:
+                self.unit_scale = float(unit_scale[0])
+
+        objects = root.find('Objects')
+        connections = root.find('Connections')
+        if objects is None or connections is None:
+            raise FBXError('File contains no objects.')
+
+        self.model_ids = []
+        self.attribute_ids = []
+        self.curve_nodes = {}
+        self.curve_objects = {}
+        attributes = {}
+        for obj in objects.children:
+            if len(obj.properties) < 2:
+                continue
+            object_id = obj.properties[0]
+            name, _ = _object_name(obj.properties[1])
+            if obj.name == 'Model' and name == node_name:
+                self.model_ids.append(object_id)
+            elif obj.name == 'NodeAttribute':
+                attributes[object_id] = obj
+            elif obj.name == 'AnimationCurveNode':
+                self.curve_nodes[object_id] = obj
+            elif obj.name == 'AnimationCurve':
+                self.curve_objects[object_id] = obj
+
+        if not self.model_ids:
+            raise NodeNotFoundError(f'No node named {node_name!r}.')
+
+        self.links = []
+        self.attributes = []
+        top_level = False
+        for connection in connections.find_all('C'):
+            properties = connection.properties
+            if len(properties) >= 4 and properties[0] == 'OP':
+                self.links.append(tuple(properties[1:4]))
+            elif len(properties) >= 3 and properties[0] == 'OO':
+                # Camera attributes are connected to their model.
+                if properties[1] in attributes and properties[2] in self.model_ids:
+                    self.attribute_ids.append(properties[1])
+                    self.attributes.append(attributes[properties[1]])
+                # Top-level models are connected to the root node 0.
+                elif properties[1] in self.model_ids and properties[2] == 0:
+                    top_level = True
+        # Children inherit the conversion from their top-level parent.
+        self.conversion = conversion if top_level else None
+
+    def curves(
+        self, parent_ids: list, property_name: str, axes: tuple[str, ...]
+    ) -> tuple[Curve, ...] | None:
+        """Return a curve per axis of the property, or None if it has no
+        animation.
+        """
+
+        curve_node_id = None
+        for child_id, parent_id, name in self.links:
+            if (
+                parent_id in parent_ids
+                and name == property_name
+                and child_id in self.curve_nodes
+            ):
+                curve_node_id = child_id
+                break
+        if curve_node_id is None:
+            return None
+
+        axis_curves: dict[str, Node] = {}
+        for child_id, parent_id, name in self.links:
+            if parent_id == curve_node_id and child_id in self.curve_objects:
+                axis_curves.setdefault(name, self.curve_objects[child_id])
+
+        result = []
+        for axis in axes:
+            curve_node = axis_curves.get(axis)
+            if curve_node is None:
+                default = _property70(self.curve_nodes[curve_node_id], axis)
+                value = float(default[0]) if default else 0.0
+                result.append(_constant_curve(value))
+            else:
+                result.append(_decode_curve(curve_node))
+
+        if self.conversion is not None:
+            if property_name == 'Lcl Translation':
+                result = _convert_vector(result, self.conversion)
+            elif property_name == 'Lcl Rotation':
+                result = _convert_rotation(result, self.conversion)
+        if property_name in DISTANCE_PROPERTIES and self.unit_scale != 1:
+            scale = self.unit_scale
+            result = [
+                _map_curve(curve, lambda v: v * scale, lambda v: scale)
+                for curve in result
+            ]
+        return tuple(result)
+
+    def fov_curves(self) -> tuple[Curve] | None:
+        """Return the horizontal FOV in degrees, or None if it has no
+        animation.
+        """
+
+        mode = int(self.attribute_value('ApertureMode', APERTURE_VERTICAL))
+        if mode == APERTURE_HORIZONTAL_AND_VERTICAL:
+            property_name = 'FieldOfViewX'
+        elif mode == APERTURE_FOCAL_LENGTH:
+            property_name = 'FocalLength'
+        else:
+            property_name = 'FieldOfView'
+        curves = self.curves(self.attribute_ids, property_name, (f'd|{property_name}',))
+        if curves is None or mode in (
+            APERTURE_HORIZONTAL_AND_VERTICAL,
+            APERTURE_HORIZONTAL,
+        ):
+            return curves
+
+        film_width = float(self.attribute_value('FilmWidth', FILM_WIDTH))
+        film_height = float(self.attribute_value('FilmHeight', FILM_HEIGHT))
+        if film_width <= 0 or film_height <= 0:
+            raise FBXError('The film size of the camera is invalid.')
+        if mode == APERTURE_FOCAL_LENGTH:
+            width = film_width * MM_PER_INCH
+
+            def fov(focal_length: float) -> float:
+                return math.degrees(2 * math.atan2(width, 2 * focal_length))
+
+            def slope(focal_length: float) -> float:
+                return math.degrees(-4 * width / (4 * focal_length**2 + width**2))
+
+        else:
+            aspect = film_width / film_height
+
+            def fov(vertical: float) -> float:
+                t = math.tan(math.radians(vertical) / 2)
+                return math.degrees(2 * math.atan(aspect * t))
+
+            def slope(vertical: float) -> float:
+                t = math.tan(math.radians(vertical) / 2)
+                return aspect * (1 + t * t) / (1 + aspect * aspect * t * t)
+
+        return tuple(_map_curve(curve, fov, slope) for curve in curves)
+
+    def attribute_value(self, name: str, default: object) -> object:
+        """Return a property of the camera attribute."""
+
+        for attribute in self.attributes:
+            value = _property70(attribute, name)
+            if value:
+                return value[0]
+        return default
+
+
+def _axis_conversion(
+    global_settings: Node,
+) -> tuple[tuple[int, int], ...] | None:
+    """Return the (axis, sign) in the file of every axis of 3ds Max, or None if
+    the file uses the axis system of 3ds Max.
+    """
+
+    def setting(name: str, default: int) -> int:
+        value = _property70(global_settings, name)
+        return int(value[0]) if value else default
+
+    (right_axis, right_sign), (up_axis, up_sign), _ = MAX_AXIS_SYSTEM
+    right = (setting('CoordAxis', right_axis), setting('CoordAxisSign', right_sign))
+    up = (setting('UpAxis', up_axis), setting('UpAxisSign', up_sign))
+    if right[0] == up[0] or not {right[0], up[0]} <= {0, 1, 2}:
+        raise FBXError('The axis system of the file is invalid.')
+    # Without a front axis, the axis system is right-handed like in 3ds Max.
+    front = _cross(right, up)
+    if _property70(global_settings, 'FrontAxis'):
+        given = (setting('FrontAxis', 0), setting('FrontAxisSign', 1))
+        if given != front:
+            if given[0] == front[0]:
+                raise FBXError('Left-handed axis systems are not supported.')
+            raise FBXError('The axis system of the file is invalid.')
+
+    conversion = [(0, 1)] * 3
+    for (axis, sign), (file_axis, file_sign) in zip(
+        MAX_AXIS_SYSTEM, (right, up, front)
+    ):
+        conversion[axis] = (file_axis, sign * file_sign)
+    if conversion == [(0, 1), (1, 1), (2, 1)]:
+        return None
+    return tuple(conversion)
+
+
+def _cross(a: tuple[int, int], b: tuple[int, int]) -> tuple[int, int]:
+    # Cross product of two signed unit axes.
+    axis = 3 - a[0] - b[0]
+    sign = 1 if (b[0] - a[0]) % 3 == 1 else -1
+    return axis, sign * a[1] * b[1]
+
+
+def _convert_vector(
+    curves: list[Curve], conversion: tuple[tuple[int, int], ...]
+) -> tuple[Curve, ...]:
+    result = []
+    for axis, sign in conversion:
+        curve = curves[axis]
+        if sign < 0:
+            curve = Curve(
+                times=curve.times,
+                values=array.array('d', (-v for v in curve.values)),
+                in_tangents=array.array('d', (-v for v in curve.in_tangents)),
+                out_tangents=array.array('d', (-v for v in curve.out_tangents)),
+            )
+        result.append(curve)
+    return tuple(result)
+
+
+def _convert_rotation(
+    curves: list[Curve], conversion: tuple[tuple[int, int], ...]
+) -> tuple[Curve, ...]:
+    """Rotate Euler XYZ curves by the change of axes.
+
+    The curves are resampled at the key times of all axes. Tangents are taken
+    from the converted rotation just before and after every key.
+    """
+
+    matrix = [[0.0] * 3 for _ in range(3)]
+    for axis, (file_axis, sign) in enumerate(conversion):
+        matrix[axis][file_axis] = float(sign)
+
+    def convert(time: float, reference: list[float] | None) -> list[float]:
+        angles = [_sample(curve, time) for curve in curves]
+        return _rotate_euler(matrix, angles, reference)
+
+    times = sorted({float(t) for curve in curves for t in curve.times})
+    values = [array.array('d') for _ in range(3)]
+    in_tangents = [array.array('d') for _ in range(3)]
+    out_tangents = [array.array('d') for _ in range(3)]
+    previous = None
+    for i, time in enumerate(times):
+        angles = convert(time, previous)
+        before = convert(time - TANGENT_STEP, angles)
+        after = convert(time + TANGENT_STEP, angles)
+        for axis in range(3):
+            in_tangent = (angles[axis] - before[axis]) / TANGENT_STEP
+            out_tangent = (after[axis] - angles[axis]) / TANGENT_STEP
+            # Like decoded curves, the outer keys use their inner tangent.
+            if i == 0:
+                in_tangent = out_tangent
+            if i == len(times) - 1:
+                out_tangent = in_tangent
+            values[axis].append(angles[axis])
+            in_tangents[axis].append(in_tangent)
+            out_tangents[axis].append(out_tangent)
+        previous = angles
+
+    return tuple(
+        Curve(
+            times=array.array('d', times),
+            values=values[axis],
+            in_tangents=in_tangents[axis],
+            out_tangents=out_tangents[axis],
+        )
+        for axis in range(3)
+    )
+
+
+def _sample(curve: Curve, time: float) -> float:
+    """Evaluate a Hermite curve like `evaluate.sample_curve`, without NumPy."""
+
+    times = curve.times
+    values = curve.values
+    if not len(times):
+        return 0.0
+    if time <= times[0]:
+        return float(values[0])
+    if time >= times[-1]:
+        return float(values[-1])
+    i = bisect.bisect_right(times, time) - 1
+    duration = times[i + 1] - times[i]
+    if duration <= 0:
+        return float(values[i + 1])
+    s = (time - times[i]) / duration
+    s2 = s * s
+    s3 = s2 * s
+    return (
+        (2 * s3 - 3 * s2 + 1) * values[i]
+        + (s3 - 2 * s2 + s) * duration * curve.out_tangents[i]
+        + (-2 * s3 + 3 * s2) * values[i + 1]
+        + (s3 - s2) * duration * curve.in_tangents[i + 1]
+    )
+
+
+def _rotate_euler(
+    matrix: list[list[float]], angles: list[float], reference: list[float] | None
+) -> list[float]:
+    """Return the Euler XYZ angles in degrees of `matrix` times the rotation of
+    `angles`, without 360 degree flips from `reference`.
+    """
+
+    x, y, z = (math.radians(angle) for angle in angles)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+    # Rotate about X, then Y, then Z like Euler_XYZ.
+    rotation = (
+        (cy * cz, sx * sy * cz - cx * sz, cx * sy * cz + sx * sz),
+        (cy * sz, sx * sy * sz + cx * cz, cx * sy * sz - sx * cz),
+        (-sy, sx * cy, cx * cy),
+    )
+    m = [
+        [sum(matrix[i][k] * rotation[k][j] for k in range(3)) for j in range(3)]
+        for i in range(3)
+    ]
+    result = [
+        math.degrees(math.atan2(m[2][1], m[2][2])),
+        math.degrees(math.asin(max(-1.0, min(1.0, -m[2][0])))),
+        math.degrees(math.atan2(m[1][0], m[0][0])),
+    ]
+    if reference is not None:
+        for axis in range(3):
+            turns = round((reference[axis] - result[axis]) / 360)
+            result[axis] += 360 * turns
+    return result
+
+
+def _map_curve(
+    curve: Curve, function: Callable[[float], float], slope: Callable[[float], float]
+) -> Curve:
+    # Tangents are scaled by the slope of the function at every key.
+    return Curve(
+        times=curve.times,
+        values=array.array('d', (function(v) for v in curve.values)),
+        in_tangents=array.array(
+            'd', (t * slope(v) for v, t in zip(curve.values, curve.in_tangents))
+        ),
+        out_tangents=array.array(
+            'd', (t * slope(v) for v, t in zip(curve.values, curve.out_tangents))
+        ),
+    )
+
+
+def _constant_curve(value: float) -> Curve:
+    return Curve(
+        times=array.array('d', (0,)),
+        values=array.array('d', (value,)),
+        in_tangents=array.array('d', (0,)),
+        out_tangents=array.array('d', (0,)),
+    )
+
+
+def _decode_curve(node: Node) -> Curve:
+    key_times = node.array('KeyTime')
+    key_values = node.array('KeyValueFloat')
+    if len(key_times) != len(key_values):
+        raise FBXError('Mismatched key times and values.')
+    flags = node.array('KeyAttrFlags')
+    data = node.array('KeyAttrDataFloat')
+    ref_counts = node.array('KeyAttrRefCount')
+
+    count = len(key_times)
+    times = array.array('d', (t / KTIME_PER_SECOND for t in key_times))
+    values = array.array('d', key_values)
+    in_tangents = array.array('d', bytes(8 * count))
+    out_tangents = array.array('d', bytes(8 * count))
+
+    # Key attributes are run-length encoded: each entry is shared by
+    # `ref_count` consecutive keys.
+    attributes = []
+    for i, ref_count in enumerate(ref_counts):
+        flag = flags[i] if i < len(flags) else INTERPOLATION_CUBIC
+        slopes = data[i * 4 : i * 4 + 2] if len(data) >= i * 4 + 2 else (0, 0)
+        attributes.extend([(flag, slopes)] * ref_count)
+
+    for i in range(count - 1):
+        flag, slopes = attributes[i] if i < len(attributes) else (0, (0, 0))
+        duration = times[i + 1] - times[i]
+        if flag & INTERPOLATION_CUBIC:
+            right, next_left = float(slopes[0]), float(slopes[1])
+        elif flag & INTERPOLATION_LINEAR and duration > 0:
+            right = next_left = (values[i + 1] - values[i]) / duration
+        else:
+            right = next_left = 0.0
+        out_tangents[i] = right
+        in_tangents[i + 1] = next_left
+    if count:
+        in_tangents[0] = out_tangents[0]
+        out_tangents[-1] = in_tangents[-1]
+
+    return Curve(
+        times=times,
+        values=values,
+        in_tangents=in_tangents,
+        out_tangents=out_tangents,
+    )
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import glob
 import logging
 import os
+from collections.abc import Iterable, Iterator, Sequence
+from typing import TYPE_CHECKING
 
 try:
     from PySide6 import QtCore, QtGui, QtWidgets
@@ -17,7 +18,11 @@ except ImportError:
 
 
 import shot_shaker
-from shot_shaker import core
+from shot_shaker import core, lib, presets, profiling
+from shot_shaker.curves import Curve
+
+if TYPE_CHECKING:
+    from shot_shaker.analysis import ShakeStats
 
 
 logger = logging.getLogger(__name__)
@@ -68,32 +73,280 @@ class PathWidget(QtWidgets.QWidget):
             self.path_lineedit.setText(result)
 
 
+class PresetScanner(QtCore.QThread):
+    """Update a preset index from disk on a worker thread."""
+
+    scanned = QtCore.Signal(bool)
+
+    def __init__(
+        self, index: presets.PresetIndex, parent: QtCore.QObject | None = None
+    ) -> None:
+        super().__init__(parent)
+        self.index = index
+
+    def run(self) -> None:
+        try:
+            changed = self.index.scan(self.isInterruptionRequested)
+            if changed:
+                self.index.save()
+        except OSError as e:
+            logger.warning(f'Could not index presets: {e}')
+            changed = False
+        self.scanned.emit(changed)
+
+
+class CurveLoader(QtCore.QThread):
+    """Decode the curves of a preset on a worker thread."""
+
+    loaded = QtCore.Signal(str, object)
+
+    def __init__(self, path: str, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+        self.path = path
+
+    def run(self) -> None:
+        from shot_shaker import fbx
+
+        try:
+            curves = presets.load_curves(self.path)
+        except (OSError, fbx.FBXError) as e:
+            logger.debug(f'Could not load preview of {self.path!r}: {e}')
+            curves = None
+        self.loaded.emit(self.path, curves)
+
+
+class CurvePreview(QtWidgets.QWidget):
+    """Plot of the X, Y and Z rotation curves of a preset.
+
+    Curves are decoded in the background and drawn from memory. The weight and
+    start frame only change how the curves are drawn, so updating them is
+    instant.
+    """
+
+    colors = ('#e05050', '#50c050', '#5090ff')
+    margin = 8
+
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self.weight = 1.0
+        self.start_frame = 0
+        self._fps = lib.get_frame_rate()
+        self._path = ''
+        self._message = ''
+        self._curve_paths: tuple[QtGui.QPainterPath, ...] = ()
+        self._loaders: list[CurveLoader] = []
+
+        self.setMinimumHeight(120)
+        self.setSizePolicy(
+            QtWidgets.QSizePolicy.Policy.Expanding,
+            QtWidgets.QSizePolicy.Policy.Expanding,
+        )
+
+    def set_preset(self, path: str) -> None:
+        if path == self._path:
+            return
+        self._path = path
+        self._curve_paths = ()
+        self._message = 'Loading ...' if path else ''
+        if path:
+            loader = CurveLoader(path, parent=self)
+            loader.loaded.connect(self._loaded)
+            loader.finished.connect(lambda: self._finished(loader))
+            self._loaders.append(loader)
+            loader.start()
+        self.update()
+
+    def set_message(self, message: str) -> None:
+        self.set_preset('')
+        self._message = message
+        self.update()
+
+    def set_transform(self, weight: float, start_frame: int) -> None:
+        self.weight = weight
+        self.start_frame = start_frame
+        self.update()
+
+    def wait(self) -> None:
+        for loader in tuple(self._loaders):
+            loader.wait()
+
+    def _loaded(self, path: str, curves: Sequence[Curve] | None) -> None:
+        if path != self._path:
+            return
+        if curves is None:
+            self._message = 'Could not read the preset.'
+        else:
+            self._curve_paths = tuple(_curve_path(curve) for curve in curves[:3])
+            self._message = ''
+        self.update()
+
+    def _finished(self, loader: CurveLoader) -> None:
+        self._loaders.remove(loader)
+        loader.deleteLater()
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        palette = self.palette()
+        painter.fillRect(self.rect(), palette.color(QtGui.QPalette.ColorRole.Base))
+        rect = QtCore.QRectF(self.rect()).adjusted(
+            self.margin, self.margin, -self.margin, -self.margin
+        )
+
+        if not self._curve_paths:
+            painter.setPen(palette.color(QtGui.QPalette.ColorRole.PlaceholderText))
+            painter.drawText(rect, QtCore.Qt.AlignmentFlag.AlignCenter, self._message)
+            return
+
+        # Curves are stored in seconds and degrees of the preset.
+        curve_transform = QtGui.QTransform(
+            self._fps, 0, 0, self.weight, self.start_frame, 0
+        )
+        bounds = QtCore.QRectF()
+        for path in self._curve_paths:
+            bounds = bounds.united(curve_transform.mapRect(path.boundingRect()))
+        # Always include the zero line and avoid a degenerate range.
+        bounds = bounds.united(QtCore.QRectF(bounds.left(), 0, 1, 0))
+        if not bounds.width():
+            bounds.adjust(-1, 0, 1, 0)
+        if not bounds.height():
+            bounds.adjust(0, -1, 0, 1)
+
+        view_transform = QtGui.QTransform()
+        view_transform.translate(rect.left(), rect.bottom())
+        view_transform.scale(
+            rect.width() / bounds.width(), -rect.height() / bounds.height()
+        )
+        view_transform.translate(-bounds.left(), -bounds.top())
+        transform = curve_transform * view_transform
+
+        grid_color = palette.color(QtGui.QPalette.ColorRole.Mid)
+        painter.setPen(QtGui.QPen(grid_color, 0))
+        zero = view_transform.map(QtCore.QPointF(bounds.left(), 0))
+        painter.drawLine(
+            QtCore.QPointF(rect.left(), zero.y()),
+            QtCore.QPointF(rect.right(), zero.y()),
+        )
+
+        for path, color in zip(self._curve_paths, self.colors):
+            pen = QtGui.QPen(QtGui.QColor(color), 1.5)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawPath(transform.map(path))
+
+        painter.setPen(palette.color(QtGui.QPalette.ColorRole.Text))
+        text = (
+            f'{bounds.left():.0f} - {bounds.right():.0f}    '
+            f'{bounds.top():.2f}° - {bounds.bottom():.2f}°'
+        )
+        painter.drawText(rect, QtCore.Qt.AlignmentFlag.AlignLeft, text)
+
+
+def _curve_path(curve: Curve) -> QtGui.QPainterPath:
+    """Convert the Hermite segments of a curve to cubic Bezier segments."""
+
+    path = QtGui.QPainterPath()
+    keys = list(zip(curve.times, curve.values, curve.in_tangents, curve.out_tangents))
+    if not keys:
+        return path
+    time, value, _, out_tangent = keys[0]
+    path.moveTo(float(time), float(value))
+    for next_time, next_value, in_tangent, next_out_tangent in keys[1:]:
+        third = (next_time - time) / 3
+        path.cubicTo(
+            float(time + third),
+            float(value + out_tangent * third),
+            float(next_time - third),
+            float(next_value - in_tangent * third),
+            float(next_time),
+            float(next_value),
+        )
+        time, value, out_tangent = next_time, next_value, next_out_tangent
+    return path
+
+
 class CreateShakeDialog(QtWidgets.QDialog):
-    file_type = 'fbx'
+    headers = ('Preset', 'Camera', 'Start', 'End', 'Keys', 'Peak X', 'Peak Y', 'Peak Z')
+    # Presets the native reader fails on can still load through the importer.
+    camera_match_labels = {True: 'Yes', False: 'No', None: 'Unknown'}
 
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
 
         self._presets_path = ''
+        self._preset_index = None
+        self._scanner = None
 
         self._init_ui()
 
     def _init_ui(self) -> None:
         self.setWindowTitle('Create Shake')
+        self.resize(640, 480)
 
         layout = QtWidgets.QFormLayout()
         self.setLayout(layout)
 
-        self.preset_combo = QtWidgets.QComboBox()
-        layout.addRow('Preset', self.preset_combo)
+        self.preset_tree = QtWidgets.QTreeWidget()
+        self.preset_tree.setHeaderLabels(self.headers)
+        self.preset_tree.setRootIsDecorated(False)
+        self.preset_tree.setUniformRowHeights(True)
+        self.preset_tree.currentItemChanged.connect(self._update_preview)
+        layout.addRow('Preset', self.preset_tree)
+
+        self.preview = CurvePreview()
+        layout.addRow('Preview', self.preview)
 
         self.start_frame_spin = QtWidgets.QSpinBox()
+        self.start_frame_spin.valueChanged.connect(self._update_preview_transform)
         layout.addRow('Start Frame', self.start_frame_spin)
 
         self.weight_spin = QtWidgets.QDoubleSpinBox()
         self.weight_spin.setValue(1)
+        self.weight_spin.valueChanged.connect(self._update_preview_transform)
         layout.addRow('Weight', self.weight_spin)
 
+        self.tolerance_spin = QtWidgets.QDoubleSpinBox()
+        self.tolerance_spin.setDecimals(3)
+        self.tolerance_spin.setSingleStep(0.01)
+        self.tolerance_spin.setSpecialValueText('Keep All Keys')
+        self.tolerance_spin.setToolTip(
+            'Reduce keys while staying within this error in degrees.'
+        )
+        layout.addRow('Key Tolerance', self.tolerance_spin)
+
+        variation_group = QtWidgets.QGroupBox('Variation Per Camera')
+        variation_layout = QtWidgets.QFormLayout()
+        variation_group.setLayout(variation_layout)
+        layout.addRow(variation_group)
+
+        self.time_offset_spin = QtWidgets.QSpinBox()
+        self.time_offset_spin.setRange(0, 100000)
+        self.time_offset_spin.setToolTip(
+            'Skip a random number of frames up to this at the start of the preset.'
+        )
+        variation_layout.addRow('Time Offset', self.time_offset_spin)
+
+        self.amplitude_jitter_spin = QtWidgets.QDoubleSpinBox()
+        self.amplitude_jitter_spin.setRange(0, 1)
+        self.amplitude_jitter_spin.setSingleStep(0.05)
+        self.amplitude_jitter_spin.setToolTip(
+            'Scale the amplitude of each axis randomly by up to +/- this fraction.'
+        )
+        variation_layout.addRow('Amplitude Jitter', self.amplitude_jitter_spin)
+
+        self.rate_jitter_spin = QtWidgets.QDoubleSpinBox()
+        self.rate_jitter_spin.setRange(0, 0.9)
+        self.rate_jitter_spin.setSingleStep(0.05)
+        self.rate_jitter_spin.setToolTip(
+            'Scale the playback rate randomly by up to +/- this fraction.'
+        )
+        variation_layout.addRow('Rate Jitter', self.rate_jitter_spin)
+
+        self.seed_spin = QtWidgets.QSpinBox()
+        self.seed_spin.setRange(0, 2**31 - 1)
+        variation_layout.addRow('Seed', self.seed_spin)
+
         dialog_button_box = QtWidgets.QDialogButtonBox()
         dialog_button_box.setStandardButtons(
             QtWidgets.QDialogButtonBox.StandardButton.Ok
@@ -106,30 +359,963 @@ class CreateShakeDialog(QtWidgets.QDialog):
     def set_presets_path(self, path: str) -> None:
         self._presets_path = path
 
-        self.preset_combo.clear()
-        glob_pattern = os.path.join(self._presets_path, f'*.{self.file_type}')
-        for path in glob.glob(glob_pattern):
-            name, ext = os.path.splitext(os.path.basename(path))
-            self.preset_combo.addItem(name)
+        # Show the last known state immediately and update it in the background.
+        self._preset_index = presets.PresetIndex(path)
+        self._preset_index.load()
+        self._update_presets()
+
+        self._stop_scanner()
+        if os.path.isdir(path):
+            scanner = PresetScanner(self._preset_index, parent=self)
+            scanner.scanned.connect(self._scanned)
+            scanner.finished.connect(scanner.deleteLater)
+            self._scanner = scanner
+            scanner.start()
+
+    def selected_preset(self) -> str:
+        item = self.preset_tree.currentItem()
+        if item is None:
+            return ''
+        return item.data(0, QtCore.Qt.ItemDataRole.UserRole)
 
     def get_data(self) -> core.CreateShakeData:
-        preset_name = self.preset_combo.currentText()
-        preset = os.path.join(self._presets_path, f'{preset_name}.{self.file_type}')
+        preset = self.selected_preset()
         start_frame = self.start_frame_spin.value()
         weight = self.weight_spin.value()
         data = core.CreateShakeData(
-            preset=preset, start_frame=start_frame, weight=weight
+            preset=preset,
+            start_frame=start_frame,
+            weight=weight,
+            tolerance=self.tolerance_spin.value(),
+            time_offset=self.time_offset_spin.value(),
+            amplitude_jitter=self.amplitude_jitter_spin.value(),
+            rate_jitter=self.rate_jitter_spin.value(),
+            seed=self.seed_spin.value(),
+        )
+        return data
+
+    def done(self, result: int) -> None:
+        self._stop_scanner()
+        self.preview.wait()
+        super().done(result)
+
+    def _update_preview(self) -> None:
+        self.preview.set_preset(self.selected_preset())
+
+    def _update_preview_transform(self) -> None:
+        self.preview.set_transform(
+            self.weight_spin.value(), self.start_frame_spin.value()
+        )
+
+    def _stop_scanner(self) -> None:
+        # The scan stops at the next preset and deletes itself once finished,
+        # so it is handed to the application instead of being waited for.
+        scanner = self._scanner
+        self._scanner = None
+        if scanner is None:
+            return
+        try:
+            scanner.scanned.disconnect(self._scanned)
+            scanner.requestInterruption()
+            scanner.setParent(QtWidgets.QApplication.instance())
+        except RuntimeError:
+            # The scanner already finished and was deleted.
+            pass
+
+    def _scanned(self, changed: bool) -> None:
+        if changed:
+            self._update_presets()
+
+    def _update_presets(self) -> None:
+        current = self.selected_preset()
+        fps = lib.get_frame_rate()
+
+        self.preset_tree.clear()
+        items = []
+        for info in self._preset_index.infos():
+            item = QtWidgets.QTreeWidgetItem()
+            name, ext = os.path.splitext(os.path.relpath(info.path, self._presets_path))
+            item.setText(0, name)
+            item.setData(0, QtCore.Qt.ItemDataRole.UserRole, info.path)
+            if info.error:
+                item.setToolTip(0, info.error)
+            item.setText(1, self.camera_match_labels[info.camera_match])
+            display_role = QtCore.Qt.ItemDataRole.DisplayRole
+            item.setData(2, display_role, round(info.start_time * fps))
+            item.setData(3, display_role, round(info.end_time * fps))
+            item.setData(4, display_role, info.key_count)
+            for axis, peak in enumerate(info.peak):
+                item.setText(5 + axis, f'{peak:.3f}')
+            items.append(item)
+        self.preset_tree.addTopLevelItems(items)
+
+        for item in items:
+            if item.data(0, QtCore.Qt.ItemDataRole.UserRole) == current:
+                self.preset_tree.setCurrentItem(item)
+                break
+        else:
+            if items:
+                self.preset_tree.setCurrentItem(items[0])
+
+        for column in range(self.preset_tree.columnCount()):
+            self.preset_tree.resizeColumnToContents(column)
+
+
+class VectorWidget(QtWidgets.QWidget):
+    def __init__(
+        self, decimals: int = 2, parent: QtWidgets.QWidget | None = None
+    ) -> None:
+        super().__init__(parent)
+
+        layout = QtWidgets.QHBoxLayout()
+        layout.setContentsMargins(QtCore.QMargins())
+        self.setLayout(layout)
+
+        self.spin_boxes = []
+        for axis in ('X', 'Y', 'Z'):
+            spin_box = QtWidgets.QDoubleSpinBox()
+            spin_box.setPrefix(f'{axis}: ')
+            spin_box.setDecimals(decimals)
+            spin_box.setMaximum(1000)
+            layout.addWidget(spin_box)
+            self.spin_boxes.append(spin_box)
+
+    def value(self) -> tuple[float, float, float]:
+        return tuple(spin_box.value() for spin_box in self.spin_boxes)
+
+    def set_value(self, value: tuple[float, float, float]) -> None:
+        for spin_box, v in zip(self.spin_boxes, value):
+            spin_box.setValue(v)
+
+
+class ProceduralShakeDialog(QtWidgets.QDialog):
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self._init_ui()
+        self._profile_changed()
+
+    def _init_ui(self) -> None:
+        from shot_shaker import procedural
+
+        self.setWindowTitle('Generate Shake')
+
+        layout = QtWidgets.QFormLayout()
+        self.setLayout(layout)
+
+        self.profile_combo = QtWidgets.QComboBox()
+        self.profile_combo.addItems(tuple(procedural.PROFILES))
+        self.profile_combo.currentIndexChanged.connect(self._profile_changed)
+        layout.addRow('Profile', self.profile_combo)
+
+        self.start_frame_spin = QtWidgets.QSpinBox()
+        self.start_frame_spin.setRange(-100000, 100000)
+        layout.addRow('Start Frame', self.start_frame_spin)
+
+        self.duration_spin = QtWidgets.QSpinBox()
+        self.duration_spin.setRange(1, 100000)
+        self.duration_spin.setValue(100)
+        layout.addRow('Duration', self.duration_spin)
+
+        self.weight_spin = QtWidgets.QDoubleSpinBox()
+        self.weight_spin.setValue(1)
+        layout.addRow('Weight', self.weight_spin)
+
+        self.frequency_widget = VectorWidget()
+        layout.addRow('Frequency', self.frequency_widget)
+
+        self.amplitude_widget = VectorWidget(decimals=3)
+        layout.addRow('Amplitude', self.amplitude_widget)
+
+        self.octaves_spin = QtWidgets.QSpinBox()
+        self.octaves_spin.setRange(1, 8)
+        layout.addRow('Octaves', self.octaves_spin)
+
+        self.decay_spin = QtWidgets.QDoubleSpinBox()
+        layout.addRow('Decay', self.decay_spin)
+
+        self.seed_spin = QtWidgets.QSpinBox()
+        self.seed_spin.setRange(0, 2**31 - 1)
+        layout.addRow('Seed', self.seed_spin)
+
+        dialog_button_box = QtWidgets.QDialogButtonBox()
+        dialog_button_box.setStandardButtons(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok
+            | QtWidgets.QDialogButtonBox.StandardButton.Cancel
+        )
+        dialog_button_box.accepted.connect(self.accept)
+        dialog_button_box.rejected.connect(self.reject)
+        layout.addWidget(dialog_button_box)
+
+    def get_data(self) -> core.ProceduralShakeData:
+        data = core.ProceduralShakeData(
+            profile=self.profile_combo.currentText(),
+            start_frame=self.start_frame_spin.value(),
+            duration=self.duration_spin.value(),
+            weight=self.weight_spin.value(),
+            frequency=self.frequency_widget.value(),
+            amplitude=self.amplitude_widget.value(),
+            octaves=self.octaves_spin.value(),
+            decay=self.decay_spin.value(),
+            seed=self.seed_spin.value(),
+        )
+        return data
+
+    def _profile_changed(self) -> None:
+        from shot_shaker import procedural
+
+        profile = procedural.PROFILES[self.profile_combo.currentText()]
+        self.frequency_widget.set_value(profile['frequency'])
+        self.amplitude_widget.set_value(profile['amplitude'])
+        self.octaves_spin.setValue(profile['octaves'])
+        self.decay_spin.setValue(profile['decay'])
+
+
+class EnvelopeDialog(QtWidgets.QDialog):
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self._init_ui()
+        self._mode_changed()
+
+    def _init_ui(self) -> None:
+        from shot_shaker import envelope
+
+        self.setWindowTitle('Weight Envelope')
+
+        layout = QtWidgets.QFormLayout()
+        self.setLayout(layout)
+
+        self.mode_combo = QtWidgets.QComboBox()
+        self.mode_combo.addItem('Fade', 'fade')
+        self.mode_combo.addItem('Driver Speed', 'speed')
+        self.mode_combo.currentIndexChanged.connect(self._mode_changed)
+        layout.addRow('Mode', self.mode_combo)
+
+        self.start_frame_spin = QtWidgets.QSpinBox()
+        self.start_frame_spin.setRange(-100000, 100000)
+        layout.addRow('Start Frame', self.start_frame_spin)
+
+        self.weight_spin = QtWidgets.QDoubleSpinBox()
+        self.weight_spin.setValue(1)
+        layout.addRow('Weight', self.weight_spin)
+
+        # Fade
+        self.fade_group = QtWidgets.QGroupBox('Fade')
+        fade_layout = QtWidgets.QFormLayout()
+        self.fade_group.setLayout(fade_layout)
+        layout.addRow(self.fade_group)
+
+        self.fade_in_spin = QtWidgets.QSpinBox()
+        self.fade_in_spin.setRange(0, 100000)
+        self.fade_in_spin.setValue(10)
+        fade_layout.addRow('Fade In', self.fade_in_spin)
+
+        self.hold_spin = QtWidgets.QSpinBox()
+        self.hold_spin.setRange(0, 100000)
+        self.hold_spin.setValue(80)
+        fade_layout.addRow('Hold', self.hold_spin)
+
+        self.fade_out_spin = QtWidgets.QSpinBox()
+        self.fade_out_spin.setRange(0, 100000)
+        self.fade_out_spin.setValue(10)
+        fade_layout.addRow('Fade Out', self.fade_out_spin)
+
+        self.easing_combo = QtWidgets.QComboBox()
+        self.easing_combo.addItems(tuple(envelope.EASINGS))
+        fade_layout.addRow('Easing', self.easing_combo)
+
+        # Speed
+        self.speed_group = QtWidgets.QGroupBox('Driver Speed')
+        speed_layout = QtWidgets.QFormLayout()
+        self.speed_group.setLayout(speed_layout)
+        layout.addRow(self.speed_group)
+
+        self.driver_line = QtWidgets.QLineEdit()
+        self.driver_line.setPlaceholderText('Node name')
+        speed_layout.addRow('Driver', self.driver_line)
+
+        self.end_frame_spin = QtWidgets.QSpinBox()
+        self.end_frame_spin.setRange(-100000, 100000)
+        self.end_frame_spin.setValue(100)
+        speed_layout.addRow('End Frame', self.end_frame_spin)
+
+        self.low_speed_spin = QtWidgets.QDoubleSpinBox()
+        self.low_speed_spin.setRange(0, 1e6)
+        speed_layout.addRow('Low Speed', self.low_speed_spin)
+
+        self.high_speed_spin = QtWidgets.QDoubleSpinBox()
+        self.high_speed_spin.setRange(0, 1e6)
+        self.high_speed_spin.setValue(100)
+        speed_layout.addRow('High Speed', self.high_speed_spin)
+
+        self.smoothing_spin = QtWidgets.QSpinBox()
+        self.smoothing_spin.setRange(0, 100)
+        self.smoothing_spin.setValue(2)
+        speed_layout.addRow('Smoothing', self.smoothing_spin)
+
+        dialog_button_box = QtWidgets.QDialogButtonBox()
+        dialog_button_box.setStandardButtons(
+            QtWidgets.QDialogButtonBox.StandardButton.Ok
+            | QtWidgets.QDialogButtonBox.StandardButton.Cancel
+        )
+        dialog_button_box.accepted.connect(self.accept)
+        dialog_button_box.rejected.connect(self.reject)
+        layout.addWidget(dialog_button_box)
+
+    def get_data(self) -> core.EnvelopeData:
+        data = core.EnvelopeData(
+            mode=self.mode_combo.currentData(),
+            start_frame=self.start_frame_spin.value(),
+            weight=self.weight_spin.value(),
+            fade_in=self.fade_in_spin.value(),
+            hold=self.hold_spin.value(),
+            fade_out=self.fade_out_spin.value(),
+            easing=self.easing_combo.currentText(),
+            end_frame=self.end_frame_spin.value(),
+            driver=self.driver_line.text(),
+            low_speed=self.low_speed_spin.value(),
+            high_speed=self.high_speed_spin.value(),
+            smoothing=self.smoothing_spin.value(),
         )
         return data
 
+    def _mode_changed(self) -> None:
+        speed = self.mode_combo.currentData() == 'speed'
+        self.fade_group.setVisible(not speed)
+        self.speed_group.setVisible(speed)
+        self.adjustSize()
+
+
+class StatsDialog(QtWidgets.QDialog):
+    def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
+        super().__init__(parent)
+
+        self._init_ui()
+        self.update_stats()
+
+    def _init_ui(self) -> None:
+        self.setWindowTitle('Stats')
+        self.resize(640, 480)
+
+        layout = QtWidgets.QVBoxLayout()
+        self.setLayout(layout)
+
+        self.enabled_check = QtWidgets.QCheckBox('Profile Runtime Calls')
+        self.enabled_check.setChecked(profiling.enabled())
+        self.enabled_check.toggled.connect(self._enabled_toggled)
+        layout.addWidget(self.enabled_check)
+
+        self.summary_edit = QtWidgets.QPlainTextEdit()
+        self.summary_edit.setReadOnly(True)
+        self.summary_edit.setLineWrapMode(QtWidgets.QPlainTextEdit.LineWrapMode.NoWrap)
+        font = QtGui.QFontDatabase.systemFont(QtGui.QFontDatabase.SystemFont.FixedFont)
+        self.summary_edit.setFont(font)
+        layout.addWidget(self.summary_edit)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        layout.addLayout(button_layout)
+        button_layout.addStretch()
+
+        button = QtWidgets.QPushButton('Update')
+        button.clicked.connect(self.update_stats)
+        button_layout.addWidget(button)
+
+        button = QtWidgets.QPushButton('Reset')
+        button.clicked.connect(self._reset)
+        button_layout.addWidget(button)
+
+        button = QtWidgets.QPushButton('Log')
+        button.clicked.connect(profiling.log_summary)
+        button_layout.addWidget(button)
+
+    def update_stats(self) -> None:
+        stats = profiling.stats()
+        if stats is None:
+            self.summary_edit.setPlainText('Profiling is disabled.')
+        else:
+            self.summary_edit.setPlainText(stats.summary())
+
+    def _enabled_toggled(self, checked: bool) -> None:
+        if checked:
+            profiling.enable()
+        else:
+            profiling.disable()
+        self.update_stats()
+
+    def _reset(self) -> None:
+        profiling.reset()
+        self.update_stats()
+
+
+class CameraModel(QtCore.QAbstractItemModel):
+    """Lazy model of cameras and their layers.
+
+    Camera rows are fetched in batches and layers are only read from the scene
+    once a camera row is expanded. Rows are keyed by the camera's anim handle
+    so that updates can be patched in without resetting the model.
+
+    Layer edits are shown right away but only applied to the scene once no
+    further edits arrived for `commit_delay` milliseconds, so a burst of edits
+    becomes a single transaction.
+    """
+
+    headers = (
+        'Camera',
+        'Weight',
+        'Start Frame',
+        'Preset',
+        'Mute',
+        'Bake',
+        'Peak',
+        'RMS',
+        'Frames Over',
+    )
+    batch_size = 256
+    commit_delay = 250
+
+    def __init__(self, parent: QtCore.QObject | None = None) -> None:
+        super().__init__(parent)
+
+        self._cameras: list[core.Camera] = []
+        self._rows: dict[int, int] = {}
+        self._fetched = 0
+        # Shake stats by camera handle, until the camera changes.
+        self._stats: dict[int, ShakeStats] = {}
+        # Edited values by camera handle, layer name and column.
+        self._pending: dict[tuple[int, str, int], float | int | bool] = {}
+        self._commit_timer = QtCore.QTimer(self)
+        self._commit_timer.setSingleShot(True)
+        self._commit_timer.setInterval(self.commit_delay)
+        self._commit_timer.timeout.connect(self.commit)
+
+    # Patching
+
+    def set_cameras(self, cameras: tuple[core.Camera, ...]) -> None:
+        handles = {camera.handle for camera in cameras}
+        for handle in tuple(self._rows):
+            if handle not in handles:
+                self.remove_camera(handle)
+        for camera in cameras:
+            if camera.handle in self._rows:
+                self.update_camera(camera)
+            else:
+                # New cameras are left for fetchMore.
+                self._insert_camera(camera)
+        if self._fetched < self.batch_size:
+            self.fetchMore(QtCore.QModelIndex())
+
+    def add_cameras(self, cameras: Iterable[core.Camera]) -> None:
+        """Add new cameras and update the existing ones."""
+
+        for camera in cameras:
+            if camera.handle in self._rows:
+                self.update_camera(camera)
+            else:
+                self._insert_camera(camera)
+        if self._fetched < self.batch_size:
+            self.fetchMore(QtCore.QModelIndex())
+
+    def update_camera(self, camera: core.Camera) -> None:
+        self._stats.pop(camera.handle, None)
+        row = self._rows.get(camera.handle)
+        if row is None:
+            row = len(self._cameras)
+            if self._fetched == row:
+                self.beginInsertRows(QtCore.QModelIndex(), row, row)
+                self._insert_camera(camera)
+                self._fetched += 1
+                self.endInsertRows()
+            else:
+                self._insert_camera(camera)
+            return
+
+        if row >= self._fetched:
+            # The view does not know about rows that were not fetched yet.
+            self._cameras[row] = camera
+            return
+
+        previous = self._cameras[row]
+        parent = self.index(row, 0)
+        if not previous.layers_loaded:
+            # Layers restored from the cache are inserted like fetched layers.
+            new_count = len(camera.layers) if camera.layers_loaded else 0
+            if new_count:
+                self.beginInsertRows(parent, 0, new_count - 1)
+                self._cameras[row] = camera
+                self.endInsertRows()
+            else:
+                self._cameras[row] = camera
+        else:
+            # Only re-read layers that were already shown.
+            old_count = len(previous.layers)
+            new_count = len(camera.layers)
+            if new_count < old_count:
+                self.beginRemoveRows(parent, new_count, old_count - 1)
+                self._cameras[row] = camera
+                self.endRemoveRows()
+            elif new_count > old_count:
+                self.beginInsertRows(parent, old_count, new_count - 1)
+                self._cameras[row] = camera
+                self.endInsertRows()
+            else:
+                self._cameras[row] = camera
+            if new_count:
+                self.dataChanged.emit(
+                    self.index(0, 0, parent),
+                    self.index(new_count - 1, len(self.headers) - 1, parent),
+                )
+        self.dataChanged.emit(parent, self.index(row, len(self.headers) - 1))
+
+    def remove_camera(self, handle: int) -> None:
+        self._stats.pop(handle, None)
+        row = self._rows.get(handle)
+        if row is None:
+            return
+        if row < self._fetched:
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            self._pop_camera(row)
+            self._fetched -= 1
+            self.endRemoveRows()
+        else:
+            self._pop_camera(row)
+
+    def handles(self) -> tuple[int, ...]:
+        return tuple(self._rows)
+
+    def set_stats(self, handle: int, stats: ShakeStats) -> None:
+        row = self._rows.get(handle)
+        if row is None:
+            return
+        self._stats[handle] = stats
+        if row < self._fetched:
+            self.dataChanged.emit(
+                self.index(row, 6), self.index(row, len(self.headers) - 1)
+            )
+
+    # Editing
+
+    def commit(self) -> None:
+        """Apply all pending layer edits to the scene in a single transaction."""
+
+        self._commit_timer.stop()
+        pending = self._pending
+        if not pending:
+            return
+        self._pending = {}
+
+        rows = set()
+        try:
+            with lib.transaction('Edit Shake'):
+                for (handle, name, column), value in pending.items():
+                    layer = self._find_layer(handle, name)
+                    if layer is None:
+                        continue
+                    if column == 1:
+                        layer.set_weight(value)
+                    elif column == 2:
+                        layer.set_start_frame(value)
+                    elif column == 4:
+                        layer.set_muted(value)
+                    rows.add(self._rows[handle])
+        except RuntimeError as e:
+            logger.error(f'Could not apply edits: {e}')
+
+        for row in rows:
+            parent = self.index(row, 0)
+            count = self.rowCount(parent)
+            if count:
+                self.dataChanged.emit(
+                    self.index(0, 0, parent),
+                    self.index(count - 1, len(self.headers) - 1, parent),
+                )
+
+    def _find_layer(self, handle: int, name: str) -> core.Layer | None:
+        # Cameras might have been replaced since the edit, so the current
+        # snapshot is looked up by name.
+        row = self._rows.get(handle)
+        if row is None:
+            return None
+        camera = self._cameras[row]
+        if not camera.layers_loaded:
+            return None
+        for layer in camera.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def _layer_value(self, layer: core.Layer, column: int, value):
+        return self._pending.get((layer.camera.handle, layer.name, column), value)
+
+    def camera(self, index: QtCore.QModelIndex) -> core.Camera | None:
+        if index.isValid() and not index.internalId():
+            return self._cameras[index.row()]
+        return None
+
+    def layer(self, index: QtCore.QModelIndex) -> core.Layer | None:
+        if index.isValid() and index.internalId():
+            camera = self._cameras[self._rows[index.internalId()]]
+            return camera.layers[index.row()]
+        return None
+
+    def _insert_camera(self, camera: core.Camera) -> None:
+        self._rows[camera.handle] = len(self._cameras)
+        self._cameras.append(camera)
+
+    def _pop_camera(self, row: int) -> None:
+        camera = self._cameras.pop(row)
+        del self._rows[camera.handle]
+        for i in range(row, len(self._cameras)):
+            self._rows[self._cameras[i].handle] = i
+
+    # QAbstractItemModel
+
+    def index(
+        self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()
+    ) -> QtCore.QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+        if parent.isValid():
+            # Layer rows store their camera's handle as internal id.
+            camera = self._cameras[parent.row()]
+            return self.createIndex(row, column, camera.handle)
+        return self.createIndex(row, column, 0)
+
+    def parent(self, index: QtCore.QModelIndex) -> QtCore.QModelIndex:
+        if not index.isValid() or not index.internalId():
+            return QtCore.QModelIndex()
+        row = self._rows.get(index.internalId())
+        if row is None:
+            return QtCore.QModelIndex()
+        return self.createIndex(row, 0, 0)
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if not parent.isValid():
+            return self._fetched
+        if parent.column() > 0 or parent.internalId():
+            return 0
+        camera = self._cameras[parent.row()]
+        return len(camera.layers) if camera.layers_loaded else 0
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return len(self.headers)
+
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        if not parent.isValid():
+            return bool(self._cameras)
+        if parent.column() > 0 or parent.internalId():
+            return False
+        camera = self._cameras[parent.row()]
+        return not camera.layers_loaded or bool(camera.layers)
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        if not parent.isValid():
+            return self._fetched < len(self._cameras)
+        if parent.internalId():
+            return False
+        return not self._cameras[parent.row()].layers_loaded
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        if not parent.isValid():
+            count = min(self.batch_size, len(self._cameras) - self._fetched)
+            if count > 0:
+                first = self._fetched
+                self.beginInsertRows(parent, first, first + count - 1)
+                self._fetched += count
+                self.endInsertRows()
+            return
+
+        camera = self._cameras[parent.row()]
+        if camera.layers_loaded:
+            return
+        layers = camera.layers
+        if layers:
+            self.beginInsertRows(parent, 0, len(layers) - 1)
+            self.endInsertRows()
+
+    def headerData(
+        self,
+        section: int,
+        orientation: QtCore.Qt.Orientation,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole,
+    ):
+        if (
+            orientation == QtCore.Qt.Orientation.Horizontal
+            and role == QtCore.Qt.ItemDataRole.DisplayRole
+        ):
+            return self.headers[section]
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        flags = super().flags(index)
+        if not index.isValid():
+            return flags
+        column = index.column()
+        if not index.internalId():
+            if column == 0:
+                flags |= QtCore.Qt.ItemFlag.ItemIsEditable
+            elif column == 5:
+                flags |= QtCore.Qt.ItemFlag.ItemIsUserCheckable
+        elif column in (1, 2):
+            flags |= QtCore.Qt.ItemFlag.ItemIsEditable
+        elif column == 4:
+            flags |= QtCore.Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def data(
+        self,
+        index: QtCore.QModelIndex,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole,
+    ):
+        if not index.isValid():
+            return None
+        column = index.column()
+        display_roles = (
+            QtCore.Qt.ItemDataRole.DisplayRole,
+            QtCore.Qt.ItemDataRole.EditRole,
+        )
+
+        camera = self.camera(index)
+        if camera is not None:
+            if column == 0 and role in display_roles:
+                return camera.name
+            if column == 5 and role == QtCore.Qt.ItemDataRole.CheckStateRole:
+                return _check_state(camera.baked)
+            if column >= 6:
+                return self._stats_data(camera, column, role)
+            if role == QtCore.Qt.ItemDataRole.UserRole:
+                return camera
+            return None
+
+        layer = self.layer(index)
+        if role in display_roles:
+            if column == 0:
+                return layer.name
+            if column == 1:
+                return self._layer_value(layer, column, layer.weight)
+            if column == 2:
+                return self._layer_value(layer, column, layer.start_frame)
+            if column == 3:
+                return layer.preset
+        elif role == QtCore.Qt.ItemDataRole.CheckStateRole:
+            if column == 4:
+                return _check_state(self._layer_value(layer, column, layer.muted))
+        elif column == 1 and self._is_animated(layer):
+            if role == QtCore.Qt.ItemDataRole.FontRole:
+                font = QtGui.QFont()
+                font.setItalic(True)
+                return font
+            if role == QtCore.Qt.ItemDataRole.ToolTipRole:
+                return 'Animated weight, editing it replaces the envelope.'
+        elif role == QtCore.Qt.ItemDataRole.UserRole:
+            return layer
+        return None
+
+    def _is_animated(self, layer: core.Layer) -> bool:
+        # A pending weight edit replaces the envelope.
+        key = (layer.camera.handle, layer.name, 1)
+        return layer.animated and key not in self._pending
+
+    def _stats_data(self, camera: core.Camera, column: int, role: int):
+        stats = self._stats.get(camera.handle)
+        if stats is None:
+            return None
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            if column == 6:
+                return _format_axes(stats.peak)
+            if column == 7:
+                return _format_axes(stats.rms)
+            if column == 8:
+                return len(stats.frames_over)
+        elif role == QtCore.Qt.ItemDataRole.ToolTipRole:
+            from shot_shaker import analysis
+
+            return (
+                f'Peak angle: {stats.peak_angle:.3f}°\n'
+                f'Peak velocity: {stats.peak_velocity:.2f}°/s\n'
+                f'Peak acceleration: {stats.peak_acceleration:.2f}°/s²\n'
+                f'Frames over {stats.threshold:g}°: '
+                f'{analysis.frame_ranges(stats.frames_over)}'
+            )
+        elif role == QtCore.Qt.ItemDataRole.ForegroundRole:
+            if stats.frames_over:
+                return QtGui.QBrush(QtGui.QColor('orangered'))
+        return None
+
+    def setData(
+        self,
+        index: QtCore.QModelIndex,
+        value,
+        role: int = QtCore.Qt.ItemDataRole.EditRole,
+    ) -> bool:
+        if not index.isValid():
+            return False
+        column = index.column()
+
+        camera = self.camera(index)
+        if camera is not None:
+            if column == 0 and role == QtCore.Qt.ItemDataRole.EditRole:
+                camera.set_name(value)
+                self.dataChanged.emit(index, index)
+                return True
+            if column == 5 and role == QtCore.Qt.ItemDataRole.CheckStateRole:
+                try:
+                    if _is_checked(value):
+                        results = core.bake_cameras((camera,))
+                    else:
+                        results = core.unbake_cameras((camera,))
+                except ImportError as e:
+                    logger.error(f'Baking requires NumPy: {e}')
+                    return False
+                for result in results:
+                    if result.error:
+                        logger.error(result.error)
+                updated = core.get_camera(camera.handle)
+                if updated is not None:
+                    self.update_camera(updated)
+                return True
+            return False
+
+        layer = self.layer(index)
+        if role == QtCore.Qt.ItemDataRole.EditRole:
+            if column == 1:
+                value = float(value)
+            elif column == 2:
+                value = int(value)
+            else:
+                return False
+        elif role == QtCore.Qt.ItemDataRole.CheckStateRole and column == 4:
+            value = _is_checked(value)
+        else:
+            return False
+        self._pending[(layer.camera.handle, layer.name, column)] = value
+        self._commit_timer.start()
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class CameraDelegate(QtWidgets.QStyledItemDelegate):
+    """Apply an edit of a selected layer to all selected layers.
+
+    Spin box editors commit every value change, which the model coalesces.
+    """
+
+    def createEditor(
+        self,
+        parent: QtWidgets.QWidget,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> QtWidgets.QWidget:
+        editor = super().createEditor(parent, option, index)
+        if isinstance(editor, (QtWidgets.QSpinBox, QtWidgets.QDoubleSpinBox)):
+            editor.valueChanged.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setModelData(
+        self,
+        editor: QtWidgets.QWidget,
+        model: QtCore.QAbstractItemModel,
+        index: QtCore.QModelIndex,
+    ) -> None:
+        super().setModelData(editor, model, index)
+        role = QtCore.Qt.ItemDataRole.EditRole
+        value = model.data(index, role)
+        for sibling in self._selected_siblings(index):
+            model.setData(sibling, value, role)
+
+    def editorEvent(
+        self,
+        event: QtCore.QEvent,
+        model: QtCore.QAbstractItemModel,
+        option: QtWidgets.QStyleOptionViewItem,
+        index: QtCore.QModelIndex,
+    ) -> bool:
+        role = QtCore.Qt.ItemDataRole.CheckStateRole
+        before = model.data(index, role)
+        handled = super().editorEvent(event, model, option, index)
+        after = model.data(index, role)
+        if handled and after != before:
+            for sibling in self._selected_siblings(index):
+                model.setData(sibling, after, role)
+        return handled
+
+    def _selected_siblings(
+        self, index: QtCore.QModelIndex
+    ) -> tuple[QtCore.QModelIndex, ...]:
+        # Only layer rows are edited together, and only if the edited row is
+        # part of the selection.
+        view = self.parent()
+        selection = view.selectionModel() if view is not None else None
+        if selection is None or not index.internalId():
+            return ()
+        if not selection.isRowSelected(index.row(), index.parent()):
+            return ()
+        siblings = []
+        for row_index in selection.selectedRows():
+            if not row_index.internalId():
+                continue
+            sibling = row_index.sibling(row_index.row(), index.column())
+            if sibling != index:
+                siblings.append(sibling)
+        return tuple(siblings)
+
+
+def _format_axes(values: tuple[float, float, float]) -> str:
+    return ' / '.join(f'{value:.2f}' for value in values)
+
+
+def _check_state(checked: bool) -> QtCore.Qt.CheckState:
+    if checked:
+        return QtCore.Qt.CheckState.Checked
+    return QtCore.Qt.CheckState.Unchecked
+
+
+def _is_checked(value) -> bool:
+    # Check states arrive as ints or enums depending on the binding.
+    if value == QtCore.Qt.CheckState.Checked:
+        return True
+    return getattr(value, 'value', value) == 2
+
 
 class ShotShaker(QtWidgets.QWidget):
+    """Main window.
+
+    The window is shown before the scene is read. Cameras are then added in
+    batches of `scan_batch_size` per event loop iteration, and changed cameras
+    whose layers were cached are re-read `reconcile_batch_size` at a time.
+    """
+
+    scan_batch_size = 256
+    reconcile_batch_size = 20
 
     def __init__(self, parent: QtWidgets.QWidget | None = None) -> None:
         super().__init__(parent)
 
+        self._dirty: dict[int, str] = {}
+        self._update_timer = QtCore.QTimer(self)
+        self._update_timer.setSingleShot(True)
+        self._update_timer.setInterval(100)
+        self._update_timer.timeout.connect(self._update_dirty)
+        self._scan: Iterator | None = None
+        self._scanned: set[int] = set()
+        self._reconcile: list[int] = []
+        self._load_timer = QtCore.QTimer(self)
+        self._load_timer.setInterval(0)
+        self._load_timer.timeout.connect(self._load_next)
+        self._scene_watcher = None
+        self._stale = False
+        self._columns_resized = False
+        self._stats_dialog = None
+        # Comfort limit in degrees for the shake analysis.
+        self._threshold = 1.0
+
+        # Keep the cameras of the scene and the revisions of cached layers up to
+        # date for the rest of the session.
+        lib.camera_registry.start()
+        lib.track_revisions()
+
         self._init_ui()
-        self.refresh()
+        self.restore()
         self.presets_path.set_path(r'D:\files\dev\shot-shaker\presets')
 
     def _init_ui(self) -> None:
@@ -143,33 +1329,83 @@ class ShotShaker(QtWidgets.QWidget):
         toolbar = QtWidgets.QToolBar()
         layout.addWidget(toolbar)
 
+        self.loading_label = QtWidgets.QLabel()
+        self.loading_label.setVisible(False)
+        layout.addWidget(self.loading_label)
+
         action = QAction('Create', parent=self)
         action.triggered.connect(self.create_shake)
         toolbar.addAction(action)
 
+        action = QAction('Generate', parent=self)
+        action.triggered.connect(self.generate_shake)
+        toolbar.addAction(action)
+
         action = QAction('Delete', parent=self)
         action.triggered.connect(self.delete)
         toolbar.addAction(action)
 
+        action = QAction('Envelope', parent=self)
+        action.triggered.connect(self.envelope)
+        toolbar.addAction(action)
+
+        action = QAction('Simplify', parent=self)
+        action.triggered.connect(self.simplify)
+        toolbar.addAction(action)
+
+        action = QAction('Bake', parent=self)
+        action.triggered.connect(self.bake)
+        toolbar.addAction(action)
+
+        action = QAction('Unbake', parent=self)
+        action.triggered.connect(self.unbake)
+        toolbar.addAction(action)
+
+        action = QAction('Analyze', parent=self)
+        action.triggered.connect(self.analyze)
+        toolbar.addAction(action)
+
+        action = QAction('Export Analysis', parent=self)
+        action.triggered.connect(self.export_analysis)
+        toolbar.addAction(action)
+
         action = QAction('Refresh', parent=self)
         action.triggered.connect(self.refresh)
         toolbar.addAction(action)
 
+        action = QAction('Stats', parent=self)
+        action.triggered.connect(self.show_stats)
+        toolbar.addAction(action)
+
         # Presets
         preset_layout = QtWidgets.QFormLayout()
         layout.addLayout(preset_layout)
         self.presets_path = PathWidget()
         preset_layout.addRow('Presets', self.presets_path)
 
-        # TreeWidget
-        self.camera_tree = QtWidgets.QTreeWidget()
-        self.camera_tree.setHeaderLabels(
-            ('Camera', 'Weight', 'Start Frame', 'Preset', 'Mute', 'Bake')
+        # TreeView
+        self.camera_model = CameraModel(self)
+        self.camera_tree = QtWidgets.QTreeView()
+        self.camera_tree.setModel(self.camera_model)
+        self.camera_tree.setUniformRowHeights(True)
+        self.camera_tree.setItemDelegate(CameraDelegate(self.camera_tree))
+        self.camera_tree.setSelectionMode(
+            QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection
         )
-        self.camera_tree.itemChanged.connect(self._item_changed)
-        layout.addWidget(self.camera_tree)
+        self.camera_tree.selectionModel().currentChanged.connect(self._update_preview)
+        self.camera_model.dataChanged.connect(self._update_preview)
+
+        self.preview = CurvePreview()
+
+        splitter = QtWidgets.QSplitter(QtCore.Qt.Orientation.Vertical)
+        splitter.addWidget(self.camera_tree)
+        splitter.addWidget(self.preview)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
 
     def create_shake(self) -> None:
+        self.camera_model.commit()
         cameras = self.selected_cameras()
         if not cameras:
             return
@@ -179,74 +1415,354 @@ class ShotShaker(QtWidgets.QWidget):
         result = dialog.exec()
         if result == QtWidgets.QDialog.DialogCode.Accepted:
             data = dialog.get_data()
-            for camera in cameras:
-                camera.create_shake(data)
-            self.refresh()
+            results = core.create_shakes(cameras, data)
+            self.update_cameras(camera.handle for camera in cameras)
+            self._report_errors('Create Shake', results)
+
+    def generate_shake(self) -> None:
+        self.camera_model.commit()
+        cameras = self.selected_cameras()
+        if not cameras:
+            return
+
+        try:
+            dialog = ProceduralShakeDialog(parent=self)
+        except ImportError as e:
+            logger.error(e)
+            message = 'Procedural shakes require NumPy.'
+            QtWidgets.QMessageBox.warning(self, 'Generate Shake', message)
+            return
+        result = dialog.exec()
+        if result == QtWidgets.QDialog.DialogCode.Accepted:
+            data = dialog.get_data()
+            results = core.create_procedural_shakes(cameras, data)
+            self.update_cameras(camera.handle for camera in cameras)
+            self._report_errors('Generate Shake', results)
+
+    def bake(self) -> None:
+        self.camera_model.commit()
+        cameras = self.selected_cameras()
+        if not cameras:
+            return
+
+        try:
+            results = core.bake_cameras(cameras)
+        except ImportError as e:
+            logger.error(e)
+            QtWidgets.QMessageBox.warning(self, 'Bake', 'Baking requires NumPy.')
+            return
+        self.update_cameras(camera.handle for camera in cameras)
+        self._report_errors('Bake', results)
+
+    def unbake(self) -> None:
+        self.camera_model.commit()
+        cameras = self.selected_cameras()
+        if not cameras:
+            return
+
+        results = core.unbake_cameras(cameras)
+        self.update_cameras(camera.handle for camera in cameras)
+        self._report_errors('Unbake', results)
+
+    def envelope(self) -> None:
+        self.camera_model.commit()
+        layers = self.selected_layers()
+        if not layers:
+            return
+
+        try:
+            dialog = EnvelopeDialog(parent=self)
+        except ImportError as e:
+            logger.error(e)
+            message = 'Weight envelopes require NumPy.'
+            QtWidgets.QMessageBox.warning(self, 'Weight Envelope', message)
+            return
+        result = dialog.exec()
+        if result == QtWidgets.QDialog.DialogCode.Accepted:
+            data = dialog.get_data()
+            results = core.apply_envelopes(layers, data)
+            self.update_cameras({layer.camera.handle for layer in layers})
+            self._report_errors('Weight Envelope', results)
+
+    def simplify(self) -> None:
+        self.camera_model.commit()
+        layers = self.selected_layers()
+        if not layers:
+            return
+
+        tolerance, ok = QtWidgets.QInputDialog.getDouble(
+            self, 'Simplify', 'Key Tolerance (degrees)', 0.01, 0, 10, 3
+        )
+        if not ok:
+            return
+        try:
+            results = core.simplify_layers(layers, tolerance)
+        except ImportError as e:
+            logger.error(e)
+            message = 'Simplifying keys requires NumPy.'
+            QtWidgets.QMessageBox.warning(self, 'Simplify', message)
+            return
+        self.update_cameras({layer.camera.handle for layer in layers})
+        self._report_errors('Simplify', results)
+
+        before = sum(result.before for result in results)
+        after = sum(result.after for result in results)
+        message = f'Reduced {len(results)} layers from {before} to {after} keys.'
+        logger.info(message)
+        QtWidgets.QMessageBox.information(self, 'Simplify', message)
+
+    def analyze(self) -> None:
+        self.camera_model.commit()
+        cameras = self.selected_cameras()
+        if not cameras:
+            return
+
+        threshold, ok = QtWidgets.QInputDialog.getDouble(
+            self, 'Analyze', 'Comfort Limit (degrees)', self._threshold, 0, 180, 3
+        )
+        if not ok:
+            return
+        self._threshold = threshold
+        results = self._analyze(cameras)
+        if results is None:
+            return
+        for result in results:
+            if result.stats is not None:
+                self.camera_model.set_stats(result.camera.handle, result.stats)
+        self._report_errors('Analyze', results)
+
+    def export_analysis(self) -> None:
+        """Analyze all cameras of the scene and write the stats to a CSV file."""
+
+        self.camera_model.commit()
+        path, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, 'Export Analysis', filter='CSV Files (*.csv)'
+        )
+        if not path:
+            return
+
+        from shot_shaker import analysis
+
+        results = self._analyze(core.get_cameras())
+        if results is None:
+            return
+        stats = [(r.camera.name, r.stats) for r in results if r.stats is not None]
+        try:
+            analysis.write_csv(path, stats)
+        except OSError as e:
+            logger.error(e)
+            QtWidgets.QMessageBox.warning(self, 'Export Analysis', str(e))
+            return
+        self._report_errors('Export Analysis', results)
+        logger.info(f'Exported the analysis of {len(stats)} cameras to {path!r}')
+
+    def _analyze(
+        self, cameras: Iterable[core.Camera]
+    ) -> tuple[core.AnalysisResult, ...] | None:
+        try:
+            return core.analyze_cameras(cameras, self._threshold)
+        except ImportError as e:
+            logger.error(e)
+            message = 'The analysis requires NumPy.'
+            QtWidgets.QMessageBox.warning(self, 'Analyze', message)
+            return None
+
+    def selected_layers(self) -> tuple[core.Layer, ...]:
+        """Return the selected layers and all layers of selected cameras."""
+
+        layers = {}
+        for index in self.camera_tree.selectionModel().selectedRows():
+            camera = self.camera_model.camera(index)
+            if camera is not None:
+                selected = camera.layers
+            else:
+                selected = (self.camera_model.layer(index),)
+            for layer in selected:
+                layers[(layer.camera.handle, layer.name)] = layer
+        return tuple(layers.values())
 
     def selected_cameras(self) -> tuple[core.Camera, ...]:
         cameras = []
-        for item in self.camera_tree.selectedItems():
-            data = item.data(0, QtCore.Qt.ItemDataRole.UserRole)
-            if isinstance(data, core.Camera):
-                cameras.append(data)
+        for index in self.camera_tree.selectionModel().selectedRows():
+            camera = self.camera_model.camera(index)
+            if camera is not None:
+                cameras.append(camera)
         return tuple(cameras)
 
     def delete(self) -> None:
+        self.camera_model.commit()
         selected_cameras = self.selected_cameras()
         for camera in selected_cameras:
             camera.delete()
-        self.refresh()
+            self.camera_model.remove_camera(camera.handle)
 
+    @profiling.operation('refresh')
     def refresh(self) -> None:
-        self.camera_tree.clear()
-        for camera in core.get_cameras():
-            item = QtWidgets.QTreeWidgetItem()
-            item.setFlags(item.flags() | QtCore.Qt.ItemFlag.ItemIsEditable)
-            item.setText(0, camera.name)
-            item.setData(0, QtCore.Qt.ItemDataRole.UserRole, camera)
-            self.camera_tree.addTopLevelItem(item)
-
-            for layer in camera.layers:
-                child = QtWidgets.QTreeWidgetItem()
-                child.setFlags(child.flags() | QtCore.Qt.ItemFlag.ItemIsEditable)
-                child.setText(0, layer.name)
-                child.setData(0, QtCore.Qt.ItemDataRole.UserRole, layer)
-                child.setData(1, QtCore.Qt.ItemDataRole.DisplayRole, layer.weight)
-                child.setData(2, QtCore.Qt.ItemDataRole.DisplayRole, layer.start_frame)
-                child.setData(3, QtCore.Qt.ItemDataRole.DisplayRole, layer.preset)
-                if layer.muted:
-                    checkstate = QtCore.Qt.CheckState.Checked
-                else:
-                    checkstate = QtCore.Qt.CheckState.Unchecked
-                child.setCheckState(4, checkstate)
-                child.setCheckState(5, QtCore.Qt.CheckState.Unchecked)
-                item.addChild(child)
-
-            item.setExpanded(True)
-        for column in range(self.camera_tree.columnCount()):
-            self.camera_tree.resizeColumnToContents(column)
-
-    def _item_changed(self, item: QtWidgets.QTreeWidgetItem, column: int) -> None:
-        data = item.data(0, QtCore.Qt.ItemDataRole.UserRole)
-        if isinstance(data, core.Camera):
-            camera = data
-
-            if column == 0:
-                name = item.text(column)
-                camera.set_name(name)
-
-        if isinstance(data, core.Layer):
-            layer = data
+        # Pending edits are applied first so the scene read includes them.
+        self.camera_model.commit()
+        self._dirty.clear()
+        self._stop_loading()
+        self.camera_model.set_cameras(core.get_cameras())
+        self._resize_columns()
+
+    def restore(self) -> None:
+        """Read the cameras of the scene in the background, showing the layers
+        cached from a previous session right away.
+        """
+
+        self.camera_model.commit()
+        self._dirty.clear()
+        self._stop_loading()
+        self._scan = core.scan_cameras(self.scan_batch_size)
+        self.loading_label.setText('Loading cameras...')
+        self.loading_label.setVisible(True)
+        # A hidden window starts loading once it is painted.
+        if self.isVisible():
+            self._load_timer.start()
+
+    def _load_next(self) -> None:
+        if self._scan is not None:
+            self._scan_next()
+        elif self._reconcile:
+            self._reconcile_next()
+        else:
+            self._stop_loading()
+
+    def _scan_next(self) -> None:
+        try:
+            cameras, changed = next(self._scan)
+        except StopIteration:
+            self._scan = None
+            # Cameras that are no longer in the scene.
+            for handle in self.camera_model.handles():
+                if handle not in self._scanned:
+                    self.camera_model.remove_camera(handle)
+            self._scanned.clear()
+            self.loading_label.setVisible(False)
+            return
+        self._scanned.update(camera.handle for camera in cameras)
+        self.camera_model.add_cameras(cameras)
+        self._reconcile.extend(changed)
+        self._resize_columns()
+        self.loading_label.setText(f'Loading cameras... {len(self._scanned)}')
+
+    def _reconcile_next(self) -> None:
+        handles = self._reconcile[: self.reconcile_batch_size]
+        del self._reconcile[: self.reconcile_batch_size]
+        for handle in handles:
+            camera = core.get_camera(handle)
+            if camera is None:
+                self.camera_model.remove_camera(handle)
+                continue
+            # Layers were shown before, so they are read right away.
+            camera.layers
+            self.camera_model.update_camera(camera)
+
+    def _stop_loading(self) -> None:
+        self._load_timer.stop()
+        self._scan = None
+        self._scanned.clear()
+        self._reconcile.clear()
+        self.loading_label.setVisible(False)
+
+    def _resize_columns(self) -> None:
+        if not self._columns_resized and self.camera_model.rowCount():
+            for column in range(self.camera_model.columnCount()):
+                self.camera_tree.resizeColumnToContents(column)
+            self._columns_resized = True
+
+    @profiling.operation('refresh')
+    def update_cameras(self, handles: Iterable[int]) -> None:
+        for handle in handles:
+            camera = core.get_camera(handle)
+            if camera is None:
+                self.camera_model.remove_camera(handle)
+            else:
+                self.camera_model.update_camera(camera)
+
+    def show_stats(self) -> None:
+        if self._stats_dialog is None:
+            self._stats_dialog = StatsDialog(parent=self)
+        self._stats_dialog.update_stats()
+        self._stats_dialog.show()
+
+    def showEvent(self, event: QtGui.QShowEvent) -> None:
+        super().showEvent(event)
+        if self._scene_watcher is None:
+            self._scene_watcher = lib.SceneWatcher(self._node_event, self.refresh)
+        if not self._scene_watcher.active:
+            self._scene_watcher.start()
+            # Catch up on changes made while the window was hidden.
+            if self._stale:
+                self.restore()
+                self._stale = False
+
+    def paintEvent(self, event: QtGui.QPaintEvent) -> None:
+        super().paintEvent(event)
+        # The first scan starts after the window is painted with its loading
+        # state, instead of delaying the first paint.
+        if self._scan is not None and not self._load_timer.isActive():
+            self._load_timer.start()
+
+    def hideEvent(self, event: QtGui.QHideEvent) -> None:
+        super().hideEvent(event)
+        self.camera_model.commit()
+        self.preview.wait()
+        self._stop_loading()
+        if self._scene_watcher is not None:
+            self._scene_watcher.stop()
+            self._stale = True
+
+    def _report_errors(
+        self,
+        title: str,
+        results: tuple[
+            core.CreateShakeResult
+            | core.BakeResult
+            | core.SimplifyResult
+            | core.EnvelopeResult
+            | core.AnalysisResult,
+            ...,
+        ],
+    ) -> None:
+        errors = [f'{r.camera.name}: {r.error}' for r in results if r.error]
+        if errors:
+            for error in errors:
+                logger.error(error)
+            QtWidgets.QMessageBox.warning(self, title, '\n'.join(errors))
+
+    def _update_preview(self) -> None:
+        # Shows the preset of the current layer with its edited values.
+        index = self.camera_tree.currentIndex()
+        layer = self.camera_model.layer(index)
+        if layer is None:
+            self.preview.set_message('Select a layer to preview its shake.')
+            return
+        if not layer.preset_path:
+            self.preview.set_message('The layer has no preset to preview.')
+            return
+        self.preview.set_preset(layer.preset_path)
+        self.preview.set_transform(
+            index.sibling(index.row(), 1).data(), index.sibling(index.row(), 2).data()
+        )
 
-            if column == 1:
-                weight = item.data(1, QtCore.Qt.ItemDataRole.DisplayRole)
-                layer.set_weight(weight)
-            elif column == 2:
-                start_frame = item.data(2, QtCore.Qt.ItemDataRole.DisplayRole)
-                layer.set_start_frame(start_frame)
-            elif column == 4:
-                muted = item.checkState(4) == QtCore.Qt.CheckState.Checked
-                layer.set_muted(muted)
+    def _node_event(self, event: str, handles: tuple[int, ...]) -> None:
+        for handle in handles:
+            # A deletion takes precedence over other events.
+            if self._dirty.get(handle) != 'deleted':
+                self._dirty[handle] = event
+        self._update_timer.start()
+
+    def _update_dirty(self) -> None:
+        dirty = self._dirty
+        self._dirty = {}
+        handles = []
+        for handle, event in dirty.items():
+            if event == 'deleted':
+                self.camera_model.remove_camera(handle)
+            else:
+                handles.append(handle)
+        self.update_cameras(handles)
 
 
 window = None
@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import array
 import contextlib
+import fnmatch
 import logging
+import os
 import sys
-from collections.abc import Iterator
+from collections.abc import Callable, Hashable, Iterator, Mapping, Sequence
+from typing import Any
 
+import pymxs
 from pymxs import runtime as rt
 
 import shot_shaker
+from shot_shaker import cache, channels
+from shot_shaker.curves import Curve
 
 logger = logging.getLogger(__name__)
 
+# Modules holding process-wide state that should survive a reload.
+PERSISTENT_MODULES = ('cache',)
+
 
 def reload() -> None:
     name = shot_shaker.__name__
@@ -23,6 +33,8 @@ def unload_package(package_name: str) -> None:
         if module and module.__name__.startswith(package_name):
             if 'schema' in module.__name__:
                 continue
+            if module.__name__.rsplit('.', 1)[-1] in PERSISTENT_MODULES:
+                continue
             del sys.modules[key]
 
 
@@ -37,60 +49,615 @@ def suspended_refresh() -> Iterator[None]:
         rt.resumeEditing()
 
 
-def set_layer_name(obj, old: str, new: str) -> None:
-    controller = rt.getPropertyController(obj.controller, 'Rotation')
+class Transaction:
+    """Scene mutations queued by `submit`, applied in submission order."""
+
+    def __init__(self, name: str = '') -> None:
+        self.name = name
+        self._mutations: dict[Hashable, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._mutations)
+
+    def submit(
+        self,
+        key: Hashable,
+        func: Callable[[Any], None],
+        value: Any,
+        merge: Callable[[Any, Any], Any] | None = None,
+    ) -> None:
+        """Queue `func(value)`. A mutation with the same key is replaced, or
+        combined with the new value through `merge`.
+        """
+
+        mutation = self._mutations.get(key)
+        if mutation is None:
+            self._mutations[key] = [func, value]
+            return
+        if merge is not None:
+            value = merge(mutation[1], value)
+        mutation[0] = func
+        mutation[1] = value
+
+    def flush(self) -> None:
+        mutations = self._mutations
+        self._mutations = {}
+        for func, value in mutations.values():
+            func(value)
+
+
+_transactions: list[Transaction] = []
+
+
+@contextlib.contextmanager
+def transaction(
+    name: str = '', undo: bool = True, animate: bool = False, redraw: bool = True
+) -> Iterator[Transaction]:
+    """Apply all mutations submitted inside the context in one pass on exit.
+
+    Redraw and editing are suspended for the whole context. With `undo`, all
+    changes form a single undo record called `name`, otherwise undo is
+    disabled. `animate` sets the auto key mode while mutations are applied,
+    and `redraw` redraws the views once at the end. Nested transactions join
+    the outermost one. Queued mutations are discarded if the context raises,
+    and reads inside the context see the scene without them.
+    """
+
+    if _transactions:
+        yield _transactions[-1]
+        return
+
+    current = Transaction(name)
+    _transactions.append(current)
+    try:
+        with suspended_refresh(), pymxs.undo(undo, name), pymxs.animate(animate):
+            yield current
+            current.flush()
+    finally:
+        _transactions.pop()
+    if redraw:
+        rt.redrawViews()
+
+
+def submit(
+    key: Hashable,
+    func: Callable[[Any], None],
+    value: Any,
+    merge: Callable[[Any, Any], Any] | None = None,
+) -> None:
+    """Queue a mutation in the current transaction, or apply it right away."""
+
+    if _transactions:
+        _transactions[-1].submit(key, func, value, merge)
+    else:
+        func(value)
+
+
+class SceneWatcher:
+    """Report node changes through a NodeEventCallback and scene resets through
+    general callbacks.
+
+    `node_callback` receives the event name and a tuple of anim handles,
+    `reset_callback` is called after a file is opened or the scene is reset.
+    """
+
+    node_events = (
+        'added',
+        'deleted',
+        'nameChanged',
+        'controllerStructured',
+        'controllerOtherEvent',
+    )
+    reset_events = ('filePostOpen', 'systemPostReset', 'systemPostNew')
+
+    def __init__(
+        self,
+        node_callback: Callable[[str, tuple[int, ...]], None],
+        reset_callback: Callable[[], None] | None = None,
+        callback_id: str = 'ShotShaker',
+    ) -> None:
+        self.node_callback = node_callback
+        self.reset_callback = reset_callback
+        self.callback_id = callback_id
+        self._node_event_callback = None
+
+    @property
+    def active(self) -> bool:
+        return self._node_event_callback is not None
+
+    def start(self) -> None:
+        if self.active:
+            return
+        events = {event: self._node_event for event in self.node_events}
+        self._node_event_callback = rt.NodeEventCallback(mouseUp=True, **events)
+        if self.reset_callback:
+            for event in self.reset_events:
+                rt.callbacks.addScript(
+                    rt.Name(event), self._reset, id=rt.Name(self.callback_id)
+                )
+
+    def stop(self) -> None:
+        if not self.active:
+            return
+        # NodeEventCallbacks are removed once they are garbage collected.
+        self._node_event_callback = None
+        rt.gc(light=True)
+        rt.callbacks.removeScripts(id=rt.Name(self.callback_id))
+
+    def _node_event(self, event, handles) -> None:
+        self.node_callback(str(event), tuple(handles))
+
+    def _reset(self) -> None:
+        self.reset_callback()
+
+
+class CameraRegistry:
+    """Camera nodes of the current scene keyed by anim handle.
+
+    The registry is built from the scene's camera collection instead of all
+    objects, and kept up to date through node creation and deletion callbacks.
+    Events that can change the scene wholesale, like opening a file or undo,
+    mark it to be rebuilt on the next access. Until `start` is called, every
+    access collects the cameras again.
+    """
+
+    node_events = ('nodeCreated', 'nodePreDelete')
+    reset_events = (
+        'filePostOpen',
+        'filePostMerge',
+        'systemPostReset',
+        'systemPostNew',
+        'sceneUndo',
+        'sceneRedo',
+    )
+
+    def __init__(self, callback_id: str = 'ShotShakerCameras') -> None:
+        self.callback_id = callback_id
+        self._nodes: dict[int, Any] | None = None
+        self._active = False
+
+    @property
+    def active(self) -> bool:
+        return self._active
+
+    def start(self) -> None:
+        if self._active:
+            return
+        callback_id = rt.Name(self.callback_id)
+        # Scripts of a previous session of the tool are replaced.
+        rt.callbacks.removeScripts(id=callback_id)
+        rt.callbacks.addScript(rt.Name('nodeCreated'), self._added, id=callback_id)
+        rt.callbacks.addScript(rt.Name('nodePreDelete'), self._deleted, id=callback_id)
+        for event in self.reset_events:
+            rt.callbacks.addScript(rt.Name(event), self.invalidate, id=callback_id)
+        self._active = True
+
+    def stop(self) -> None:
+        if not self._active:
+            return
+        rt.callbacks.removeScripts(id=rt.Name(self.callback_id))
+        self._active = False
+        self._nodes = None
+
+    def invalidate(self) -> None:
+        self._nodes = None
+
+    def nodes(
+        self, selected: bool = False, layer: str = '', pattern: str = ''
+    ) -> tuple:
+        """Return the camera nodes, optionally only the selected ones, the ones
+        on the scene layer `layer` or the ones whose name matches the
+        case-insensitive wildcard `pattern`.
+        """
+
+        if self._nodes is None or not self._active:
+            self._nodes = self._collect()
+        nodes = self._nodes
+        if selected:
+            nodes = {}
+            for node in rt.selection:
+                handle = rt.getHandleByAnim(node)
+                if handle in self._nodes:
+                    nodes[handle] = node
+
+        result = []
+        for handle, node in tuple(nodes.items()):
+            if not rt.isValidNode(node):
+                # Missed a deletion, e.g. while callbacks were suspended.
+                self._nodes.pop(handle, None)
+                continue
+            if layer and node.layer.name != layer:
+                continue
+            if pattern and not fnmatch.fnmatch(node.name.lower(), pattern.lower()):
+                continue
+            result.append(node)
+        return tuple(result)
+
+    def _collect(self) -> dict[int, Any]:
+        # The camera collection also holds camera targets.
+        nodes = {}
+        for node in rt.cameras:
+            if rt.isKindOf(node, rt.Camera):
+                nodes[rt.getHandleByAnim(node)] = node
+        return nodes
+
+    def _added(self) -> None:
+        if self._nodes is None:
+            return
+        node = rt.callbacks.notificationParam()
+        if rt.isKindOf(node, rt.Camera):
+            self._nodes[rt.getHandleByAnim(node)] = node
+
+    def _deleted(self) -> None:
+        if self._nodes is None:
+            return
+        node = rt.callbacks.notificationParam()
+        self._nodes.pop(rt.getHandleByAnim(node), None)
+
+
+camera_registry = CameraRegistry()
+
+
+# Node events that change the revision of a node in the scene cache.
+REVISION_EVENTS = (
+    'deleted',
+    'nameChanged',
+    'userPropertiesChanged',
+    'controllerStructured',
+    'controllerOtherEvent',
+)
+# Events after which no cached snapshot is valid anymore.
+SCENE_RESET_EVENTS = (
+    'filePostOpen',
+    'systemPostReset',
+    'systemPostNew',
+    'sceneUndo',
+    'sceneRedo',
+)
+
+
+def track_revisions(callback_id: str = 'ShotShakerRevisions') -> None:
+    """Count node changes in `cache.scenes` for the rest of the session.
+
+    The callbacks only reference the cache, so they keep counting while the
+    tool is closed and after `reload()`.
+    """
+
+    scenes = cache.scenes
+    if scenes.tracking:
+        return
+    scenes.reset()
+    events = {event: scenes.touch for event in REVISION_EVENTS}
+    scenes.tracker = rt.NodeEventCallback(mouseUp=True, **events)
+    callback_id = rt.Name(callback_id)
+    rt.callbacks.removeScripts(id=callback_id)
+    for event in SCENE_RESET_EVENTS:
+        rt.callbacks.addScript(rt.Name(event), scenes.reset, id=callback_id)
+
+
+def untrack_revisions(callback_id: str = 'ShotShakerRevisions') -> None:
+    scenes = cache.scenes
+    if not scenes.tracking:
+        return
+    # NodeEventCallbacks are removed once they are garbage collected.
+    scenes.tracker = None
+    rt.gc(light=True)
+    rt.callbacks.removeScripts(id=rt.Name(callback_id))
+    scenes.reset()
+
+
+def get_scene_path() -> str:
+    return os.path.join(rt.maxFilePath, rt.maxFileName)
+
+
+def get_frame_rate() -> float:
+    return rt.frameRate
+
+
+def get_units_per_cm() -> float:
+    """Return the length of a centimeter in system units."""
+
+    return rt.units.decodeValue('1cm')
+
+
+def sample_positions(node, frames: Sequence[int]) -> list[tuple[float, float, float]]:
+    """Return the world position of `node` at every frame."""
+
+    positions = []
+    for frame in frames:
+        with pymxs.attime(frame):
+            position = node.transform.position
+        positions.append((position.x, position.y, position.z))
+    return positions
+
+
+# Classes of the controllers that hold the animation layers of a track.
+LAYER_CLASSES = ('Position_layer', 'Rotation_layer', 'Float_layer')
+
+# Writes all keys of a float controller in a single call, instead of a call
+# per key and key property.
+KEY_WRITER_SCRIPT = """
+fn shotShakerWriteKeys controller times values inTangents outTangents = (
+    for i = 1 to times.count do (
+        local k = addNewKey controller times[i]
+        k.value = values[i]
+        k.inTangentType = #custom
+        k.outTangentType = #custom
+        k.inTangent = inTangents[i]
+        k.outTangent = outTangents[i]
+    )
+    ok
+)
+"""
+
+_key_writer = None
+
+
+def get_channel_controller(obj, channel: channels.Channel):
+    """Return the controller of a channel's track, or None if it has none."""
+
+    parent = obj.baseObject if channel.object_track else obj.controller
+    return rt.getPropertyController(parent, channel.track)
+
+
+def get_layer_controllers(obj) -> dict[str, Any]:
+    """Return the layer controllers of all channel tracks with layers, by
+    channel name.
+    """
+
+    layer_classes = tuple(getattr(rt, name) for name in LAYER_CLASSES)
+    controllers = {}
+    for channel in channels.CHANNELS:
+        controller = get_channel_controller(obj, channel)
+        if controller is not None and rt.classof(controller) in layer_classes:
+            controllers[channel.name] = controller
+    return controllers
+
+
+def find_layer(controller, name: str) -> int:
+    """Return the 1-based index of layer `name` in a layer controller, or 0."""
+
     for i in range(controller.getCount()):
-        layer_name = controller.getLayerName(i + 1)
-        if layer_name == old:
-            controller.setLayerName(i + 1, new)
-
-
-def copy_layer_controllers(obj, name: str, source, start_frame: int) -> None:
-    layers = get_sub_animtables(obj, name)
-    source_layers = get_sub_animtables(source, 'Rotation')
-    logger.debug(f'{layers=}')
-    logger.debug(f'{source_layers=}')
-    for layer in layers:
-        logger.debug(f'{rt.classof(layer.controller)=}')
-        if rt.classof(layer.controller) == rt.Euler_XYZ:
-            rotation = layer.controller
-            source = source_layers[0].controller
-            logger.debug(f'Copying {source} to {rotation}')
-            for i in range(3):
-                rotation[i].controller = rt.copy(source[i].controller)
-                rt.movekeys(rotation[i].controller, start_frame)
+        if controller.getLayerName(i + 1) == name:
+            return i + 1
+    return 0
 
 
-def get_sub_animtables(obj, name: str) -> tuple:
-    subs = []
-    if obj:
+def get_layer_tracks(obj, name: str) -> dict[str, Any]:
+    """Return the sub-anims of layer `name` in all channel tracks, by channel
+    name.
+    """
+
+    tracks = {}
+    for channel_name, controller in get_layer_controllers(obj).items():
+        index = find_layer(controller, name)
+        if index:
+            tracks[channel_name] = controller[index - 1]
+    return tracks
+
+
+def set_layer_name(obj, old: str, new: str) -> None:
+    for controller in get_layer_controllers(obj).values():
+        index = find_layer(controller, old)
+        if index:
+            controller.setLayerName(index, new)
+    invalidate_sub_anim_index(obj)
+
+
+def set_layers_active(obj, index: int) -> None:
+    for controller in get_layer_controllers(obj).values():
+        controller.setLayerActive(index)
+
+
+def read_channels(obj) -> dict[str, tuple[Curve, ...]]:
+    """Read the curves of all keyed channel tracks of `obj`, e.g. a camera
+    imported from a preset.
+    """
+
+    result = {}
+    for channel in channels.CHANNELS:
+        controller = get_channel_controller(obj, channel)
+        if controller is None:
+            continue
+        if channel.size == 1:
+            controllers = (controller,)
+        else:
+            controllers = tuple(controller[i].controller for i in range(channel.size))
+        if any(len(controller.keys) for controller in controllers):
+            result[channel.name] = tuple(read_keys(c) for c in controllers)
+    return result
+
+
+def write_layer_keys(
+    obj, name: str, curves: Mapping[str, Sequence[Curve]], start_frame: int
+) -> tuple[str, ...]:
+    """Write the curves of every channel to the tracks of layer `name`.
+
+    Returns the names of the channels that were written. Channels whose track
+    has no layers are skipped.
+    """
+
+    tracks = get_layer_tracks(obj, name)
+    written = []
+    for channel_name, channel_curves in curves.items():
+        track = tracks.get(channel_name)
+        if track is not None:
+            write_track_keys(track, channel_curves, start_frame)
+            written.append(channel_name)
+    return tuple(written)
+
+
+def write_track_keys(track, curves: Sequence[Curve], start_frame: int = 0) -> None:
+    """Replace the keys of a track with a new Bezier_Float per curve.
+
+    A track of a single curve is replaced as a whole, otherwise the curves
+    replace the X, Y and Z sub-controllers.
+    """
+
+    if len(curves) == 1:
+        targets = (track,)
+    else:
+        controller = track.controller
+        targets = tuple(controller[i] for i in range(len(curves)))
+    for target, curve in zip(targets, curves):
+        replace_keys(target, curve, start_frame)
+
+
+def read_track_keys(track, size: int) -> tuple[Curve, ...]:
+    if size == 1:
+        return (read_keys(track.controller),)
+    controller = track.controller
+    return tuple(read_keys(controller[i].controller) for i in range(size))
+
+
+def write_euler_keys(rotation, curves: Sequence[Curve], start_frame: int = 0) -> None:
+    """Replace the X, Y and Z tracks of an Euler_XYZ controller with new keys."""
+
+    for i, curve in enumerate(curves[:3]):
+        replace_keys(rotation[i], curve, start_frame)
+
+
+def read_euler_keys(rotation) -> tuple[Curve, Curve, Curve]:
+    return tuple(read_keys(rotation[i].controller) for i in range(3))
+
+
+def replace_keys(sub_anim, curve: Curve, start_frame: int = 0) -> None:
+    """Replace the controller of a sub-anim with a new Bezier_Float holding the
+    keys of `curve`.
+
+    The keys are written after the controller is assigned, through the
+    sub-anim, so values are converted from its dimension like the values read
+    by `read_keys`. A detached controller has no dimension and would store
+    angles in degrees as radians.
+    """
+
+    sub_anim.controller = rt.Bezier_Float()
+    write_keys(sub_anim.controller, curve, start_frame)
+
+
+def read_keys(controller) -> Curve:
+    """Read the keys of a float controller. Without keys, its value is held."""
+
+    fps = rt.frameRate
+    times = array.array('d')
+    values = array.array('d')
+    in_tangents = array.array('d')
+    out_tangents = array.array('d')
+    for key in controller.keys:
+        times.append(float(key.time) / fps)
+        values.append(key.value)
+        in_tangents.append(key.inTangent * fps)
+        out_tangents.append(key.outTangent * fps)
+    if not times:
+        times.append(0)
+        values.append(controller.value)
+        in_tangents.append(0)
+        out_tangents.append(0)
+    return Curve(
+        times=times,
+        values=values,
+        in_tangents=in_tangents,
+        out_tangents=out_tangents,
+    )
+
+
+def write_keys(controller, curve: Curve, start_frame: int = 0) -> None:
+    """Add the keys of `curve` to a float controller in a single call."""
+
+    global _key_writer
+    if _key_writer is None:
+        _key_writer = rt.execute(KEY_WRITER_SCRIPT)
+    fps = rt.frameRate
+    _key_writer(
+        controller,
+        [time * fps + start_frame for time in _to_list(curve.times)],
+        _to_list(curve.values),
+        [tangent / fps for tangent in _to_list(curve.in_tangents)],
+        [tangent / fps for tangent in _to_list(curve.out_tangents)],
+    )
+
+
+def _to_list(values: Sequence[float]) -> list[float]:
+    # Arrays convert to builtin floats much faster than iterating them.
+    if hasattr(values, 'tolist'):
+        return values.tolist()
+    return list(values)
+
+
+class SubAnimIndex:
+    """Index of all sub-anims below an object, built in a single traversal."""
+
+    def __init__(self, obj) -> None:
+        self.subs: dict[str, list] = {}
+        self.names: list[str] = []
+        if obj:
+            self._walk(obj)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.subs
+
+    def get(self, name: str) -> tuple:
+        return tuple(self.subs.get(name, ()))
+
+    def _walk(self, obj) -> None:
         for i in range(obj.numsubs):
             try:
                 sub = obj[i]
             except IndexError:
                 continue
-            if sub.name == name:
-                subs.append(sub)
-            subs.extend(get_sub_animtables(sub, name))
-    return tuple(subs)
+            name = sub.name
+            self.names.append(name)
+            self.subs.setdefault(name, []).append(sub)
+            self._walk(sub)
+
+
+_sub_anim_indexes: dict[int, SubAnimIndex] = {}
+
+
+def get_sub_anim_index(obj) -> SubAnimIndex:
+    if not obj:
+        return SubAnimIndex(None)
+    handle = rt.getHandleByAnim(obj)
+    index = _sub_anim_indexes.get(handle)
+    if index is None:
+        index = SubAnimIndex(obj)
+        _sub_anim_indexes[handle] = index
+    return index
+
+
+def invalidate_sub_anim_index(obj=None) -> None:
+    """Drop the cached index of `obj`, or all indexes if `obj` is None.
+
+    Needs to be called whenever layers are added, renamed or deleted.
+    """
+
+    if obj is None:
+        _sub_anim_indexes.clear()
+    else:
+        _sub_anim_indexes.pop(rt.getHandleByAnim(obj), None)
+
+
+def get_sub_animtables(obj, name: str) -> tuple:
+    return get_sub_anim_index(obj).get(name)
 
 
 def get_sub_animtable_names(obj) -> tuple[str, ...]:
-    names = []
-    if obj:
-        for i in range(obj.numsubs):
-            try:
-                sub = obj[i]
-            except IndexError:
-                continue
-            names.append(sub.name)
-            names.extend(get_sub_animtable_names(sub))
-    return tuple(names)
+    return tuple(get_sub_anim_index(obj).names)
 
 
 def offset_keys(obj, name: str, offset: int) -> None:
-    layers = get_sub_animtables(obj, name)
-    for layer in layers:
-        if rt.classof(layer.controller) == rt.Euler_XYZ:
-            for i in range(3):
-                rt.movekeys(layer.controller[i].controller, offset)
+    """Move the keys of layer `name` on all channel tracks by `offset` frames."""
+
+    for layer in get_sub_animtables(obj, name):
+        for controller in _float_controllers(layer.controller):
+            rt.movekeys(controller, offset)
+
+
+def _float_controllers(controller) -> Iterator:
+    if controller is None:
+        return
+    if not controller.numsubs:
+        yield controller
+        return
+    for i in range(controller.numsubs):
+        yield from _float_controllers(controller[i].controller)
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+
+from shot_shaker import cache
+from shot_shaker.curves import Curve
+
+logger = logging.getLogger(__name__)
+
+FILE_TYPES = ('.fbx',)
+INDEX_VERSION = 2
+
+# Compiled presets that failed to read, so they are only warned about once.
+_unreadable: set[str] = set()
+
+
+def preset_name(path: str) -> str:
+    name, ext = os.path.splitext(os.path.basename(path))
+    return name
+
+
+def load_channels(path: str) -> dict[str, tuple[Curve, ...]]:
+    """Load the curves of all animated channels of a preset, decoding each file
+    only once.
+
+    The compiled preset is used instead when it is newer than the FBX file.
+    """
+
+    # The decoders are only imported once the first preset is loaded.
+    from shot_shaker import compiled
+
+    if compiled.is_up_to_date(path):
+        compiled_path = compiled.compiled_path(path)
+        try:
+            return cache.presets.get(compiled_path, _read_compiled)
+        except (OSError, compiled.FormatError) as e:
+            message = f'Failed to read compiled preset {compiled_path!r}: {e}'
+            if compiled_path in _unreadable:
+                logger.debug(message)
+            else:
+                _unreadable.add(compiled_path)
+                logger.warning(message)
+    return cache.presets.get(path, _read_channels)
+
+
+def load_curves(path: str) -> tuple[Curve, Curve, Curve]:
+    """Load the rotation curves of a preset. They are constant if the preset
+    only animates other channels.
+    """
+
+    curves = load_channels(path).get('rotation')
+    if curves is None:
+        curves = tuple(Curve((0.0,), (0.0,), (0.0,), (0.0,)) for _ in range(3))
+    return curves
+
+
+def _read_compiled(path: str) -> dict[str, tuple[Curve, ...]]:
+    from shot_shaker import compiled
+
+    logger.debug(f'Reading compiled preset {path!r}')
+    return compiled.read(path)
+
+
+def _read_channels(path: str) -> dict[str, tuple[Curve, ...]]:
+    from shot_shaker import fbx
+
+    logger.debug(f'Decoding preset {path!r}')
+    return fbx.read_channels(path, preset_name(path))
+
+
+@dataclasses.dataclass
+class PresetInfo:
+    path: str
+    mtime: int
+    size: int
+    # Whether the file contains a camera with the same name as the preset, or
+    # None if that is unknown because the file could not be read natively.
+    camera_match: bool | None = None
+    start_time: float = 0
+    end_time: float = 0
+    key_count: int = 0
+    peak: tuple[float, float, float] = (0, 0, 0)
+    error: str = ''
+
+    @property
+    def name(self) -> str:
+        return preset_name(self.path)
+
+
+def read_info(path: str) -> PresetInfo:
+    from shot_shaker import fbx
+
+    stat = os.stat(path)
+    info = PresetInfo(path=path, mtime=stat.st_mtime_ns, size=stat.st_size)
+    try:
+        curves = load_curves(path)
+    except fbx.NodeNotFoundError as e:
+        info.camera_match = False
+        info.error = str(e)
+        return info
+    except (OSError, fbx.FBXError) as e:
+        # The FBX importer might still read the file.
+        info.error = str(e)
+        return info
+
+    info.camera_match = True
+    times = [t for curve in curves for t in curve.times]
+    if times:
+        info.start_time = min(times)
+        info.end_time = max(times)
+    info.key_count = max(len(curve) for curve in curves)
+    peak = []
+    for curve in curves:
+        if len(curve):
+            peak.append((max(curve.values) - min(curve.values)) / 2)
+        else:
+            peak.append(0)
+    info.peak = tuple(peak)
+    return info
+
+
+def get_index_path(root: str) -> str:
+    """Return the path of the local index file for a preset directory."""
+
+    import hashlib
+
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(
+        os.path.expanduser('~'), '.cache'
+    )
+    digest = hashlib.sha1(os.path.abspath(root).encode('utf-8')).hexdigest()
+    return os.path.join(base, 'shot_shaker', 'index', f'{digest[:16]}.json')
+
+
+class PresetIndex:
+    """Metadata of all presets below a directory, persisted to a local file.
+
+    Scanning is incremental: only files whose mtime or size changed since the
+    last scan are decoded again. `scan` is safe to call from a worker thread.
+    """
+
+    def __init__(self, root: str, index_path: str | None = None) -> None:
+        self.root = root
+        self.index_path = index_path or get_index_path(root)
+        self._entries: dict[str, PresetInfo] = {}
+        self._lock = threading.Lock()
+
+    def infos(self) -> tuple[PresetInfo, ...]:
+        with self._lock:
+            entries = tuple(self._entries.values())
+        return tuple(sorted(entries, key=lambda info: info.path.lower()))
+
+    def load(self) -> None:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+
+        entries = {}
+        for entry in data.get('presets', ()):
+            try:
+                info = PresetInfo(**entry)
+            except TypeError:
+                continue
+            info.peak = tuple(info.peak)
+            entries[info.path] = info
+        with self._lock:
+            self._entries = entries
+
+    def save(self) -> None:
+        data = {
+            'version': INDEX_VERSION,
+            'root': self.root,
+            'presets': [dataclasses.asdict(info) for info in self.infos()],
+        }
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp_path = f'{self.index_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.index_path)
+
+    def scan(self, cancelled: Callable[[], bool] | None = None) -> bool:
+        """Update the index from disk and return whether anything changed.
+
+        `cancelled` is polled before each file. Once it returns True the scan
+        stops, keeping the presets indexed so far.
+        """
+
+        with self._lock:
+            entries = dict(self._entries)
+
+        changed = False
+        found = set()
+        for path in find_presets(self.root):
+            if cancelled is not None and cancelled():
+                logger.debug(f'Cancelled indexing presets in {self.root!r}')
+                break
+            found.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            info = entries.get(path)
+            if (
+                info is not None
+                and info.mtime == stat.st_mtime_ns
+                and info.size == stat.st_size
+            ):
+                continue
+            logger.debug(f'Indexing preset {path!r}')
+            try:
+                entries[path] = read_info(path)
+            except OSError:
+                continue
+            changed = True
+        else:
+            # Missing presets are only dropped after a complete walk.
+            for path in tuple(entries):
+                if path not in found:
+                    del entries[path]
+                    changed = True
+
+        with self._lock:
+            self._entries = entries
+        return changed
+
+
+def find_presets(root: str) -> list[str]:
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if os.path.splitext(filename)[1].lower() in FILE_TYPES:
+                paths.append(os.path.join(dirpath, filename))
+    return paths
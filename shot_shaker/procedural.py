@@ -0,0 +1,119 @@
+"""Procedural camera shake using fractal gradient noise.
+
+Requires NumPy. Curves for all cameras and axes are computed in one batched
+array operation.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from shot_shaker.curves import Curve
+
+# Defaults per profile. Frequencies are in Hz, amplitudes in degrees.
+PROFILES = {
+    'handheld': {
+        'frequency': (0.9, 0.7, 0.5),
+        'amplitude': (0.6, 0.45, 0.25),
+        'octaves': 3,
+        'decay': 0.0,
+    },
+    'vehicle': {
+        'frequency': (6.0, 4.5, 3.0),
+        'amplitude': (0.25, 0.2, 0.1),
+        'octaves': 2,
+        'decay': 0.0,
+    },
+    'impact': {
+        'frequency': (9.0, 7.0, 5.0),
+        'amplitude': (3.0, 2.5, 1.0),
+        'octaves': 4,
+        'decay': 4.0,
+    },
+}
+
+GRADIENT_COUNT = 256
+LACUNARITY = 2.0
+GAIN = 0.5
+
+
+def fractal_noise(x: np.ndarray, gradients: np.ndarray, octaves: int) -> np.ndarray:
+    """Sum `octaves` layers of 1D gradient noise.
+
+    `x` has shape (..., samples) and `gradients` (..., GRADIENT_COUNT) with
+    the same leading dimensions.
+    """
+
+    result = np.zeros_like(x)
+    amplitude = 1.0
+    frequency = 1.0
+    total = 0.0
+    for octave in range(octaves):
+        # Offset each octave so they don't share lattice points.
+        result += amplitude * gradient_noise(x * frequency + octave * 17.31, gradients)
+        total += amplitude
+        amplitude *= GAIN
+        frequency *= LACUNARITY
+    return result / total
+
+
+def gradient_noise(x: np.ndarray, gradients: np.ndarray) -> np.ndarray:
+    count = gradients.shape[-1]
+    i0 = np.floor(x).astype(np.int64)
+    t = x - i0
+    g0 = np.take_along_axis(gradients, i0 % count, axis=-1)
+    g1 = np.take_along_axis(gradients, (i0 + 1) % count, axis=-1)
+    fade = t * t * t * (t * (t * 6 - 15) + 10)
+    # Gradient noise lies within [-0.5, 0.5], so scale it to [-1, 1].
+    return 2 * ((1 - fade) * g0 * t + fade * g1 * (t - 1))
+
+
+def generate(
+    count: int,
+    duration: int,
+    fps: float,
+    frequency: tuple[float, float, float],
+    amplitude: tuple[float, float, float],
+    octaves: int = 3,
+    decay: float = 0.0,
+    seed: int = 0,
+) -> list[tuple[Curve, Curve, Curve]]:
+    """Generate `count` distinct shakes with a key on every frame.
+
+    Shake `i` uses the random stream of `seed + i`, so results are
+    reproducible per camera.
+    """
+
+    frames = np.arange(max(duration, 1) + 1, dtype=np.float64)
+    times = frames / fps
+
+    gradients = np.empty((count, 3, GRADIENT_COUNT))
+    phases = np.empty((count, 3, 1))
+    for i in range(count):
+        rng = np.random.default_rng(seed + i)
+        gradients[i] = rng.uniform(-1, 1, (3, GRADIENT_COUNT))
+        phases[i] = rng.uniform(0, GRADIENT_COUNT, (3, 1))
+
+    frequency = np.asarray(frequency, dtype=np.float64).reshape(1, 3, 1)
+    amplitude = np.asarray(amplitude, dtype=np.float64).reshape(1, 3, 1)
+    x = times.reshape(1, 1, -1) * frequency + phases
+    values = amplitude * fractal_noise(x, gradients, octaves)
+    if decay:
+        values *= np.exp(-decay * times)
+
+    # Tangents are the slope of the sampled curve in units/second.
+    tangents = np.gradient(values, times, axis=-1)
+
+    shakes = []
+    for i in range(count):
+        curves = tuple(
+            Curve(
+                times=times,
+                values=values[i, axis],
+                in_tangents=tangents[i, axis],
+                out_tangents=tangents[i, axis],
+            )
+            for axis in range(3)
+        )
+        shakes.append(curves)
+    return shakes
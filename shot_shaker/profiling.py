@@ -0,0 +1,208 @@
+"""Opt-in instrumentation of pymxs runtime calls.
+
+`enable` replaces the `rt` global of the instrumented modules with a proxy
+that counts calls and wall time per runtime function. Calls are attributed to
+the innermost `operation` in progress. When disabled the modules use the
+runtime directly, so the only remaining cost is the flag check in `operation`.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import importlib
+import logging
+import time
+from collections.abc import Callable
+
+from pymxs import runtime
+
+logger = logging.getLogger(__name__)
+
+# Modules whose `rt` global is swapped with the proxy.
+MODULES = ('shot_shaker.core', 'shot_shaker.lib')
+# Runtime structs whose functions are timed as well.
+STRUCTS = ('animlayermanager', 'callbacks')
+
+_stats: Stats | None = None
+_operations: list[str] = []
+
+
+@dataclasses.dataclass
+class Timing:
+    count: int = 0
+    seconds: float = 0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+
+
+@dataclasses.dataclass
+class Stats:
+    # Timings per operation of the operation itself and of each function.
+    operations: dict[str, Timing] = dataclasses.field(default_factory=dict)
+    calls: dict[str, dict[str, Timing]] = dataclasses.field(default_factory=dict)
+
+    def add_call(self, function: str, seconds: float) -> None:
+        operation = _operations[-1] if _operations else ''
+        functions = self.calls.setdefault(operation, {})
+        functions.setdefault(function, Timing()).add(seconds)
+
+    def add_operation(self, operation: str, seconds: float) -> None:
+        self.operations.setdefault(operation, Timing()).add(seconds)
+
+    def summary(self) -> str:
+        lines = [f'{"Operation / Function":<48}{"Calls":>10}{"Total ms":>12}']
+        names = sorted(set(self.operations) | set(self.calls))
+        for name in names:
+            timing = self.operations.get(name, Timing())
+            lines.append(
+                f'{name or "(none)":<48}{timing.count:>10}'
+                f'{timing.seconds * 1000:>12.2f}'
+            )
+            functions = self.calls.get(name, {})
+            ordered = sorted(functions.items(), key=lambda item: -item[1].seconds)
+            for function, timing in ordered:
+                lines.append(
+                    f'  {function:<46}{timing.count:>10}'
+                    f'{timing.seconds * 1000:>12.2f}'
+                )
+        return '\n'.join(lines)
+
+
+class _Function:
+    __slots__ = ('name', 'function')
+
+    def __init__(self, name: str, function) -> None:
+        self.name = name
+        self.function = function
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            if _stats is not None:
+                _stats.add_call(self.name, time.perf_counter() - start)
+
+
+class RuntimeProxy:
+    """Proxy of the pymxs runtime or a runtime struct that times function calls.
+
+    Only functions are wrapped. Classes and values are returned as they are so
+    comparisons like `rt.classOf(obj) == rt.Euler_XYZ` keep working.
+    """
+
+    def __init__(self, target, prefix: str = '') -> None:
+        self._target = target
+        self._prefix = prefix
+        self._functions: dict[str, object] = {}
+
+    def __getattr__(self, name: str):
+        key = name.lower()
+        function = self._functions.get(key)
+        if function is not None:
+            return function
+
+        value = getattr(self._target, name)
+        if not self._prefix and key in STRUCTS:
+            function = RuntimeProxy(value, prefix=f'{name}.')
+        elif _is_function(value):
+            function = _Function(self._prefix + name, value)
+        else:
+            # Values like rt.sliderTime change, so they are never cached.
+            return value
+        self._functions[key] = function
+        return function
+
+    def __setattr__(self, name: str, value) -> None:
+        if name.startswith('_'):
+            super().__setattr__(name, value)
+        else:
+            setattr(self._target, name, value)
+
+
+def _is_function(value) -> bool:
+    if not callable(value):
+        return False
+    return runtime.classOf(value) != runtime.MAXClass
+
+
+class operation:
+    """Attribute runtime calls to an operation. Usable as a decorator."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._start = 0.0
+        # Stack depth on entry, or -1 when profiling was disabled on entry.
+        self._depth = -1
+
+    def __call__(self, func: Callable) -> Callable:
+        name = self.name
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _stats is None:
+                return func(*args, **kwargs)
+            with operation(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    def __enter__(self) -> operation:
+        self._depth = -1
+        if _stats is not None:
+            self._depth = len(_operations)
+            _operations.append(self.name)
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        # The state on entry decides, so profiling can be toggled while an
+        # operation is in progress without unbalancing the stack.
+        if self._depth < 0:
+            return
+        del _operations[self._depth :]
+        if _stats is not None:
+            _stats.add_operation(self.name, time.perf_counter() - self._start)
+
+
+def enabled() -> bool:
+    return _stats is not None
+
+
+def enable() -> None:
+    global _stats
+    if _stats is None:
+        _stats = Stats()
+    proxy = RuntimeProxy(runtime)
+    for name in MODULES:
+        importlib.import_module(name).rt = proxy
+    logger.info('Profiling enabled')
+
+
+def disable() -> None:
+    global _stats
+    _stats = None
+    _operations.clear()
+    for name in MODULES:
+        importlib.import_module(name).rt = runtime
+    logger.info('Profiling disabled')
+
+
+def reset() -> None:
+    global _stats
+    if _stats is not None:
+        _stats = Stats()
+
+
+def stats() -> Stats | None:
+    return _stats
+
+
+def log_summary() -> None:
+    if _stats is None:
+        logger.info('Profiling is disabled')
+        return
+    logger.info(f'Profiling summary:\n{_stats.summary()}')
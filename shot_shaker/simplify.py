@@ -0,0 +1,62 @@
+"""Error-bounded key reduction for dense animation curves.
+
+Requires NumPy. Keys are removed Ramer-Douglas-Peucker style: starting from
+the first and last key, the key with the largest error in every segment that
+exceeds the tolerance is added back until the Hermite curve through the kept
+keys stays within the tolerance at all original key times. Kept keys keep
+their original tangents.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from shot_shaker import evaluate
+from shot_shaker.curves import Curve
+
+
+def simplify_curve(curve: Curve, tolerance: float) -> Curve:
+    """Return a curve with as few keys as needed to stay within `tolerance`."""
+
+    count = len(curve)
+    if count <= 2 or tolerance <= 0:
+        return curve
+
+    times = np.asarray(curve.times, dtype=np.float64)
+    values = np.asarray(curve.values, dtype=np.float64)
+    in_tangents = np.asarray(curve.in_tangents, dtype=np.float64)
+    out_tangents = np.asarray(curve.out_tangents, dtype=np.float64)
+
+    keep = np.zeros(count, dtype=bool)
+    keep[[0, -1]] = True
+    while True:
+        kept = np.flatnonzero(keep)
+        reduced = Curve(
+            times=times[kept],
+            values=values[kept],
+            in_tangents=in_tangents[kept],
+            out_tangents=out_tangents[kept],
+        )
+        error = np.abs(evaluate.sample_curve(reduced, times) - values)
+        error[keep] = 0
+
+        # Find the key with the largest error in each segment between kept keys.
+        segment = np.cumsum(keep) - 1
+        order = np.lexsort((-error, segment))
+        first = np.ones(count, dtype=bool)
+        first[1:] = segment[order][1:] != segment[order][:-1]
+        worst = order[first]
+        worst = worst[error[worst] > tolerance]
+        if not len(worst):
+            return reduced
+        keep[worst] = True
+
+
+def simplify_curves(curves: Sequence[Curve], tolerance: float) -> tuple[Curve, ...]:
+    return tuple(simplify_curve(curve, tolerance) for curve in curves)
+
+
+def key_count(curves: Sequence[Curve]) -> int:
+    return sum(len(curve) for curve in curves)
@@ -0,0 +1,119 @@
+"""Seeded variations of a preset, so cameras sharing a preset shake differently.
+
+Requires NumPy. Every variant draws its parameters from its own seed, so a
+camera's shake only depends on its seed and not on how many cameras were
+created together. The curves of all variants are computed in one batched
+array operation per axis.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from collections.abc import Sequence
+
+import numpy as np
+
+from shot_shaker.curves import Curve
+
+
+@dataclasses.dataclass
+class Variation:
+    seed: int
+    # Frames skipped at the start of the preset.
+    time_offset: int
+    # Playback speed relative to the preset.
+    rate: float
+    # Per axis amplitude scale.
+    amplitude: tuple[float, float, float]
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+def draw(
+    seed: int, time_offset: int, amplitude_jitter: float, rate_jitter: float
+) -> Variation:
+    """Draw the parameters of a variant from `seed`.
+
+    The time offset is up to `time_offset` frames, the rate and per axis
+    amplitude are scaled by up to +/- `rate_jitter` and `amplitude_jitter`.
+    """
+
+    rng = np.random.default_rng(seed)
+    offset = int(rng.integers(0, time_offset + 1)) if time_offset > 0 else 0
+    rate = float(1 + rng.uniform(-rate_jitter, rate_jitter))
+    amplitude = 1 + rng.uniform(-amplitude_jitter, amplitude_jitter, 3)
+    return Variation(
+        seed=seed,
+        time_offset=offset,
+        rate=rate,
+        amplitude=tuple(amplitude.tolist()),
+    )
+
+
+def apply(
+    curves: Sequence[Curve],
+    variations: Sequence[Variation],
+    fps: float,
+    amplitude_axes: Sequence[int] | None = None,
+) -> list[tuple[Curve, ...]]:
+    """Return the curves of every variant of `curves`.
+
+    Keys before the time offset are dropped and the remaining keys are moved
+    so the variant starts at the same time as the preset. All curves are
+    retimed together. `amplitude_axes` is the amplitude axis of every curve and
+    defaults to X, Y and Z in order.
+    """
+
+    count = len(variations)
+    offsets = np.array([v.time_offset for v in variations], dtype=np.float64) / fps
+    rates = np.array([v.rate for v in variations], dtype=np.float64)
+    amplitudes = np.array([v.amplitude for v in variations], dtype=np.float64)
+    if amplitude_axes is None:
+        amplitude_axes = [i % 3 for i in range(len(curves))]
+    preset_start = min((curve.times[0] for curve in curves if len(curve)), default=0)
+
+    axes = []
+    first_times = np.full(count, np.inf)
+    for axis, curve in zip(amplitude_axes, curves):
+        times = np.asarray(curve.times, dtype=np.float64)
+        # Shape (variants, keys)
+        shifted = times[None] - offsets[:, None]
+        keep = shifted >= preset_start
+        times = preset_start + (shifted - preset_start) / rates[:, None]
+        if times.shape[1]:
+            first = np.where(keep, times, np.inf).min(axis=1)
+            first_times = np.minimum(first_times, first)
+        # Always keep the last key so no curve ends up empty. Keys that are
+        # only kept for this are moved to the start below.
+        keep[:, -1:] = True
+
+        scale = amplitudes[:, axis, None]
+        tangent_scale = scale * rates[:, None]
+        axes.append(
+            (
+                keep,
+                times,
+                np.asarray(curve.values, dtype=np.float64)[None] * scale,
+                np.asarray(curve.in_tangents, dtype=np.float64)[None] * tangent_scale,
+                np.asarray(curve.out_tangents, dtype=np.float64)[None] * tangent_scale,
+            )
+        )
+    # Move the first kept key of every variant to the start of the preset.
+    shifts = np.where(np.isfinite(first_times), first_times - preset_start, 0)
+
+    variants = []
+    for i in range(count):
+        variant = []
+        for keep, times, values, in_tangents, out_tangents in axes:
+            mask = keep[i]
+            variant.append(
+                Curve(
+                    times=np.maximum(times[i, mask] - shifts[i], preset_start),
+                    values=values[i, mask],
+                    in_tangents=in_tangents[i, mask],
+                    out_tangents=out_tangents[i, mask],
+                )
+            )
+        variants.append(tuple(variant))
+    return variants
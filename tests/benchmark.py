@@ -0,0 +1,210 @@
+"""Scaling benchmarks against the in-memory pymxs runtime.
+
+Measures core.get_cameras, Camera.get_layers, a transactional retime,
+ShotShaker.refresh and core.create_shakes for scenes with a number of cameras
+and layers per camera, and writes the results as JSON.
+
+Usage:
+    python tests/benchmark.py [--cameras 10 100] [--layers 1 5] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+import fake_pymxs  # noqa: E402
+
+fake_pymxs.install()
+rt = fake_pymxs.runtime
+
+from shot_shaker import channels, core, fbx, lib  # noqa: E402
+
+CAMERAS = (10, 100, 1000, 10000)
+LAYERS = (1, 5, 20)
+PRESET_KEYS = 25
+RESULTS_VERSION = 1
+
+
+def build_scene(camera_count: int, layer_count: int) -> None:
+    """Create cameras with shake layers directly through the runtime."""
+
+    rt.reset()
+    nodes = [rt.Freecamera(f'Camera{i:05d}') for i in range(camera_count)]
+    # Like shakes created from rotation presets.
+    rt.AnimLayerManager.enableLayers(nodes, pos=False, rot=True, object=False)
+    metadata = {}
+    for i in range(layer_count):
+        name = f'Shake{i}'
+        rt.AnimLayerManager.addLayer(name, nodes, False)
+        metadata[name] = {'preset': f'{name}.fbx'}
+    for node in nodes:
+        rotation = rt.getPropertyController(node.controller, 'Rotation')
+        for i in range(layer_count):
+            euler = rotation[i + 1].controller
+            for axis in range(3):
+                key = rt.addNewKey(euler[axis].controller, i)
+                key.value = axis
+        rt.setUserProp(node, 'layers', json.dumps(metadata))
+
+
+def write_preset(
+    path: str, key_count: int, channel_names: tuple[str, ...] = ('rotation',)
+) -> None:
+    """Write an ASCII FBX preset with a cubic curve per axis of every channel."""
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    times = ','.join(str(i * fbx.KTIME_PER_SECOND // 30) for i in range(key_count))
+    values = ','.join(f'{(i % 7) * 0.1:.1f}' for i in range(key_count))
+    objects = [
+        f'\tModel: 10, "Model::{name}", "Camera" {{\n\t}}\n',
+        '\tNodeAttribute: 11, "NodeAttribute::", "Camera" {\n\t}\n',
+    ]
+    connections = ['\tC: "OO",10,0\n', '\tC: "OO",11,10\n']
+    for i, channel_name in enumerate(channel_names):
+        channel = channels.BY_NAME[channel_name]
+        curve_node_id = 20 + i * 10
+        parent_id = 11 if channel.object_track else 10
+        objects.append(
+            f'\tAnimationCurveNode: {curve_node_id}, "AnimCurveNode::", "" {{\n\t}}\n'
+        )
+        connections.append(
+            f'\tC: "OP",{curve_node_id},{parent_id}, "{channel.fbx_property}"\n'
+        )
+        for axis, label in enumerate(channel.fbx_axes):
+            curve_id = curve_node_id + 1 + axis
+            objects.append(
+                f'\tAnimationCurve: {curve_id}, "AnimCurve::", "" {{\n'
+                f'\t\tKeyTime: *{key_count} {{\n\t\t\ta: {times}\n\t\t}}\n'
+                f'\t\tKeyValueFloat: *{key_count} {{\n\t\t\ta: {values}\n\t\t}}\n'
+                '\t\tKeyAttrFlags: *1 {\n\t\t\ta: 8\n\t\t}\n'
+                '\t\tKeyAttrDataFloat: *4 {\n\t\t\ta: 0,0,0,0\n\t\t}\n'
+                f'\t\tKeyAttrRefCount: *1 {{\n\t\t\ta: {key_count}\n\t\t}}\n'
+                '\t}\n'
+            )
+            connections.append(f'\tC: "OP",{curve_id},{curve_node_id}, "{label}"\n')
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(
+            '; FBX 7.4.0 project file\n'
+            'FBXHeaderExtension:  {\n\tFBXVersion: 7400\n}\n'
+            'GlobalSettings:  {\n\tProperties70:  {\n'
+            '\t\tP: "UpAxis", "int", "Integer", "",2\n\t}\n}\n'
+            'Objects:  {\n'
+            + ''.join(objects)
+            + '}\nConnections:  {\n'
+            + ''.join(connections)
+            + '}\n'
+        )
+
+
+def retime_layers(cameras: tuple[core.Camera, ...]) -> None:
+    """Move every layer 10 frames forward in a single transaction."""
+
+    with lib.transaction('Retime'):
+        for camera in cameras:
+            for layer in camera.layers:
+                layer.set_start_frame(layer.start_frame + 10)
+
+
+def measure(func: Callable[[], object], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(
+    camera_counts: tuple[int, ...],
+    layer_counts: tuple[int, ...],
+    repeat: int,
+    gui: bool,
+) -> list[dict]:
+    shot_shaker = None
+    if gui:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from shot_shaker.gui import QtWidgets, ShotShaker
+
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        shot_shaker = ShotShaker()
+
+    preset_dir = tempfile.mkdtemp()
+    preset_path = os.path.join(preset_dir, 'Benchmark.fbx')
+    write_preset(preset_path, PRESET_KEYS)
+    data = core.CreateShakeData(preset=preset_path, start_frame=0, weight=1)
+
+    results = []
+    for camera_count in camera_counts:
+        for layer_count in layer_counts:
+            build_scene(camera_count, layer_count)
+            cameras = core.get_cameras()
+            timings = {
+                'get_cameras': measure(core.get_cameras, repeat),
+                'get_layers': measure(
+                    lambda: [camera.get_layers() for camera in cameras], repeat
+                ),
+            }
+            timings['retime'] = measure(lambda: retime_layers(cameras), repeat)
+            if shot_shaker is not None:
+                timings['refresh'] = measure(shot_shaker.refresh, repeat)
+                app.processEvents()
+            # Creating shakes changes the scene, so it is measured once.
+            timings['create_shake'] = measure(
+                lambda: core.create_shakes(cameras, data), 1
+            )
+
+            for benchmark, seconds in timings.items():
+                result = {
+                    'benchmark': benchmark,
+                    'cameras': camera_count,
+                    'layers': layer_count,
+                    'seconds': seconds,
+                    'per_camera': seconds / camera_count,
+                }
+                results.append(result)
+                print(
+                    f'{benchmark:<14}{camera_count:>8} cameras{layer_count:>4} layers'
+                    f'{seconds * 1000:>12.2f} ms'
+                )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cameras', type=int, nargs='+', default=CAMERAS)
+    parser.add_argument('--layers', type=int, nargs='+', default=LAYERS)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--no-gui', action='store_true', help='skip refresh')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = run(tuple(args.cameras), tuple(args.layers), args.repeat, not args.no_gui)
+    report = {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+
+
+if __name__ == '__main__':
+    main()
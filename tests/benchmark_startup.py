@@ -0,0 +1,178 @@
+"""Startup benchmark of the MacroScript launch path against the in-memory pymxs
+runtime.
+
+Every sample runs in a fresh interpreter with Qt already imported, like inside
+3ds Max, and measures the import of shot_shaker.gui, the time from show() to
+the first paint of the window and the time until all cameras are loaded. Exits
+with 1 if the median of a measurement exceeds its budget.
+
+Usage:
+    python tests/benchmark_startup.py [--cameras 1000] [--layers 5] [--output FILE]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Budgets in milliseconds.
+BUDGETS = {'import': 250, 'first_paint': 250, 'loaded': 2000}
+# Seconds allowed for a single launch.
+TIMEOUT = 60
+RESULTS_VERSION = 1
+
+
+def sample(camera_count: int, layer_count: int) -> dict[str, float]:
+    """Measure a single launch in this interpreter."""
+
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    import fake_pymxs
+
+    fake_pymxs.install()
+
+    try:
+        from PySide6 import QtCore, QtWidgets
+    except ImportError:
+        from PySide2 import QtCore, QtWidgets
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+    start = time.perf_counter()
+    from shot_shaker import gui
+
+    timings = {'import': time.perf_counter() - start}
+
+    # Imported afterwards since it imports shot_shaker modules.
+    import benchmark
+
+    benchmark.build_scene(camera_count, layer_count)
+
+    class PaintFilter(QtCore.QObject):
+        def eventFilter(self, watched, event) -> bool:
+            if event.type() == QtCore.QEvent.Type.Paint:
+                timings.setdefault('first_paint', time.perf_counter() - start)
+            return False
+
+    paint_filter = PaintFilter()
+    app.installEventFilter(paint_filter)
+
+    start = time.perf_counter()
+    gui.show()
+    while gui.window._load_timer.isActive() or 'first_paint' not in timings:
+        if time.perf_counter() - start > TIMEOUT:
+            raise TimeoutError(f'The window did not load within {TIMEOUT} seconds.')
+        app.processEvents()
+    timings['loaded'] = time.perf_counter() - start
+    app.removeEventFilter(paint_filter)
+    return timings
+
+
+def run(camera_count: int, layer_count: int, repeat: int) -> dict[str, list[float]]:
+    samples = {}
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        '--sample',
+        '--cameras',
+        str(camera_count),
+        '--layers',
+        str(layer_count),
+    ]
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(
+        path for path in (ROOT, env.get('PYTHONPATH')) if path
+    )
+    for _ in range(repeat):
+        process = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.getcwd(),
+            env=env,
+            # Importing Qt and building the scene are not part of the timeout
+            # of the sample itself.
+            timeout=2 * TIMEOUT,
+        )
+        # Qt may write warnings before the result.
+        timings = json.loads(process.stdout.strip().splitlines()[-1])
+        for name, seconds in timings.items():
+            samples.setdefault(name, []).append(seconds)
+    return samples
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cameras', type=int, default=1000)
+    parser.add_argument('--layers', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='JSON file to write the results to')
+    parser.add_argument('--sample', action='store_true', help=argparse.SUPPRESS)
+    for name, budget in BUDGETS.items():
+        parser.add_argument(
+            f'--budget-{name.replace("_", "-")}',
+            type=float,
+            default=budget,
+            help=f'milliseconds allowed for {name} (default: {budget})',
+        )
+    args = parser.parse_args()
+
+    if args.sample:
+        timings = sample(args.cameras, args.layers)
+        print(json.dumps(timings))
+        # Skip tearing down Qt, which is not measured.
+        sys.stdout.flush()
+        os._exit(0)
+
+    samples = run(args.cameras, args.layers, args.repeat)
+    results = []
+    exceeded = False
+    for name, seconds in samples.items():
+        median = statistics.median(seconds)
+        budget = getattr(args, f'budget_{name}') / 1000
+        ok = median <= budget
+        exceeded |= not ok
+        results.append(
+            {
+                'benchmark': name,
+                'cameras': args.cameras,
+                'layers': args.layers,
+                'seconds': median,
+                'samples': seconds,
+                'budget': budget,
+                'ok': ok,
+            }
+        )
+        status = 'ok' if ok else 'OVER BUDGET'
+        print(
+            f'{name:<14}{median * 1000:>10.2f} ms'
+            f'{budget * 1000:>10.0f} ms budget  {status}',
+            file=sys.stderr,
+        )
+
+    report = {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 1 if exceeded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
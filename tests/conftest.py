@@ -0,0 +1,36 @@
+"""Run the tests against the in-memory pymxs runtime of `fake_pymxs`."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if path not in sys.path:
+    sys.path.insert(0, path)
+
+import fake_pymxs  # noqa: E402
+
+fake_pymxs.install()
+
+
+@pytest.fixture
+def rt():
+    """The fake runtime with an empty scene and no callbacks of the tool."""
+
+    from shot_shaker import cache, lib
+
+    lib.camera_registry.stop()
+    lib.untrack_revisions()
+    runtime = fake_pymxs.runtime
+    runtime.reset()
+    runtime.callbacks._scripts.clear()
+    # Anim handles are reassigned by the reset.
+    lib.invalidate_sub_anim_index()
+    cache.presets.clear()
+    cache.scenes.clear()
+    yield runtime
+    lib.camera_registry.stop()
+    lib.untrack_revisions()
@@ -0,0 +1,39 @@
+"""Stand-in for 3dsmaxbatch that runs a Python script against the in-memory
+pymxs runtime.
+
+Usage:
+    python tests/fake_maxbatch.py SCRIPT [-mxsString KEY:VALUE ...]
+
+Scenes are JSON files written by the fake runtime's saveMaxFile. Batches can
+be run against it with:
+
+    python -m shot_shaker.batch MANIFEST --maxbatch "python tests/fake_maxbatch.py"
+"""
+
+from __future__ import annotations
+
+import argparse
+import runpy
+import sys
+
+import fake_pymxs
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('script')
+    parser.add_argument('-mxsString', action='append', default=[], dest='strings')
+    args = parser.parse_args()
+
+    fake_pymxs.install()
+    rt = fake_pymxs.runtime
+    for string in args.strings:
+        key, value = string.split(':', 1)
+        rt.maxops.mxscmdlineargs[rt.name(key)] = value
+
+    runpy.run_path(args.script, run_name='__main__')
+    return rt.exit_code or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,871 @@
+"""In-memory stand-in for the subset of pymxs used by shot_shaker.
+
+Call `install()` before importing shot_shaker modules so `import pymxs`
+resolves to this module. Attribute access is case-insensitive like MAXScript.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy as _copy
+import itertools
+import json
+import math
+import os
+import re
+import sys
+import types
+import weakref
+
+
+class MaxObject:
+    """Base class giving MAXScript-style case-insensitive attribute access."""
+
+    def __getattr__(self, name: str):
+        lower = name.lower()
+        if lower != name:
+            return getattr(self, lower)
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value) -> None:
+        object.__setattr__(self, name.lower(), value)
+
+
+class MaxClass(MaxObject):
+    def __init__(self, name: str, factory=None, superclass: MaxClass | None = None):
+        self.name = name
+        self.factory = factory
+        self.superclass = superclass
+
+    def __call__(self, *args, **kwargs):
+        return self.factory(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return self.name
+
+
+class Name(str):
+    pass
+
+
+class SubAnim(MaxObject):
+    def __init__(self, name: str, controller=None, subs=(), scale: float = 1) -> None:
+        self.name = name
+        # Factor from the stored values to the values shown through the
+        # sub-anim, e.g. from radians to degrees for angles.
+        self._scale = scale
+        self.controller = controller
+        self._subs = list(subs)
+
+    @property
+    def controller(self):
+        # Like MAXScript, controllers accessed through a sub-anim convert to
+        # its dimension, a detached controller does not.
+        if self._scale != 1 and isinstance(self._controller, BezierFloat):
+            return DimensionView(self._controller, self._scale)
+        return self._controller
+
+    @controller.setter
+    def controller(self, controller) -> None:
+        if isinstance(controller, DimensionView):
+            controller = controller._controller
+        self._controller = controller
+
+    @property
+    def numsubs(self) -> int:
+        if self._subs:
+            return len(self._subs)
+        if self._controller is not None:
+            return self._controller.numsubs
+        return 0
+
+    def __getitem__(self, index: int):
+        if self._subs:
+            return self._subs[index]
+        if self._controller is not None:
+            return self._controller[index]
+        raise IndexError(index)
+
+
+class Key(MaxObject):
+    def __init__(self, time: float, value: float = 0) -> None:
+        self.time = time
+        self.value = value
+        self.intangent = 0.0
+        self.outtangent = 0.0
+        self.intangenttype = Name('smooth')
+        self.outtangenttype = Name('smooth')
+
+
+class Controller(MaxObject):
+    max_class: MaxClass
+
+    numsubs = 0
+
+    def __getitem__(self, index: int):
+        raise IndexError(index)
+
+
+class BezierFloat(Controller):
+    def __init__(self) -> None:
+        self.keys = []
+        self.value = 0.0
+
+    def add_key(self, time: float) -> Key:
+        if self.keys and self.keys[-1].time < time:
+            # Keys are usually written in order.
+            key = Key(time, self.value)
+            self.keys.append(key)
+            return key
+        for key in self.keys:
+            if key.time == time:
+                return key
+        key = Key(time, self.value)
+        self.keys.append(key)
+        self.keys.sort(key=lambda k: k.time)
+        return key
+
+
+class DimensionView(MaxObject):
+    """A float controller accessed through a sub-anim with a dimension."""
+
+    numsubs = 0
+
+    def __init__(self, controller: BezierFloat, scale: float) -> None:
+        self._controller = controller
+        self._scale = scale
+
+    @property
+    def max_class(self) -> MaxClass:
+        return self._controller.max_class
+
+    @property
+    def keys(self) -> list[KeyView]:
+        return [KeyView(key, self._scale) for key in self._controller.keys]
+
+    @property
+    def value(self) -> float:
+        return self._controller.value * self._scale
+
+    @value.setter
+    def value(self, value: float) -> None:
+        self._controller.value = value / self._scale
+
+    def add_key(self, time: float) -> KeyView:
+        return KeyView(self._controller.add_key(time), self._scale)
+
+
+class KeyView(MaxObject):
+    def __init__(self, key: Key, scale: float) -> None:
+        self._key = key
+        self._scale = scale
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        lower = name.lower()
+        if lower != name:
+            return getattr(self, lower)
+        return getattr(self._key, name)
+
+    def __setattr__(self, name: str, value) -> None:
+        name = name.lower()
+        if name in ('value', 'intangent', 'outtangent'):
+            setattr(self._key, name, value / self._scale)
+        elif name.startswith('_'):
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._key, name, value)
+
+    @property
+    def value(self) -> float:
+        return self._key.value * self._scale
+
+    @property
+    def intangent(self) -> float:
+        return self._key.intangent * self._scale
+
+    @property
+    def outtangent(self) -> float:
+        return self._key.outtangent * self._scale
+
+
+class XYZController(Controller):
+    suffix = ''
+    # Factor from the stored values of the axes to the shown values.
+    scale = 1
+
+    def __init__(self) -> None:
+        self._subs = [
+            SubAnim(f'{axis}_{self.suffix}', BezierFloat(), scale=self.scale)
+            for axis in ('X', 'Y', 'Z')
+        ]
+
+    @property
+    def numsubs(self) -> int:
+        return len(self._subs)
+
+    def __getitem__(self, index: int) -> SubAnim:
+        return self._subs[index]
+
+    @property
+    def keys(self) -> list[Key]:
+        keys = {}
+        for sub in self._subs:
+            for key in getattr(sub.controller, 'keys', ()):
+                keys.setdefault(key.time, key)
+        return [keys[t] for t in sorted(keys)]
+
+
+class EulerXYZ(XYZController):
+    suffix = 'Rotation'
+    # Angles are stored in radians and shown in degrees.
+    scale = math.degrees(1)
+
+
+class PositionXYZ(XYZController):
+    suffix = 'Position'
+
+
+class LayerController(Controller):
+    def __init__(self) -> None:
+        self._layers = []
+        self._weights = []
+        self.active = 1
+
+    @property
+    def numsubs(self) -> int:
+        return len(self._layers) + 1
+
+    def __getitem__(self, index: int) -> SubAnim:
+        if index < len(self._layers):
+            return self._layers[index]
+        if index == len(self._layers):
+            return SubAnim('Weights', subs=self._weights)
+        raise IndexError(index)
+
+    @property
+    def count(self) -> int:
+        return len(self._layers)
+
+    def getcount(self) -> int:
+        return len(self._layers)
+
+    def add(self, name: str, controller: Controller) -> None:
+        self._layers.append(SubAnim(name, controller))
+        weight = BezierFloat()
+        weight.value = 1.0
+        self._weights.append(SubAnim(f'Weight: {name}', weight))
+
+    def getlayername(self, index: int) -> str:
+        return self._layers[index - 1].name
+
+    def setlayername(self, index: int, name: str) -> None:
+        if name not in runtime.animlayermanager._layers:
+            runtime.animlayermanager._layers.append(name)
+        self._layers[index - 1].name = name
+        self._weights[index - 1].name = f'Weight: {name}'
+
+    def getlayerweight(self, index: int, time) -> float:
+        return self._weights[index - 1].controller.value
+
+    def setlayerweight(self, index: int, time, weight: float) -> None:
+        self._weights[index - 1].controller.value = weight
+
+    def setlayeractive(self, index: int) -> None:
+        self.active = index
+
+    @property
+    def weight(self) -> list[SubAnim]:
+        return self._weights
+
+
+class PositionLayer(LayerController):
+    pass
+
+
+class RotationLayer(LayerController):
+    pass
+
+
+class FloatLayer(LayerController):
+    pass
+
+
+class PRS(Controller):
+    def __init__(self) -> None:
+        self._subs = [
+            SubAnim('Position', PositionXYZ()),
+            SubAnim('Rotation', EulerXYZ()),
+            SubAnim('Scale', Controller()),
+        ]
+
+    @property
+    def numsubs(self) -> int:
+        return len(self._subs)
+
+    def __getitem__(self, index: int) -> SubAnim:
+        return self._subs[index]
+
+
+class BaseObject(MaxObject):
+    def __init__(self, subs=()) -> None:
+        self._subs = list(subs)
+
+    @property
+    def numsubs(self) -> int:
+        return len(self._subs)
+
+    def __getitem__(self, index: int) -> SubAnim:
+        return self._subs[index]
+
+
+class CameraObject(BaseObject):
+    def __init__(self) -> None:
+        fov = BezierFloat()
+        fov.value = 45.0
+        target_distance = BezierFloat()
+        target_distance.value = 160.0
+        super().__init__(
+            (SubAnim('fov', fov), SubAnim('targetDistance', target_distance))
+        )
+
+
+class Point3(MaxObject):
+    def __init__(self, x: float = 0, y: float = 0, z: float = 0) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
+
+
+class Node(MaxObject):
+    def __init__(self, runtime: Runtime, name: str, max_class: MaxClass) -> None:
+        self._runtime = runtime
+        self.name = name
+        self.max_class = max_class
+        self.controller = PRS()
+        if max_class.superclass is runtime.camera:
+            self.baseobject = CameraObject()
+        else:
+            self.baseobject = BaseObject()
+        self.user_props = {}
+        self.handle = next(runtime._handles)
+        self.layer = runtime.layermanager.getlayer(0)
+        self.isselected = False
+        # Position by frame, nodes without positions stay at the origin.
+        self.positions = {}
+
+    @property
+    def numsubs(self) -> int:
+        return 2
+
+    def __getitem__(self, index: int) -> SubAnim:
+        if index == 0:
+            return SubAnim('Transform', self.controller)
+        if index == 1:
+            return SubAnim('Object', subs=self.baseobject._subs)
+        raise IndexError(index)
+
+    @property
+    def transform(self):
+        # Positions are held between frames.
+        time = float(self._runtime.slidertime)
+        frames = [frame for frame in sorted(self.positions) if frame <= time]
+        position = self.positions[frames[-1]] if frames else (0, 0, 0)
+        return types.SimpleNamespace(position=Point3(*position))
+
+    @property
+    def inode(self):
+        return types.SimpleNamespace(handle=self.handle)
+
+    def __repr__(self) -> str:
+        return f'${self.name}'
+
+
+class AnimLayerManager(MaxObject):
+    def __init__(self, runtime: Runtime) -> None:
+        self._runtime = runtime
+        self._layers = []
+        self._muted = {}
+
+    def _nodes(self, nodes) -> list[Node]:
+        if isinstance(nodes, Node):
+            return [nodes]
+        return list(nodes)
+
+    def _tracks(self, node: Node, pos=True, rot=True, object=True) -> list:
+        # Sub-anims of the tracks that can hold layers, with their layer class.
+        tracks = []
+        if pos:
+            tracks.append((node.controller[0], PositionLayer))
+        if rot:
+            tracks.append((node.controller[1], RotationLayer))
+        if object:
+            tracks.extend((sub, FloatLayer) for sub in node.baseobject._subs)
+        return tracks
+
+    def _layer_controllers(self, node: Node) -> list[LayerController]:
+        return [
+            sub.controller
+            for sub, _ in self._tracks(node)
+            if isinstance(sub.controller, LayerController)
+        ]
+
+    def enablelayers(self, nodes, pos=True, rot=True, object=True, **kwargs) -> None:
+        if not self._layers:
+            self._layers.append('BaseLayer')
+        for node in self._nodes(nodes):
+            # Tracks enabled later get the layers the node already has.
+            names = []
+            for controller in self._layer_controllers(node):
+                for i in range(controller.count):
+                    name = controller.getlayername(i + 1)
+                    if name not in names:
+                        names.append(name)
+            for sub, layer_class in self._tracks(node, pos, rot, object):
+                if isinstance(sub.controller, LayerController):
+                    continue
+                layer = layer_class()
+                layer.add(self._layers[0], sub.controller)
+                for name in names[1:]:
+                    layer.add(name, self._new_controller(sub.controller))
+                sub.controller = layer
+
+    def addlayer(self, name: str, nodes, copy: bool) -> None:
+        if name not in self._layers:
+            self._layers.append(name)
+        for node in self._nodes(nodes):
+            for controller in self._layer_controllers(node):
+                base = controller[0].controller
+                controller.add(name, self._new_controller(base))
+
+    def _new_controller(self, base: Controller) -> Controller:
+        if isinstance(base, XYZController):
+            return type(base)()
+        return BezierFloat()
+
+    def getlayername(self, index: int) -> str:
+        if 0 < index <= len(self._layers):
+            return self._layers[index - 1]
+        return ''
+
+    def getnodeslayers(self, nodes) -> list[int]:
+        indexes = []
+        for node in self._nodes(nodes):
+            for controller in self._layer_controllers(node):
+                for i in range(controller.count):
+                    name = controller.getlayername(i + 1)
+                    if name in self._layers:
+                        index = self._layers.index(name) + 1
+                        if index not in indexes:
+                            indexes.append(index)
+        return indexes
+
+    def getlayermute(self, index: int) -> bool:
+        return self._muted.get(index, False)
+
+    def setlayermute(self, index: int, muted: bool) -> None:
+        self._muted[index] = muted
+
+
+class LayerProperties(MaxObject):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+class LayerManager(MaxObject):
+    def __init__(self) -> None:
+        self._layers = [LayerProperties('0')]
+
+    @property
+    def count(self) -> int:
+        return len(self._layers)
+
+    def getlayer(self, index: int) -> LayerProperties:
+        return self._layers[index]
+
+    def getlayerfromname(self, name: str):
+        for layer in self._layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def newlayerfromname(self, name: str) -> LayerProperties:
+        layer = LayerProperties(name)
+        self._layers.append(layer)
+        return layer
+
+
+class MaxOps(MaxObject):
+    def __init__(self) -> None:
+        # Arguments passed to 3dsmaxbatch with -mxsString.
+        self.mxscmdlineargs = {}
+
+
+class Units(MaxObject):
+    # Centimeters per unit.
+    centimeters = {'mm': 0.1, 'cm': 1, 'm': 100, 'km': 100000, 'in': 2.54, 'ft': 30.48}
+
+    def __init__(self) -> None:
+        # Centimeters per system unit.
+        self.system_scale = 1.0
+
+    def decodevalue(self, text: str) -> float:
+        match = re.fullmatch(r'\s*([-+\d.e]+)\s*([a-z]*)\s*', text.lower())
+        value, unit = float(match.group(1)), match.group(2) or 'cm'
+        return value * self.centimeters[unit] / self.system_scale
+
+
+class Windows(MaxObject):
+    def getmaxhwnd(self) -> int:
+        return 0
+
+
+class NodeEventCallback(MaxObject):
+    def __init__(self, events: dict) -> None:
+        self.events = {k.lower(): v for k, v in events.items()}
+
+
+class Callbacks(MaxObject):
+    def __init__(self) -> None:
+        self._scripts = {}
+        self._param = None
+
+    def notificationparam(self):
+        return self._param
+
+    def addscript(self, event, func, id=None) -> None:
+        self._scripts[(str(event), str(id))] = func
+
+    def removescripts(self, event=None, id=None) -> None:
+        for key in list(self._scripts):
+            if (event is None or key[0] == str(event)) and (
+                id is None or key[1] == str(id)
+            ):
+                del self._scripts[key]
+
+
+class Runtime(MaxObject):
+    def __init__(self) -> None:
+        self._handles = itertools.count(1)
+        self._nodes = []
+        self._handle_nodes = {}
+        self.slidertime = 0
+        self.framerate = 30
+        self.animationrange = types.SimpleNamespace(start=0, end=100)
+        self.redraw_disabled = 0
+        # Names of the undo records, the auto key modes of animate contexts and
+        # the number of view redraws, in order.
+        self.undo_records = []
+        self.animate_modes = []
+        self.redraws = 0
+        self.editing_suspended = 0
+        self.animlayermanager = AnimLayerManager(self)
+        self.layermanager = LayerManager()
+        self.callbacks = Callbacks()
+        self._node_event_callbacks = []
+        self.windows = Windows()
+        self.units = Units()
+        self.maxops = MaxOps()
+        self.exit_code = None
+        self.maxfilepath = ''
+        self.maxfilename = ''
+
+        self.camera = MaxClass('Camera')
+        self.freecamera = MaxClass('Freecamera', self._create_camera, self.camera)
+        self.targetcamera = MaxClass('Targetcamera', self._create_camera, self.camera)
+        self.maxclass = MaxClass('MAXClass')
+        self.maxscriptfunction = MaxClass('MAXScriptFunction')
+        self.geometryclass = MaxClass('GeometryClass')
+        self.box = MaxClass('Box', self._create_box, self.geometryclass)
+        self.bezier_float = MaxClass('Bezier_Float', BezierFloat)
+        self.euler_xyz = MaxClass('Euler_XYZ', EulerXYZ)
+        self.position_xyz = MaxClass('Position_XYZ', PositionXYZ)
+        self.position_layer = MaxClass('Position_layer', PositionLayer)
+        self.rotation_layer = MaxClass('Rotation_layer', RotationLayer)
+        self.float_layer = MaxClass('Float_layer', FloatLayer)
+        self.prs = MaxClass('PRS', PRS)
+        BezierFloat.max_class = self.bezier_float
+        EulerXYZ.max_class = self.euler_xyz
+        PositionXYZ.max_class = self.position_xyz
+        PositionLayer.max_class = self.position_layer
+        RotationLayer.max_class = self.rotation_layer
+        FloatLayer.max_class = self.float_layer
+        PRS.max_class = self.prs
+        Controller.max_class = MaxClass('Controller')
+
+    # Scene
+
+    def reset(self) -> None:
+        # Like resetMaxFile, callbacks survive the reset.
+        callbacks = self.callbacks
+        node_event_callbacks = self._node_event_callbacks
+        self.__init__()
+        self.callbacks = callbacks
+        self._node_event_callbacks = node_event_callbacks
+        self.fire_callback('systemPostReset')
+
+    def loadmaxfile(self, path: str, quiet: bool = False) -> bool:
+        """Load a scene written by `savemaxfile`."""
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        self.reset()
+        for item in data.get('nodes', []):
+            max_class = getattr(self, item['class'].lower())
+            node = max_class(item['name'])
+            node.user_props = dict(item.get('user_props', {}))
+        self._set_file_path(path)
+        self.fire_callback('filePostOpen')
+        return True
+
+    def savemaxfile(self, path: str, quiet: bool = False) -> bool:
+        """Save node names, classes and user properties as JSON."""
+
+        nodes = [
+            {
+                'name': node.name,
+                'class': node.max_class.name,
+                'user_props': node.user_props,
+            }
+            for node in self._nodes
+        ]
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'nodes': nodes}, f, indent=2)
+        except OSError:
+            return False
+        self._set_file_path(path)
+        return True
+
+    def _set_file_path(self, path: str) -> None:
+        directory, self.maxfilename = os.path.split(os.path.abspath(path))
+        self.maxfilepath = directory + os.sep
+
+    def quitmax(self, *args, **kwargs) -> None:
+        kwargs = {key.lower(): value for key, value in kwargs.items()}
+        self.exit_code = kwargs.get('exitcode', 0)
+
+    def _create_camera(self, name: str = 'Camera001') -> Node:
+        return self._add_node(Node(self, name, self.freecamera))
+
+    def _create_box(self, name: str = 'Box001') -> Node:
+        return self._add_node(Node(self, name, self.box))
+
+    def _add_node(self, node: Node) -> Node:
+        self._nodes.append(node)
+        self._handle_nodes[node.handle] = node
+        self.fire_callback('nodeCreated', node)
+        return node
+
+    @property
+    def objects(self) -> list[Node]:
+        return list(self._nodes)
+
+    @property
+    def cameras(self) -> list[Node]:
+        return [n for n in self._nodes if n.max_class.superclass is self.camera]
+
+    @property
+    def selection(self) -> list[Node]:
+        return [n for n in self._nodes if n.isselected]
+
+    def getnodebyname(self, name: str):
+        for node in self._nodes:
+            if node.name == name:
+                return node
+        return None
+
+    def delete(self, node) -> None:
+        nodes = node if isinstance(node, (list, tuple)) else [node]
+        for node in nodes:
+            if node in self._nodes:
+                self.fire_callback('nodePreDelete', node)
+                self._nodes.remove(node)
+                del self._handle_nodes[node.handle]
+
+    def select(self, node) -> None:
+        nodes = node if isinstance(node, (list, tuple)) else [node]
+        for n in self._nodes:
+            n.isselected = n in nodes
+
+    def isvalidnode(self, node) -> bool:
+        return isinstance(node, Node) and node.handle in self._handle_nodes
+
+    def importfile(self, path: str, *args, **kwargs) -> bool:
+        name = os.path.splitext(os.path.basename(path))[0]
+        self._create_camera(name)
+        return True
+
+    # Classes
+
+    def classof(self, obj) -> MaxClass:
+        if isinstance(obj, MaxClass):
+            return self.maxclass
+        return getattr(obj, 'max_class', self.maxscriptfunction)
+
+    def iskindof(self, obj, cls: MaxClass) -> bool:
+        max_class = getattr(obj, 'max_class', None)
+        while max_class is not None:
+            if max_class is cls:
+                return True
+            max_class = max_class.superclass
+        return False
+
+    def name(self, value: str) -> Name:
+        return Name(value)
+
+    # Controllers
+
+    def getpropertycontroller(self, controller, name: str):
+        for i in range(controller.numsubs):
+            sub = controller[i]
+            if sub.name.lower() == name.lower():
+                return sub.controller
+        return None
+
+    def addnewkey(self, controller: BezierFloat, time) -> Key:
+        return controller.add_key(float(time))
+
+    def getkeytime(self, controller: BezierFloat, index: int) -> float:
+        return controller.keys[index - 1].time
+
+    def movekeys(self, controller, offset) -> None:
+        if isinstance(controller, XYZController):
+            for sub in controller._subs:
+                self.movekeys(sub.controller, offset)
+            return
+        for key in controller.keys:
+            key.time += offset
+
+    def deletekeys(self, controller: BezierFloat, *args) -> None:
+        if isinstance(controller, DimensionView):
+            controller = controller._controller
+        controller.keys.clear()
+
+    def copy(self, obj):
+        return _copy.deepcopy(obj)
+
+    # Handles
+
+    def gethandlebyanim(self, obj) -> int:
+        handle = getattr(obj, 'handle', None)
+        if handle is None:
+            handle = id(obj)
+        return handle
+
+    def getanimbyhandle(self, handle: int):
+        return self._handle_nodes.get(handle)
+
+    # User properties
+
+    def getuserprop(self, node: Node, key: str):
+        return node.user_props.get(key)
+
+    def setuserprop(self, node: Node, key: str, value) -> None:
+        node.user_props[key] = value
+
+    # Viewport
+
+    def disablesceneredraw(self) -> None:
+        self.redraw_disabled += 1
+
+    def enablesceneredraw(self) -> None:
+        self.redraw_disabled -= 1
+
+    def suspendediting(self) -> None:
+        self.editing_suspended += 1
+
+    def resumeediting(self) -> None:
+        self.editing_suspended -= 1
+
+    def redrawviews(self) -> None:
+        self.redraws += 1
+
+    def execute(self, script: str):
+        # Scripts defining a function return its implementation below.
+        match = re.search(r'^\s*fn\s+(\w+)', script, re.MULTILINE)
+        if match:
+            return MAXSCRIPT_FUNCTIONS.get(match.group(1).lower())
+        return None
+
+    # Callbacks
+
+    def nodeeventcallback(self, **kwargs) -> NodeEventCallback:
+        # Like MAXScript, callbacks stay active until they are collected.
+        callback = NodeEventCallback(kwargs)
+        self._node_event_callbacks.append(weakref.ref(callback))
+        return callback
+
+    def fire_node_event(self, event: str, nodes) -> None:
+        handles = [node.handle if isinstance(node, Node) else node for node in nodes]
+        for ref in list(self._node_event_callbacks):
+            callback = ref()
+            if callback is None:
+                continue
+            func = callback.events.get(event.lower()) or callback.events.get('all')
+            if callable(func):
+                func(Name(event), handles)
+
+    def gc(self, **kwargs) -> None:
+        self._node_event_callbacks = [
+            ref for ref in self._node_event_callbacks if ref() is not None
+        ]
+
+    def fire_callback(self, event: str, param=None) -> None:
+        self.callbacks._param = param
+        try:
+            for (name, _), func in list(self.callbacks._scripts.items()):
+                if name == event:
+                    func()
+        finally:
+            self.callbacks._param = None
+
+
+def _write_keys(controller, times, values, in_tangents, out_tangents) -> None:
+    for time, value, in_tangent, out_tangent in zip(
+        times, values, in_tangents, out_tangents
+    ):
+        key = controller.add_key(float(time))
+        key.value = value
+        key.intangenttype = key.outtangenttype = Name('custom')
+        key.intangent = in_tangent
+        key.outtangent = out_tangent
+
+
+# Functions the tool defines through `execute`, by lowercase name.
+MAXSCRIPT_FUNCTIONS = {'shotshakerwritekeys': _write_keys}
+
+runtime = Runtime()
+
+
+@contextlib.contextmanager
+def undo(enabled: bool, name: str = '', redo: bool = False):
+    if enabled:
+        runtime.undo_records.append(name)
+    yield
+
+
+@contextlib.contextmanager
+def animate(enabled: bool):
+    runtime.animate_modes.append(enabled)
+    yield
+
+
+@contextlib.contextmanager
+def attime(time):
+    previous = runtime.slidertime
+    runtime.slidertime = time
+    try:
+        yield
+    finally:
+        runtime.slidertime = previous
+
+
+def install() -> types.ModuleType:
+    module = sys.modules[__name__]
+    sys.modules['pymxs'] = module
+    return module
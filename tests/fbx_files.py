@@ -0,0 +1,164 @@
+"""Writers of small FBX files for the tests."""
+
+from __future__ import annotations
+
+import array
+import struct
+import zlib
+
+from shot_shaker import fbx
+
+KTIME = fbx.KTIME_PER_SECOND
+
+# Axis settings of the 3ds Max exporter.
+Z_UP = {'UpAxis': 2, 'FrontAxis': 1, 'FrontAxisSign': -1, 'CoordAxis': 0}
+Y_UP = {'UpAxis': 1, 'FrontAxis': 2, 'FrontAxisSign': 1, 'CoordAxis': 0}
+
+
+def node(name: str, properties=(), children=()) -> fbx.Node:
+    return fbx.Node(name, list(properties), list(children))
+
+
+def properties70(values: dict) -> fbx.Node:
+    children = []
+    for name, value in values.items():
+        kind = 'double' if isinstance(value, float) else 'int'
+        children.append(node('P', (name, kind, '', '', value)))
+    return node('Properties70', children=children)
+
+
+def curve(curve_id: int, keys: list[tuple[float, float]], slope: float = 0):
+    # Cubic keys sharing a single attribute with `slope` on both sides.
+    return node(
+        'AnimationCurve',
+        (curve_id, 'AnimCurve::', ''),
+        (
+            node('KeyTime', (array.array('q', (round(t * KTIME) for t, _ in keys)),)),
+            node('KeyValueFloat', (array.array('f', (v for _, v in keys)),)),
+            node('KeyAttrFlags', (array.array('i', (fbx.INTERPOLATION_CUBIC,)),)),
+            node('KeyAttrDataFloat', (array.array('f', (slope, slope, 0, 0)),)),
+            node('KeyAttrRefCount', (array.array('i', (len(keys),)),)),
+        ),
+    )
+
+
+def scene(
+    name: str = 'Shake',
+    settings: dict | None = None,
+    transform: dict | None = None,
+    attribute: dict | None = None,
+    parent: int = 0,
+    camera: dict | None = None,
+) -> fbx.Node:
+    """Return the nodes of a file with a camera model animated by
+    `{property: {axis: keys}}` and the camera attribute properties `camera`.
+    """
+
+    objects = [
+        node('Model', (10, f'Model::{name}', 'Camera')),
+        node(
+            'NodeAttribute',
+            (11, 'NodeAttribute::', 'Camera'),
+            (properties70(camera or {}),),
+        ),
+    ]
+    connections = [
+        node('C', ('OO', 10, parent)),
+        node('C', ('OO', 11, 10)),
+    ]
+    next_id = 100
+    for parent_id, animated in ((10, transform or {}), (11, attribute or {})):
+        for property_name, axes in animated.items():
+            curve_node_id = next_id
+            objects.append(
+                node('AnimationCurveNode', (curve_node_id, 'AnimCurveNode::', ''))
+            )
+            connections.append(
+                node('C', ('OP', curve_node_id, parent_id, property_name))
+            )
+            for axis, keys in axes.items():
+                next_id += 1
+                objects.append(curve(next_id, keys))
+                connections.append(node('C', ('OP', next_id, curve_node_id, axis)))
+            next_id += 1
+    return node(
+        '',
+        children=(
+            node('FBXHeaderExtension', children=(node('FBXVersion', (7400,)),)),
+            node('GlobalSettings', children=(properties70(settings or Z_UP),)),
+            node('Objects', children=objects),
+            node('Connections', children=connections),
+        ),
+    )
+
+
+def to_ascii(root: fbx.Node) -> str:
+    def value(v) -> str:
+        if isinstance(v, str):
+            return f'"{v}"'
+        return repr(v)
+
+    def write(item: fbx.Node, indent: str) -> list[str]:
+        properties = []
+        children = list(item.children)
+        for p in item.properties:
+            if isinstance(p, array.array):
+                properties.append(f'*{len(p)}')
+                children.append(node('a', p))
+            else:
+                properties.append(value(p))
+        line = f'{indent}{item.name}: {", ".join(properties)}'
+        if not children:
+            return [line]
+        lines = [line + ' {']
+        for child in children:
+            lines.extend(write(child, indent + '\t'))
+        return lines + [indent + '}']
+
+    lines = ['; FBX 7.4.0 project file']
+    for child in root.children:
+        lines.extend(write(child, ''))
+    return '\n'.join(lines) + '\n'
+
+
+def to_binary(root: fbx.Node, version: int = 7400, compress: bool = False) -> bytes:
+    header_format = '<QQQ' if version >= 7500 else '<III'
+    header_size = struct.calcsize(header_format)
+    array_types = {'q': 'l', 'd': 'd', 'f': 'f', 'i': 'i'}
+
+    def encode_property(p) -> bytes:
+        if isinstance(p, array.array):
+            data = p.tobytes()
+            encoding = 0
+            if compress:
+                data = zlib.compress(data)
+                encoding = 1
+            code = array_types[p.typecode].encode()
+            return code + struct.pack('<III', len(p), encoding, len(data)) + data
+        if isinstance(p, str):
+            if '::' in p:
+                class_name, name = p.split('::', 1)
+                p = f'{name}\x00\x01{class_name}'
+            data = p.encode()
+            return b'S' + struct.pack('<I', len(data)) + data
+        if isinstance(p, float):
+            return b'D' + struct.pack('<d', p)
+        return b'L' + struct.pack('<q', p)
+
+    def encode_node(item: fbx.Node, offset: int) -> bytes:
+        properties = b''.join(encode_property(p) for p in item.properties)
+        name = item.name.encode()
+        start = offset + header_size + 1 + len(name) + len(properties)
+        children = b''
+        for child in item.children:
+            children += encode_node(child, start + len(children))
+        if item.children:
+            children += bytes(header_size + 1)
+        end = start + len(children)
+        header = struct.pack(header_format, end, len(item.properties), len(properties))
+        return header + bytes((len(name),)) + name + properties + children
+
+    data = fbx.BINARY_MAGIC + struct.pack('<I', version)
+    for item in root.children:
+        data += encode_node(item, len(data))
+    return data + bytes(header_size + 1)
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import csv
+
+import numpy as np
+import pytest
+
+from shot_shaker import analysis
+from shot_shaker.curves import Curve
+
+ZERO = Curve([0], [0], [0], [0])
+
+
+def _linear(start: float, end: float, duration: float = 1) -> Curve:
+    slope = (end - start) / duration
+    return Curve([0, duration], [start, end], [slope, slope], [slope, slope])
+
+
+def test_analyze_constant_rotation() -> None:
+    layers = [((_linear(2, 2), ZERO, ZERO), 1.0)]
+
+    stats = analysis.analyze(layers, 0, 10, 10, threshold=1)
+
+    assert stats.peak == pytest.approx((2, 0, 0))
+    assert stats.rms == pytest.approx((2, 0, 0))
+    assert stats.peak_angle == pytest.approx(2)
+    assert stats.peak_velocity == pytest.approx(0, abs=1e-9)
+    assert stats.frames_over == tuple(range(11))
+    assert stats.velocity_spikes == ()
+
+
+def test_analyze_applies_weights() -> None:
+    layers = [((ZERO, _linear(0, 10), ZERO), 0.5)]
+
+    stats = analysis.analyze(layers, 0, 10, 10, threshold=4)
+
+    # 5 degrees over a second at half weight.
+    assert stats.peak == pytest.approx((0, 5, 0))
+    assert stats.peak_velocity == pytest.approx(5)
+    assert stats.frames_over == (9, 10)
+
+
+def test_analyze_animated_weight() -> None:
+    layers = [((ZERO, ZERO, _linear(4, 4)), _linear(0, 1))]
+
+    stats = analysis.analyze(layers, 0, 10, 10, threshold=1)
+
+    assert stats.peak == pytest.approx((0, 0, 4))
+    assert stats.frames_over == tuple(range(3, 11))
+
+
+def test_analyze_finds_spikes() -> None:
+    times = np.arange(21) / 10
+    values = np.zeros(21)
+    values[10] = 5
+    zeros = [0.0] * 21
+    spike = Curve(times.tolist(), values.tolist(), zeros, zeros)
+
+    stats = analysis.analyze([((spike, ZERO, ZERO), 1.0)], 0, 20, 10, threshold=10)
+
+    assert stats.peak_angle == pytest.approx(5)
+    assert stats.frames_over == ()
+    # Speed peaks around the key, acceleration at the key.
+    assert stats.velocity_spikes == (9, 11)
+    assert stats.acceleration_spikes == (10,)
+
+
+def test_frame_ranges() -> None:
+    assert analysis.frame_ranges([]) == ''
+    assert analysis.frame_ranges([1, 2, 3, 7, 9, 10]) == '1-3 7 9-10'
+
+
+def test_write_csv(tmp_path) -> None:
+    stats = analysis.analyze([((_linear(2, 2), ZERO, ZERO), 1.0)], 0, 2, 10, 1)
+    path = tmp_path / 'stats.csv'
+
+    analysis.write_csv(str(path), [('Camera001', stats)])
+
+    with open(path, encoding='utf-8', newline='') as f:
+        (row,) = csv.DictReader(f)
+    assert row['camera'] == 'Camera001'
+    assert row['frames_over'] == '0-2'
+    assert float(row['peak_x']) == pytest.approx(2)
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+import fbx_files
+from shot_shaker import batch
+
+FAKE_MAXBATCH = [
+    sys.executable,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_maxbatch.py'),
+]
+
+
+def _write_scene(path, *names: str) -> str:
+    nodes = [{'name': name, 'class': 'Freecamera'} for name in names]
+    path.write_text(json.dumps({'nodes': nodes}), encoding='utf-8')
+    return str(path)
+
+
+def _write_preset(directory) -> str:
+    keys = [(0, 0.0), (0.5, 2.0), (1, -1.0)]
+    root = fbx_files.scene(name='Handheld', transform={'Lcl Rotation': {'d|X': keys}})
+    path = directory / 'Handheld.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+    return str(path)
+
+
+def test_run_applies_jobs_in_worker(tmp_path) -> None:
+    preset = _write_preset(tmp_path)
+    # Camera names are not unique within a scene.
+    scene = _write_scene(tmp_path / 'sh010.max', 'cam', 'cam', 'other')
+    missing = _write_scene(tmp_path / 'sh020.max', 'other')
+    jobs = [
+        batch.BatchJob(scene=scene, preset=preset, cameras='cam*', weight=0.5),
+        batch.BatchJob(scene=missing, preset=preset, cameras='cam*'),
+    ]
+
+    reports = batch.run(jobs, workers=2, maxbatch=FAKE_MAXBATCH, timeout=60)
+
+    assert [report.job for report in reports] == jobs
+    assert reports[0].ok
+    assert reports[0].layers == [
+        {'camera': 'cam', 'layer': 'Handheld'},
+        {'camera': 'cam', 'layer': 'Handheld'},
+    ]
+    assert not reports[1].ok
+    assert "No cameras match 'cam*'." in reports[1].errors
+    # The worker saves the scene with the layer metadata.
+    with open(scene, encoding='utf-8') as f:
+        nodes = json.load(f)['nodes']
+    assert ['Handheld' in node['user_props'].get('layers', '') for node in nodes] == [
+        True,
+        True,
+        False,
+    ]
+
+
+def test_report_round_trip() -> None:
+    job = batch.BatchJob(scene='a.max', preset='b.fbx')
+    report = batch.JobReport(
+        job=job, layers=[{'camera': 'cam', 'layer': 'Shake'}], errors=['failed']
+    )
+
+    data = json.loads(json.dumps(report.to_dict()))
+
+    assert data['ok'] is False
+    assert batch.JobReport.from_dict(data) == report
+
+
+def test_failed_worker_reports_all_jobs(tmp_path) -> None:
+    scene = str(tmp_path / 'a.max')
+    jobs = [batch.BatchJob(scene=scene, preset=name) for name in ('a.fbx', 'b.fbx')]
+
+    reports = batch.run(jobs, maxbatch=[sys.executable, '-c', 'raise SystemExit(3)'])
+
+    assert [report.errors for report in reports] == [
+        ['Worker exited with 3: '],
+        ['Worker exited with 3: '],
+    ]
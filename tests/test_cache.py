@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import os
+
+from shot_shaker import cache
+
+
+def _write(path, data: bytes, mtime_ns: int) -> str:
+    path.write_bytes(data)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+    return str(path)
+
+
+def test_file_cache_loads_once(tmp_path) -> None:
+    path = _write(tmp_path / 'a.fbx', b'a', 1_000_000_000)
+    file_cache = cache.FileCache()
+    loads = []
+
+    def loader(p: str) -> bytes:
+        loads.append(p)
+        return b'value'
+
+    assert file_cache.get(path, loader) == b'value'
+    assert file_cache.get(path, loader) == b'value'
+    assert len(loads) == 1
+    assert (file_cache.hits, file_cache.misses) == (1, 1)
+    assert path in file_cache
+
+
+def test_file_cache_invalidates_changed_files(tmp_path) -> None:
+    path = tmp_path / 'a.fbx'
+    _write(path, b'a', 1_000_000_000)
+    file_cache = cache.FileCache()
+    file_cache.get(str(path), lambda p: 1)
+
+    # A new mtime or size invalidates the entry.
+    _write(path, b'a', 2_000_000_000)
+    assert str(path) not in file_cache
+    assert file_cache.get(str(path), lambda p: 2) == 2
+    _write(path, b'ab', 2_000_000_000)
+    assert file_cache.get(str(path), lambda p: 3) == 3
+
+
+def test_file_cache_drops_deleted_files(tmp_path) -> None:
+    path = _write(tmp_path / 'a.fbx', b'a', 1_000_000_000)
+    file_cache = cache.FileCache()
+    file_cache.get(path, lambda p: 1)
+
+    os.remove(path)
+
+    assert path not in file_cache
+    assert len(file_cache) == 0
+
+
+def test_file_cache_evicts_least_recently_used(tmp_path) -> None:
+    paths = [_write(tmp_path / f'{i}.fbx', b'x', 1_000_000_000) for i in range(3)]
+    file_cache = cache.FileCache(budget=200)
+    for path in paths[:2]:
+        file_cache.get(path, lambda p: bytes(100))
+    # Using the first entry makes the second one the least recently used.
+    file_cache.get(paths[0], lambda p: bytes(100))
+
+    file_cache.get(paths[2], lambda p: bytes(100))
+
+    assert paths[0] in file_cache
+    assert paths[1] not in file_cache
+    assert file_cache.evictions == 1
+    assert file_cache.nbytes == 200
+
+
+def test_file_cache_keeps_most_recent_entry_over_budget(tmp_path) -> None:
+    path = _write(tmp_path / 'a.fbx', b'a', 1_000_000_000)
+    file_cache = cache.FileCache(budget=10)
+
+    file_cache.get(path, lambda p: bytes(100))
+
+    assert path in file_cache
+    file_cache.set_budget(0)
+    assert path in file_cache
+
+
+def test_scene_cache_requires_tracking() -> None:
+    scenes = cache.SceneCache()
+
+    scenes.set('a.max', 1, 0, 'layers')
+
+    assert scenes.get('a.max', 1) is None
+    assert len(scenes) == 0
+
+
+def test_scene_cache_invalidates_changed_nodes() -> None:
+    scenes = cache.SceneCache()
+    scenes.tracker = object()
+    scenes.set('a.max', 1, scenes.revision(1), 'one')
+    scenes.set('a.max', 2, scenes.revision(2), 'two')
+
+    scenes.touch('nameChanged', (1,))
+
+    assert scenes.get('a.max', 1) is None
+    assert not scenes.has(1)
+    assert scenes.get('a.max', 2) == 'two'
+    assert scenes.get('b.max', 2) is None
+    assert (scenes.hits, scenes.misses) == (1, 2)
+
+
+def test_scene_cache_ignores_snapshots_read_before_a_change() -> None:
+    scenes = cache.SceneCache()
+    scenes.tracker = object()
+    revision = scenes.revision(1)
+
+    # The node changes while its snapshot is read.
+    scenes.touch('controllerOtherEvent', (1,))
+    scenes.set('a.max', 1, revision, 'stale')
+
+    assert scenes.get('a.max', 1) is None
+
+
+def test_scene_cache_reset() -> None:
+    scenes = cache.SceneCache()
+    scenes.tracker = object()
+    scenes.touch('nameChanged', (1,))
+    scenes.set('a.max', 1, 1, 'one')
+
+    scenes.reset()
+
+    assert scenes.revision(1) == 0
+    assert len(scenes) == 0
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+QtWidgets = pytest.importorskip('PySide6.QtWidgets')
+
+from PySide6 import QtCore, QtTest  # noqa: E402
+
+from shot_shaker import core, gui  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def app():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+def _view(cameras) -> tuple[QtWidgets.QTreeView, gui.CameraModel]:
+    view = QtWidgets.QTreeView()
+    model = gui.CameraModel(view)
+    view.setModel(model)
+    view.setItemDelegate(gui.CameraDelegate(view))
+    model.set_cameras(cameras)
+    return view, model
+
+
+def _edit(view: QtWidgets.QTreeView, index: QtCore.QModelIndex, value) -> None:
+    # Spin box editors commit every value change through the delegate.
+    view.openPersistentEditor(index)
+    view.indexWidget(index).setValue(value)
+    view.closePersistentEditor(index)
+
+
+def test_edits_of_selected_layers_are_one_transaction(rt, app) -> None:
+    camera = core.Camera(rt.Freecamera('Camera001'))
+    for _ in range(2):
+        core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    camera.reload_layers()
+    view, model = _view(core.get_cameras())
+    parent = model.index(0, 0)
+    model.fetchMore(parent)
+    assert model.rowCount(parent) == 2
+    selection = view.selectionModel()
+    for row in range(2):
+        selection.select(
+            model.index(row, 0, parent),
+            QtCore.QItemSelectionModel.SelectionFlag.Select
+            | QtCore.QItemSelectionModel.SelectionFlag.Rows,
+        )
+    rt.undo_records.clear()
+
+    _edit(view, model.index(0, 1, parent), 0.5)
+    _edit(view, model.index(0, 1, parent), 0.25)
+    _edit(view, model.index(1, 2, parent), 10)
+
+    # Edits are shown right away, but only applied once the edits pause.
+    assert model._commit_timer.interval() == model.commit_delay == 250
+    assert model._commit_timer.isActive()
+    assert [model.index(row, 1, parent).data() for row in range(2)] == [0.25, 0.25]
+    assert [model.index(row, 2, parent).data() for row in range(2)] == [10, 10]
+    assert rt.undo_records == []
+    assert [layer.get_weight() for layer in camera.get_layers()] == [1, 1]
+
+    deadline = QtCore.QDeadlineTimer(5000)
+    while model._commit_timer.isActive() and not deadline.hasExpired():
+        QtTest.QTest.qWait(10)
+
+    assert rt.undo_records == ['Edit Shake']
+    assert model._pending == {}
+    layers = camera.get_layers()
+    assert [layer.get_weight() for layer in layers] == [0.25, 0.25]
+    assert [layer.get_start_frame() for layer in layers] == [10, 10]
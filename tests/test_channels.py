@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from shot_shaker import channels
+from shot_shaker.curves import Curve
+
+
+def _curve(*values: float) -> Curve:
+    times = list(range(len(values)))
+    return Curve(times, list(values), [1.0] * len(values), [1.0] * len(values))
+
+
+def test_to_offsets() -> None:
+    source = {
+        'rotation': (_curve(5, 6), _curve(0), _curve(0)),
+        'fov': (_curve(45, 50, 40),),
+        'target_distance': (_curve(100, 90),),
+    }
+
+    result = channels.to_offsets(source)
+
+    assert result['rotation'] == source['rotation']
+    assert list(result['fov'][0].values) == [0, 5, -5]
+    assert list(result['fov'][0].out_tangents) == [1, 1, 1]
+    assert list(result['target_distance'][0].values) == [0, -10]
+    # Offsets are returned as is.
+    assert channels.to_offsets(result) == result
+
+
+def test_scale_distances() -> None:
+    source = {
+        'position': (_curve(1, 2), _curve(0), _curve(0)),
+        'fov': (_curve(45),),
+        'target_distance': (_curve(100),),
+    }
+
+    result = channels.scale_distances(source, 0.01)
+
+    assert list(result['position'][0].values) == [0.01, 0.02]
+    assert list(result['position'][0].in_tangents) == [0.01, 0.01]
+    assert list(result['target_distance'][0].values) == [1]
+    assert result['fov'] == source['fov']
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import struct
+
+import pytest
+
+import fbx_files
+from shot_shaker import compiled, compiler, fbx, presets
+from shot_shaker.curves import Curve
+
+CHANNELS = {
+    'rotation': (
+        Curve([0, 0.5, 1], [1, -2, 0.5], [0, 1, 0], [0, 1.5, 0]),
+        Curve([0], [0], [0], [0]),
+        Curve([0, 1], [3, 4], [0.25, 0.25], [0.25, 0.25]),
+    ),
+    'fov': (Curve([0, 2], [0, 5], [0, 0], [0, 0]),),
+}
+
+
+def _lists(channels) -> dict:
+    return {
+        name: [curve.to_dict() for curve in curves] for name, curves in channels.items()
+    }
+
+
+def test_encode_decode_round_trip() -> None:
+    channels = compiled.decode(compiled.encode(CHANNELS))
+
+    assert list(channels) == ['rotation', 'fov']
+    assert _lists(channels) == _lists(CHANNELS)
+
+
+def test_decode_version_1() -> None:
+    rotation = CHANNELS['rotation']
+    data = compiled.encode({'rotation': rotation})
+    # Version 1 has no channel table, which is 10 bytes padded to 12 here.
+    header = compiled.HEADER.pack(compiled.MAGIC, 1, 3)
+    table_size = 12
+
+    channels = compiled.decode(header + data[compiled.HEADER.size + table_size :])
+
+    assert _lists(channels) == _lists({'rotation': rotation})
+
+
+@pytest.mark.parametrize(
+    'data, message',
+    [
+        (b'', 'too short'),
+        (b'FBX\x00' + bytes(4), 'not a compiled preset'),
+        (compiled.HEADER.pack(compiled.MAGIC, 9, 0), 'version'),
+        (compiled.encode(CHANNELS)[:-4], 'truncated'),
+        (compiled.encode(CHANNELS)[:12], 'corrupt|truncated'),
+    ],
+)
+def test_decode_invalid_data(data, message) -> None:
+    with pytest.raises(compiled.FormatError, match=message):
+        compiled.decode(data)
+
+
+def test_read_closes_the_file(tmp_path) -> None:
+    path = str(tmp_path / 'Shake.shake')
+    compiled.write(path, CHANNELS)
+
+    channels = compiled.read(path)
+    compiled.write(path, {'fov': CHANNELS['fov']})
+
+    assert _lists(channels) == _lists(CHANNELS)
+    assert list(compiled.read(path)) == ['fov']
+
+
+def test_empty_compiled_preset_falls_back_to_fbx(rt, tmp_path, monkeypatch) -> None:
+    path = tmp_path / 'Shake.fbx'
+    path.write_bytes(b'')
+    compiled_path = tmp_path / 'Shake.shake'
+    compiled_path.write_bytes(b'')
+    os.utime(path, ns=(0, 0))
+    monkeypatch.setattr(presets, '_read_channels', lambda p: CHANNELS)
+
+    assert presets.load_channels(str(path)) is CHANNELS
+
+
+def test_unreadable_compiled_preset_warns_once(
+    rt, tmp_path, monkeypatch, caplog
+) -> None:
+    path = tmp_path / 'Shake.fbx'
+    path.write_bytes(b'')
+    (tmp_path / 'Shake.shake').write_bytes(b'')
+    os.utime(path, ns=(0, 0))
+    monkeypatch.setattr(presets, '_read_channels', lambda p: CHANNELS)
+
+    with caplog.at_level('DEBUG', logger='shot_shaker.presets'):
+        for _ in range(3):
+            presets.load_channels(str(path))
+
+    failures = [
+        record.levelname
+        for record in caplog.records
+        if record.getMessage().startswith('Failed to read compiled preset')
+    ]
+    assert failures == ['WARNING', 'DEBUG', 'DEBUG']
+
+
+def test_read_version(tmp_path) -> None:
+    path = tmp_path / 'Shake.shake'
+    compiled.write(str(path), CHANNELS)
+    empty = tmp_path / 'Empty.shake'
+    empty.write_bytes(b'')
+
+    assert compiled.read_version(str(path)) == compiled.VERSION
+    assert compiled.read_version(str(empty)) is None
+    assert compiled.read_version(str(tmp_path / 'Missing.shake')) is None
+
+
+def _write_preset(directory, name: str = 'Shake') -> str:
+    keys = [(0, 0.0), (0.5, 2.0), (1, -1.0)]
+    root = fbx_files.scene(name=name, transform={'Lcl Rotation': {'d|X': keys}})
+    path = directory / f'{name}.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+    return str(path)
+
+
+def test_compiler_recompiles_older_versions(tmp_path) -> None:
+    path = _write_preset(tmp_path)
+    compiled_path = compiled.compiled_path(path)
+    data = compiled.encode({'rotation': CHANNELS['rotation']})
+    header = compiled.HEADER.pack(compiled.MAGIC, 1, 3)
+    with open(compiled_path, 'wb') as f:
+        f.write(header + data[compiled.HEADER.size + 12 :])
+    os.utime(path, ns=(0, 0))
+    assert compiled.is_up_to_date(path)
+    assert compiled.read_version(compiled_path) == 1
+
+    assert compiler.compile_presets(str(tmp_path), workers=1) == {}
+
+    assert compiled.read_version(compiled_path) == compiled.VERSION
+    expected = fbx.read_channels(path, 'Shake')
+    assert _lists(compiled.read(compiled_path)) == _lists(expected)
+
+
+def test_compiler_exit_code(tmp_path) -> None:
+    _write_preset(tmp_path)
+
+    assert compiler.main([str(tmp_path), '--workers', '1']) == 0
+
+    (tmp_path / 'Broken.fbx').write_bytes(b'Not an FBX file')
+    assert compiler.main([str(tmp_path), '--workers', '1']) == 1
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+import fbx_files
+from shot_shaker import cache, core, evaluate, lib, procedural
+
+
+def _camera(rt, name: str = 'Camera001') -> core.Camera:
+    return core.Camera(rt.Freecamera(name))
+
+
+def test_procedural_shake_takes_profile_settings(rt) -> None:
+    camera = _camera(rt)
+    data = core.ProceduralShakeData(profile='impact', amplitude=(1.0, 1.0, 1.0))
+
+    (result,) = core.create_procedural_shakes([camera], data)
+
+    assert not result.error
+    settings = camera.get_metadata()[result.layer]['procedural']
+    impact = procedural.PROFILES['impact']
+    assert settings['frequency'] == list(impact['frequency'])
+    assert settings['decay'] == impact['decay']
+    assert settings['amplitude'] == [1, 1, 1]
+
+
+def test_procedural_shake_with_unknown_profile(rt) -> None:
+    camera = _camera(rt)
+
+    (result,) = core.create_procedural_shakes(
+        [camera], core.ProceduralShakeData(profile='other')
+    )
+
+    assert 'other' in result.error
+    assert not camera.layers
+
+
+def test_bake_and_unbake_round_trip(rt) -> None:
+    camera = _camera(rt)
+    core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    base = camera._get_base_rotation()
+    base_curves = lib.read_euler_keys(base)
+    ((layer_curves, weight),) = camera.get_layer_curves()
+    times = np.arange(11) / rt.frameRate
+
+    assert not core.bake_cameras([camera], 0, 10)[0].error
+
+    assert camera.baked
+    assert [layer.weight for layer in camera.layers] == [0]
+    baked = evaluate.sample_rotation(lib.read_euler_keys(base), times)
+    shake = evaluate.sample_rotation(layer_curves, times) * weight
+    assert baked == pytest.approx(shake, abs=1e-6)
+
+    assert not core.unbake_cameras([camera])[0].error
+
+    assert not camera.baked
+    assert [layer.weight for layer in camera.layers] == [1]
+    for curve, expected in zip(lib.read_euler_keys(base), base_curves):
+        assert list(curve.values) == list(expected.values)
+
+
+def test_simplify_layer_reduces_all_channels(rt) -> None:
+    camera = _camera(rt)
+    times = np.arange(30) / rt.frameRate
+    line = evaluate.curve_from_samples(times, times * 10)
+    source = {'rotation': (line, line, line), 'fov': (line,)}
+    (result,) = core._add_layer_sources(
+        (camera,), (source,), ({},), base_name='Shake', start_frame=0, weight=1
+    )
+    (layer,) = camera.layers
+
+    assert layer.simplify(0.001) == (120, 8)
+
+    tracks = lib.get_layer_tracks(camera.node, result.layer)
+    for name, size in (('rotation', 3), ('fov', 1)):
+        for curve in lib.read_track_keys(tracks[name], size):
+            assert list(curve.values) == pytest.approx([0, times[-1] * 10])
+
+
+def test_get_cameras_does_not_install_callbacks(rt) -> None:
+    node = rt.Freecamera('Camera001')
+
+    cameras = core.get_cameras()
+
+    assert [camera.node for camera in cameras] == [node]
+    assert not lib.camera_registry.active
+    assert not any('Cameras' in id for _, id in rt.callbacks._scripts)
+
+
+def test_get_cameras_uses_started_registry(rt) -> None:
+    lib.camera_registry.start()
+    core.get_cameras()
+
+    node = rt.Freecamera('Camera001')
+
+    assert [camera.node for camera in core.get_cameras()] == [node]
+
+
+def test_envelope_moves_with_layer(rt) -> None:
+    camera = _camera(rt)
+    core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    (layer,) = camera.layers
+    data = core.EnvelopeData(start_frame=0, fade_in=2, hold=4, fade_out=2)
+
+    (result,) = core.apply_envelopes([layer], data)
+    before = layer.get_weight_keys()
+    layer.set_start_frame(layer.start_frame + 10)
+
+    assert result.keys == len(before)
+    after = layer.get_weight_keys()
+    assert [round(t * rt.frameRate) for t in after.times] == [
+        round(t * rt.frameRate) + 10 for t in before.times
+    ]
+    assert list(after.values) == list(before.values)
+
+
+def test_failed_transaction_keeps_layer_snapshot(rt) -> None:
+    camera = _camera(rt)
+    core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    (layer,) = camera.layers
+    before = camera._snapshot()
+
+    with pytest.raises(RuntimeError):
+        with lib.transaction('Edit Shake'):
+            layer.set_weight(0.5)
+            layer.set_start_frame(layer.start_frame + 10)
+            layer.set_muted(True)
+            raise RuntimeError('Edit failed')
+
+    assert camera._snapshot() == before
+    assert (layer.weight, layer.start_frame, layer.muted) == (
+        layer.get_weight(),
+        layer.get_start_frame(),
+        layer.get_muted(),
+    )
+
+    with lib.transaction('Edit Shake'):
+        layer.set_start_frame(layer.start_frame + 10)
+        layer.set_start_frame(layer.start_frame + 20)
+        layer.set_weight(0.5)
+
+    assert (layer.weight, layer.start_frame) == (0.5, 20)
+    assert (layer.get_weight(), layer.get_start_frame()) == (0.5, 20)
+
+
+def test_scan_cameras_restores_layers_while_tracking(rt) -> None:
+    camera = _camera(rt)
+    core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    lib.track_revisions()
+    for camera in core.get_cameras():
+        camera.layers
+
+    ((cameras, changed),) = core.scan_cameras()
+
+    assert cameras[0].layers_loaded
+    assert changed == ()
+
+    # The fake runtime does not report node events.
+    cache.scenes.touch('nameChanged', (cameras[0].handle,))
+    ((cameras, changed),) = core.scan_cameras()
+
+    assert not cameras[0].layers_loaded
+    assert changed == (cameras[0].handle,)
+
+
+def test_get_cameras_does_not_track_revisions(rt) -> None:
+    _camera(rt)
+
+    for camera in core.get_cameras():
+        camera.layers
+
+    assert not cache.scenes.tracking
+    assert len(cache.scenes) == 0
+
+
+def test_load_preset_adds_fov_and_distances_as_offsets(rt, tmp_path) -> None:
+    root = fbx_files.scene(
+        name='Preset',
+        transform={'Lcl Translation': {'d|X': [(0, 0.0), (1, 50.0)]}},
+        attribute={
+            'FieldOfView': {'d|FieldOfView': [(0, 45.0), (1, 50.0)]},
+            'FocusDistance': {'d|FocusDistance': [(0, 200.0), (1, 100.0)]},
+        },
+        camera={'ApertureMode': 1},
+    )
+    path = tmp_path / 'Preset.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+    # System units are meters.
+    rt.units.system_scale = 100
+
+    source = core.load_preset(str(path))
+
+    assert list(source['position'][0].values) == [0, 0.5]
+    assert list(source['fov'][0].values) == [0, 5]
+    assert list(source['target_distance'][0].values) == [0, -1]
+
+
+def _write_preset(directory, name: str = 'Shake') -> str:
+    keys = [(0, 0.0), (0.5, 2.0), (1, -1.0)]
+    root = fbx_files.scene(name=name, transform={'Lcl Rotation': {'d|X': keys}})
+    path = directory / f'{name}.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+    return str(path)
+
+
+def test_create_shakes_adds_a_layer_per_camera(rt, tmp_path) -> None:
+    cameras = [_camera(rt, f'Camera{i:03d}') for i in range(3)]
+    data = core.CreateShakeData(preset=_write_preset(tmp_path), start_frame=0, weight=1)
+
+    results = core.create_shakes(cameras, data)
+
+    assert [result.camera for result in results] == cameras
+    assert all(result.layer and not result.error for result in results)
+    for camera, result in zip(cameras, results):
+        assert [layer.name for layer in camera.get_layers()] == [result.layer]
+
+
+@pytest.mark.parametrize('content', [None, b'', b'Not an FBX file'])
+def test_create_shakes_reports_unusable_preset_per_camera(
+    rt, tmp_path, content
+) -> None:
+    cameras = [_camera(rt, f'Camera{i:03d}') for i in range(3)]
+    path = tmp_path / 'Shake.fbx'
+    if content is not None:
+        path.write_bytes(content)
+
+    results = core.create_shakes(
+        cameras, core.CreateShakeData(preset=str(path), start_frame=0, weight=1)
+    )
+
+    assert [result.camera for result in results] == cameras
+    assert all(result.error and not result.layer for result in results)
+    assert all(not camera.get_layers() for camera in cameras)
+
+
+def test_create_shakes_reports_importer_errors_per_camera(
+    rt, tmp_path, monkeypatch
+) -> None:
+    def import_file(*args, **kwargs):
+        raise RuntimeError('-- Runtime error: FBX import failed')
+
+    monkeypatch.setattr(rt, 'importfile', import_file)
+    cameras = [_camera(rt, f'Camera{i:03d}') for i in range(2)]
+    path = tmp_path / 'Shake.fbx'
+    path.write_bytes(b'Not an FBX file')
+
+    results = core.create_shakes(
+        cameras, core.CreateShakeData(preset=str(path), start_frame=0, weight=1)
+    )
+
+    assert all('FBX import failed' in result.error for result in results)
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from shot_shaker import envelope
+
+
+def test_fade() -> None:
+    frames = np.arange(0, 20)
+
+    weights = envelope.fade(frames, 2, 4, 3, 4, easing='linear')
+
+    assert weights[:3] == pytest.approx([0, 0, 0])
+    assert weights[2:7] == pytest.approx([0, 0.25, 0.5, 0.75, 1])
+    assert weights[6:10] == pytest.approx([1, 1, 1, 1])
+    assert weights[9:14] == pytest.approx([1, 0.75, 0.5, 0.25, 0])
+    assert weights[13:] == pytest.approx(0)
+
+
+@pytest.mark.parametrize('easing', sorted(envelope.EASINGS))
+def test_easings_keep_end_points(easing) -> None:
+    weights = envelope.fade(np.arange(11), 0, 10, 0, 0, easing=easing)
+
+    assert (weights[0], weights[-1]) == pytest.approx((0, 1))
+    assert np.all(np.diff(weights) >= 0)
+
+
+def test_fade_without_ramps() -> None:
+    weights = envelope.fade(np.arange(6), 1, 0, 3, 0)
+
+    assert list(weights) == [0, 1, 1, 1, 1, 0]
+
+
+def test_speed() -> None:
+    # 10 frames at 30 units/frame, then 10 frames at rest.
+    x = np.concatenate([np.arange(10) * 30.0, np.full(10, 270.0)])
+    positions = np.stack([x, np.zeros(20), np.zeros(20)], axis=1)
+
+    weights = envelope.speed(positions, fps=10, low=100, high=200)
+
+    # 300 units/second at full weight, no speed at none.
+    assert weights[:9] == pytest.approx(1)
+    assert weights[11:] == pytest.approx(0)
+
+
+def test_speed_smoothing() -> None:
+    x = np.array([0, 0, 0, 10, 10, 10], dtype=np.float64)
+    positions = np.stack([x, x * 0, x * 0], axis=1)
+
+    raw = envelope.speed(positions, fps=1, low=0, high=10)
+    smoothed = envelope.speed(positions, fps=1, low=0, high=10, smoothing=1)
+
+    assert smoothed.max() < raw.max()
+    assert smoothed.sum() == pytest.approx(raw.sum())
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from shot_shaker import evaluate
+from shot_shaker.curves import Curve
+
+
+def test_sample_curve_is_hermite() -> None:
+    curve = Curve(
+        times=[0, 1, 3], values=[0, 1, 1], in_tangents=[0, 0, 0], out_tangents=[0, 2, 0]
+    )
+
+    values = evaluate.sample_curve(curve, np.array([-1, 0, 0.5, 1, 2, 3, 4]))
+
+    # Flat tangents ease in and out, values are held outside the keys.
+    assert values[[0, 1, 2, 3]] == pytest.approx([0, 0, 0.5, 1])
+    assert values[4] == pytest.approx(1 + 0.125 * 2 * 2)
+    assert values[[5, 6]] == pytest.approx([1, 1])
+
+
+def test_sample_curve_without_keys() -> None:
+    empty = Curve(times=[], values=[], in_tangents=[], out_tangents=[])
+    single = Curve(times=[1], values=[5], in_tangents=[0], out_tangents=[0])
+    times = np.array([0.0, 2.0])
+
+    assert list(evaluate.sample_curve(empty, times)) == [0, 0]
+    assert list(evaluate.sample_curve(single, times)) == [5, 5]
+
+
+def test_euler_quaternion_round_trip() -> None:
+    angles = np.array([[10, 20, 30], [-45, 80, 170], [0, 0, 0]], dtype=np.float64)
+
+    quaternions = evaluate.euler_to_quaternion(angles)
+
+    assert np.linalg.norm(quaternions, axis=-1) == pytest.approx([1, 1, 1])
+    result = evaluate.quaternion_to_euler(quaternions)
+    assert result == pytest.approx(angles)
+
+
+def test_euler_order_is_x_then_y_then_z() -> None:
+    x, y, z = (np.eye(3)[axis] * 90 for axis in range(3))
+    rotations = [evaluate.euler_to_quaternion(angles) for angles in (x, y, z)]
+
+    expected = evaluate.multiply(rotations[2], evaluate.multiply(*rotations[1::-1]))
+
+    assert evaluate.euler_to_quaternion(np.array([90.0, 90, 90])) == pytest.approx(
+        expected
+    )
+
+
+def test_compose_layers_applies_weights() -> None:
+    base = np.array([[0.0, 0, 10], [0.0, 0, 20]])
+    layer = np.array([[0.0, 0, 30], [0.0, 0, 30]])
+
+    angles = evaluate.compose_layers(base, [(layer, np.array([0.5, 0]))])
+
+    assert angles[:, 2] == pytest.approx([25, 20])
+    assert angles[:, :2] == pytest.approx(0)
+
+
+def test_compose_layers_unwraps_angles() -> None:
+    base = np.array([[0.0, 0, 170], [0.0, 0, 175]])
+    layer = np.array([[0.0, 0, 0], [0.0, 0, 10]])
+
+    angles = evaluate.compose_layers(base, [(layer, 1.0)])
+
+    assert angles[:, 2] == pytest.approx([170, 185])
+
+
+def test_add_layers() -> None:
+    base = np.array([[1.0], [2.0]])
+    layers = [(np.array([[10.0], [10.0]]), np.array([1, 0.5])), (np.ones((2, 1)), 2)]
+
+    assert evaluate.add_layers(base, layers)[:, 0] == pytest.approx([13, 9])
+
+
+def test_curve_from_samples() -> None:
+    times = np.array([0, 1, 2], dtype=np.float64)
+
+    curve = evaluate.curve_from_samples(times, times * 3)
+
+    assert list(curve.out_tangents) == [3, 3, 3]
+    assert evaluate.sample_curve(curve, np.array([0.5])) == pytest.approx([1.5])
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import math
+import struct
+
+import pytest
+
+import fbx_files
+from shot_shaker import fbx
+
+
+@pytest.fixture(params=['ascii', 'binary', 'binary-7500-compressed'])
+def write(request, tmp_path):
+    """Write the nodes of a scene in every supported encoding."""
+
+    def writer(root: fbx.Node, name: str = 'Shake') -> str:
+        path = tmp_path / f'{name}.fbx'
+        if request.param == 'ascii':
+            path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+        elif request.param == 'binary':
+            path.write_bytes(fbx_files.to_binary(root))
+        else:
+            path.write_bytes(fbx_files.to_binary(root, version=7500, compress=True))
+        return str(path)
+
+    return writer
+
+
+def test_read_rotation_curves(write) -> None:
+    keys = [(0, 1.0), (0.5, -2.0), (1, 0.5)]
+    root = fbx_files.scene(transform={'Lcl Rotation': {'d|X': keys, 'd|Y': keys}})
+
+    x, y, z = fbx.read_curves(write(root), 'Shake')
+
+    assert list(x.times) == [0, 0.5, 1]
+    assert list(x.values) == [1, -2, 0.5]
+    assert list(y.values) == list(x.values)
+    # Axes without a curve hold their default.
+    assert list(z.values) == [0]
+
+
+def test_cubic_slopes_become_tangents(tmp_path) -> None:
+    root = fbx_files.scene(transform={'Lcl Rotation': {'d|X': [(0, 0.0), (1, 1.0)]}})
+    root.find('Objects').children[-1] = fbx_files.curve(
+        101, [(0, 0.0), (1, 1.0)], slope=2
+    )
+    path = tmp_path / 'Shake.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+
+    x, _, _ = fbx.read_curves(str(path), 'Shake')
+
+    assert list(x.out_tangents) == [2, 2]
+    assert list(x.in_tangents) == [2, 2]
+
+
+def test_read_channels(write) -> None:
+    keys = [(0, 0.0), (1, 10.0)]
+    root = fbx_files.scene(
+        transform={'Lcl Translation': {'d|Z': keys}, 'Lcl Rotation': {'d|X': keys}}
+    )
+
+    channels = fbx.read_channels(write(root), 'Shake')
+
+    assert set(channels) == {'position', 'rotation'}
+    assert list(channels['position'][2].values) == [0, 10]
+
+
+def test_missing_node_and_animation(write) -> None:
+    path = write(fbx_files.scene(transform={}))
+
+    with pytest.raises(fbx.FBXError, match='No node'):
+        fbx.read_channels(path, 'Other')
+    with pytest.raises(fbx.FBXError, match='no animation'):
+        fbx.read_channels(path, 'Shake')
+
+
+def test_unsupported_version(tmp_path) -> None:
+    path = tmp_path / 'Shake.fbx'
+    path.write_bytes(fbx.BINARY_MAGIC + struct.pack('<I', 6100) + bytes(16))
+
+    with pytest.raises(fbx.FBXError, match='version'):
+        fbx.read_curves(str(path), 'Shake')
+
+
+def test_y_up_is_converted_to_z_up(write) -> None:
+    # A camera at (1, 2, 3) rotated by (10, 20, 30) in 3ds Max, exported Y-up.
+    to_y_up = [[1.0, 0, 0], [0, 0, 1.0], [0, -1.0, 0]]
+    file_angles = fbx._rotate_euler(to_y_up, [10, 20, 30], None)
+    rotation = {axis: [(0, a), (1, a)] for axis, a in zip(fbx.AXES, file_angles)}
+    translation = {'d|X': [(0, 1.0)], 'd|Y': [(0, 3.0)], 'd|Z': [(0, -2.0)]}
+    root = fbx_files.scene(
+        settings=fbx_files.Y_UP,
+        transform={'Lcl Translation': translation, 'Lcl Rotation': rotation},
+    )
+
+    channels = fbx.read_channels(write(root), 'Shake')
+
+    assert [c.values[0] for c in channels['position']] == [1, 2, 3]
+    for curve, expected in zip(channels['rotation'], (10, 20, 30)):
+        assert all(math.isclose(v, expected, abs_tol=1e-4) for v in curve.values)
+        assert all(abs(t) < 1e-3 for t in curve.out_tangents)
+
+
+def test_y_up_children_are_not_converted(write) -> None:
+    keys = {'d|X': [(0, 5.0)]}
+    root = fbx_files.scene(
+        settings=fbx_files.Y_UP, transform={'Lcl Rotation': keys}, parent=99
+    )
+
+    x, y, z = fbx.read_curves(write(root), 'Shake')
+
+    assert (x.values[0], y.values[0], z.values[0]) == (5, 0, 0)
+
+
+def test_left_handed_files_are_rejected(write) -> None:
+    settings = dict(fbx_files.Y_UP, FrontAxisSign=-1)
+    root = fbx_files.scene(
+        settings=settings, transform={'Lcl Rotation': {'d|X': [(0, 1.0)]}}
+    )
+
+    with pytest.raises(fbx.FBXError, match='Left-handed'):
+        fbx.read_curves(write(root), 'Shake')
+
+
+def _fov(write, camera: dict, attribute: dict) -> fbx.Curve:
+    root = fbx_files.scene(attribute=attribute, camera=camera)
+    return fbx.read_channels(write(root), 'Shake')['fov'][0]
+
+
+def test_horizontal_fov(write) -> None:
+    keys = [(0, 40.0), (1, 50.0)]
+
+    fov = _fov(write, {'ApertureMode': 1}, {'FieldOfView': {'d|FieldOfView': keys}})
+
+    assert list(fov.values) == [40, 50]
+
+
+def test_vertical_fov_is_converted_to_horizontal(write) -> None:
+    keys = [(0, 40.0), (1, 60.0)]
+    camera = {'ApertureMode': 2, 'FilmWidth': 1.0, 'FilmHeight': 0.5}
+
+    fov = _fov(write, camera, {'FieldOfView': {'d|FieldOfView': keys}})
+
+    def horizontal(vertical: float) -> float:
+        return math.degrees(2 * math.atan(2 * math.tan(math.radians(vertical) / 2)))
+
+    assert list(fov.values) == pytest.approx([horizontal(40), horizontal(60)])
+    # The keys are flat, so are the converted ones.
+    assert list(fov.out_tangents) == [0, 0]
+
+
+def test_fov_tangents_follow_conversion(tmp_path) -> None:
+    keys = [(0, 40.0), (1, 50.0)]
+    camera = {'ApertureMode': 2, 'FilmWidth': 1.0, 'FilmHeight': 0.5}
+    root = fbx_files.scene(
+        attribute={'FieldOfView': {'d|FieldOfView': keys}}, camera=camera
+    )
+    root.find('Objects').children[-1] = fbx_files.curve(101, keys, slope=10)
+    path = tmp_path / 'Shake.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+
+    (fov,) = fbx.read_channels(str(path), 'Shake')['fov']
+
+    step = 1e-6
+    t0, t1 = (math.tan(math.radians(v) / 2) for v in (40, 40 + step))
+    slope = math.degrees(2 * (math.atan(2 * t1) - math.atan(2 * t0))) / step
+    assert fov.out_tangents[0] == pytest.approx(10 * slope)
+
+
+def test_focal_length_is_converted_to_fov(write) -> None:
+    keys = [(0, 18.0), (1, 36.0)]
+    camera = {'ApertureMode': 3, 'FilmWidth': 36 / 25.4}
+
+    fov = _fov(write, camera, {'FocalLength': {'d|FocalLength': keys}})
+
+    assert list(fov.values) == pytest.approx([90, 2 * math.degrees(math.atan(0.5))])
+
+
+def test_distances_are_converted_to_centimeters(write) -> None:
+    keys = {'d|X': [(0, 1.0)], 'd|Y': [(0, 2.0)], 'd|Z': [(0, 3.0)]}
+    root = fbx_files.scene(
+        settings=dict(fbx_files.Z_UP, UnitScaleFactor=2.54),
+        transform={'Lcl Translation': keys},
+        attribute={'FocusDistance': {'d|FocusDistance': [(0, 10.0)]}},
+    )
+
+    channels = fbx.read_channels(write(root), 'Shake')
+
+    position = [curve.values[0] for curve in channels['position']]
+    assert position == pytest.approx([2.54, 5.08, 7.62])
+    assert channels['target_distance'][0].values[0] == pytest.approx(25.4)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from shot_shaker import lib
+from shot_shaker.curves import Curve
+
+
+def _curve(*values: float) -> Curve:
+    times = [i / 30 for i in range(len(values))]
+    zeros = [0.0] * len(values)
+    return Curve(times, list(values), zeros, list(zeros))
+
+
+def test_euler_keys_round_trip(rt) -> None:
+    node = rt.Freecamera('Camera001')
+    rotation = rt.getPropertyController(node.controller, 'Rotation')
+    curves = (_curve(0, 10, -5), _curve(1, 2, 3), _curve(90, 45, 0))
+
+    lib.write_euler_keys(rotation, curves, start_frame=10)
+
+    result = lib.read_euler_keys(rotation)
+    for curve, read in zip(curves, result):
+        assert list(read.values) == list(curve.values)
+        assert [round(t * 30) for t in read.times] == [10, 11, 12]
+    # Angles are stored in radians, like in 3ds Max.
+    stored = rotation[2]._controller.keys[0].value
+    assert math.isclose(stored, math.radians(90))
+
+
+def test_write_track_keys_replaces_single_track(rt) -> None:
+    node = rt.Freecamera('Camera001')
+    rt.AnimLayerManager.enableLayers(node, pos=False, rot=False, object=True)
+    rt.AnimLayerManager.addLayer('Shake', node, False)
+    track = lib.get_layer_tracks(node, 'Shake')['fov']
+
+    lib.write_track_keys(track, (_curve(0, 2, -1),), start_frame=5)
+
+    (curve,) = lib.read_track_keys(track, 1)
+    assert list(curve.values) == [0, 2, -1]
+    assert rt.getKeyTime(track.controller, 1) == 5
+
+
+def test_euler_tangents_are_in_degrees(rt) -> None:
+    node = rt.Freecamera('Camera001')
+    rotation = rt.getPropertyController(node.controller, 'Rotation')
+    curve = Curve([0, 1], [0, 30], [30, 30], [30, 30])
+
+    lib.write_euler_keys(rotation, (curve, curve, curve))
+
+    x, _, _ = lib.read_euler_keys(rotation)
+    assert list(x.in_tangents) == list(x.out_tangents) == [30, 30]
+
+
+def test_submit_outside_transaction_applies_right_away(rt) -> None:
+    applied = []
+
+    lib.submit('key', applied.append, 1)
+
+    assert applied == [1]
+
+
+def test_transaction_coalesces_mutations_by_key(rt) -> None:
+    applied = []
+
+    with lib.transaction('Edit'):
+        lib.submit('a', applied.append, 1)
+        lib.submit('b', applied.append, 2)
+        lib.submit('a', applied.append, 3)
+        lib.submit('c', applied.append, 4, merge=lambda old, new: old + new)
+        lib.submit('c', applied.append, 5, merge=lambda old, new: old + new)
+        # Reads inside the transaction do not see queued mutations.
+        assert applied == []
+        assert rt.redraw_disabled == 1
+
+    # Replaced mutations keep the position of the first submission.
+    assert applied == [3, 2, 9]
+    assert rt.redraw_disabled == 0
+
+
+def test_nested_transactions_join_the_outermost(rt) -> None:
+    applied = []
+
+    with lib.transaction('Outer') as outer:
+        with lib.transaction('Inner') as inner:
+            lib.submit('a', applied.append, 1)
+        assert inner is outer
+        assert applied == []
+        lib.submit('a', applied.append, 2)
+
+    assert applied == [2]
+
+
+def test_failed_transaction_discards_mutations(rt) -> None:
+    applied = []
+
+    with pytest.raises(ValueError):
+        with lib.transaction('Edit'):
+            lib.submit('a', applied.append, 1)
+            raise ValueError
+
+    assert applied == []
+    assert rt.redraw_disabled == 0
+    lib.submit('a', applied.append, 2)
+    assert applied == [2]
+
+
+def test_transaction_is_one_undo_record_and_redraw(rt) -> None:
+    from shot_shaker import core
+
+    nodes = [rt.Freecamera(f'Camera{i:03d}') for i in range(3)]
+    cameras = [core.Camera(node) for node in nodes]
+    core.create_procedural_shakes(cameras, core.ProceduralShakeData(duration=10))
+    layers = [layer for camera in cameras for layer in camera.layers]
+    rt.undo_records.clear()
+    rt.animate_modes.clear()
+    rt.redraws = 0
+
+    with lib.transaction('Edit Shake'):
+        for layer in layers:
+            layer.set_weight(0.5)
+            layer.set_start_frame(layer.start_frame + 10)
+
+    assert rt.undo_records == ['Edit Shake']
+    assert rt.animate_modes == [False]
+    assert rt.redraws == 1
+    assert all(layer.get_weight() == 0.5 for layer in layers)
+    assert all(layer.get_start_frame() == 10 for layer in layers)
+
+
+def test_transaction_without_undo(rt) -> None:
+    with lib.transaction('Batch', undo=False, redraw=False):
+        lib.submit('a', lambda value: None, 1)
+
+    assert rt.undo_records == []
+    assert rt.redraws == 0
+
+
+def _shaken_camera(rt, name: str = 'Camera001'):
+    from shot_shaker import core
+
+    camera = core.Camera(rt.Freecamera(name))
+    core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    return camera
+
+
+def test_sub_anim_index_is_reused_until_invalidated(rt) -> None:
+    node = _shaken_camera(rt).node
+    index = lib.get_sub_anim_index(node)
+
+    assert lib.get_sub_anim_index(node) is index
+    lib.get_sub_animtables(node, 'Rotation')
+    assert lib.get_sub_anim_index(node) is index
+
+    lib.invalidate_sub_anim_index(node)
+    rebuilt = lib.get_sub_anim_index(node)
+    assert rebuilt is not index
+    assert rebuilt.names == index.names
+
+    lib.invalidate_sub_anim_index()
+    assert lib.get_sub_anim_index(node) is not rebuilt
+
+
+def test_sub_anim_index_follows_added_renamed_and_deleted_layers(rt) -> None:
+    from shot_shaker import core
+
+    camera = _shaken_camera(rt)
+    (first,) = camera.layers
+    assert lib.get_sub_animtables(camera.node, first.name)
+
+    core.create_procedural_shakes([camera], core.ProceduralShakeData(duration=10))
+    camera.reload_layers()
+    second = camera.layers[-1]
+    assert second.name != first.name
+    assert len(lib.get_sub_animtables(camera.node, second.name)) == len(
+        lib.get_sub_animtables(camera.node, first.name)
+    )
+
+    lib.set_layer_name(camera.node, second.name, 'Renamed')
+    assert lib.get_sub_animtables(camera.node, second.name) == ()
+    assert lib.get_sub_animtables(camera.node, 'Renamed')
+
+    handle = rt.getHandleByAnim(camera.node)
+    camera.delete()
+    assert handle not in lib._sub_anim_indexes
+    assert lib.get_sub_animtables(None, first.name) == ()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import struct
+
+import fbx_files
+from shot_shaker import fbx, presets
+
+
+def _write_preset(directory, name: str = 'Shake', camera: str | None = None) -> str:
+    keys = [(0, 0.0), (0.5, 2.0), (1, -1.0)]
+    root = fbx_files.scene(
+        name=camera or name, transform={'Lcl Rotation': {'d|X': keys}}
+    )
+    path = directory / f'{name}.fbx'
+    path.write_text(fbx_files.to_ascii(root), encoding='utf-8')
+    return str(path)
+
+
+def test_read_info(tmp_path) -> None:
+    info = presets.read_info(_write_preset(tmp_path))
+
+    assert info.camera_match is True
+    assert (info.start_time, info.end_time) == (0, 1)
+    assert info.key_count == 3
+    assert info.peak[0] == 1.5
+    assert not info.error
+
+
+def test_read_info_without_camera(tmp_path) -> None:
+    info = presets.read_info(_write_preset(tmp_path, camera='Other'))
+
+    assert info.camera_match is False
+    assert info.error
+
+
+def test_read_info_of_unsupported_file(tmp_path) -> None:
+    # FBX 6 files are left to the importer, which might find the camera.
+    path = tmp_path / 'Shake.fbx'
+    path.write_bytes(fbx.BINARY_MAGIC + struct.pack('<I', 6100) + bytes(16))
+
+    info = presets.read_info(str(path))
+
+    assert info.camera_match is None
+    assert 'version' in info.error
+
+
+def test_index_scans_changed_files_only(tmp_path) -> None:
+    root = tmp_path / 'presets'
+    root.mkdir()
+    path = _write_preset(root, 'A')
+    _write_preset(root, 'B')
+    index_path = str(tmp_path / 'index.json')
+
+    index = presets.PresetIndex(str(root), index_path)
+    assert index.scan()
+    index.save()
+
+    loaded = presets.PresetIndex(str(root), index_path)
+    loaded.load()
+    assert [info.name for info in loaded.infos()] == ['A', 'B']
+    assert not loaded.scan()
+
+    os.remove(path)
+    assert loaded.scan()
+    assert [info.name for info in loaded.infos()] == ['B']
+
+
+def test_cancelled_scan_keeps_indexed_presets(tmp_path) -> None:
+    root = tmp_path / 'presets'
+    root.mkdir()
+    for name in 'ABC':
+        _write_preset(root, name)
+    index = presets.PresetIndex(str(root), str(tmp_path / 'index.json'))
+    index.scan()
+    os.remove(root / 'C.fbx')
+    _write_preset(root, 'D')
+    polls = []
+
+    def cancelled() -> bool:
+        polls.append(None)
+        return len(polls) > 1
+
+    assert not index.scan(cancelled)
+    assert [info.name for info in index.infos()] == ['A', 'B', 'C']
+    assert index.scan()
+    assert [info.name for info in index.infos()] == ['A', 'B', 'D']
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import pymxs
+import pytest
+
+from shot_shaker import core, lib, profiling
+
+
+@pytest.fixture(autouse=True)
+def disabled():
+    yield
+    profiling.disable()
+
+
+def test_runtime_proxy_counts_calls_per_function(rt) -> None:
+    node = rt.Freecamera('Camera001')
+    profiling.enable()
+
+    for _ in range(3):
+        lib.rt.redrawViews()
+    lib.rt.AnimLayerManager.getNodesLayers([node])
+
+    calls = profiling.stats().calls['']
+    assert calls['redrawViews'].count == 3
+    assert calls['redrawViews'].seconds >= 0
+    assert calls['AnimLayerManager.getNodesLayers'].count == 1
+    # Classes and values are not wrapped.
+    assert lib.rt.classOf(node) == rt.Freecamera
+    assert 'classOf' in calls
+
+
+def test_operation_attributes_calls_to_the_innermost_operation(rt) -> None:
+    @profiling.operation('outer')
+    def outer() -> None:
+        core.rt.redrawViews()
+        inner()
+
+    @profiling.operation('inner')
+    def inner() -> None:
+        core.rt.redrawViews()
+        core.rt.redrawViews()
+
+    profiling.enable()
+    outer()
+
+    stats = profiling.stats()
+    assert stats.operations['outer'].count == 1
+    assert stats.operations['inner'].count == 1
+    assert stats.calls['outer']['redrawViews'].count == 1
+    assert stats.calls['inner']['redrawViews'].count == 2
+    assert '' not in stats.calls
+    assert 'inner' in stats.summary()
+
+
+def test_disable_restores_the_runtime(rt) -> None:
+    profiling.enable()
+    assert isinstance(core.rt, profiling.RuntimeProxy)
+    assert isinstance(lib.rt, profiling.RuntimeProxy)
+
+    profiling.disable()
+
+    assert core.rt is pymxs.runtime
+    assert lib.rt is pymxs.runtime
+    assert profiling.stats() is None
+
+
+def test_toggling_during_an_operation_keeps_the_stack_balanced(rt) -> None:
+    with profiling.operation('outer'):
+        profiling.enable()
+        with profiling.operation('inner'):
+            pass
+    assert profiling._operations == []
+    assert list(profiling.stats().operations) == ['inner']
+
+    with profiling.operation('outer'):
+        profiling.disable()
+        profiling.enable()
+        with profiling.operation('inner'):
+            core.rt.redrawViews()
+        core.rt.redrawViews()
+    assert profiling._operations == []
+    assert profiling.stats().calls['']['redrawViews'].count == 1
+
+    with profiling.operation('outer'):
+        profiling.disable()
+    assert profiling._operations == []
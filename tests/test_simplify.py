@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import numpy as np
+
+from shot_shaker import evaluate, simplify
+from shot_shaker.curves import Curve
+
+
+def _sampled(values) -> Curve:
+    times = np.arange(len(values)) / 30
+    return evaluate.curve_from_samples(times, np.asarray(values, dtype=np.float64))
+
+
+def test_simplify_stays_within_tolerance() -> None:
+    curve = _sampled(np.sin(np.linspace(0, 6, 90)) * 5)
+
+    for tolerance in (0.001, 0.01, 0.1):
+        reduced = simplify.simplify_curve(curve, tolerance)
+        error = evaluate.sample_curve(reduced, np.asarray(curve.times)) - curve.values
+        assert len(reduced) < len(curve)
+        assert np.abs(error).max() <= tolerance
+
+
+def test_larger_tolerance_keeps_fewer_keys() -> None:
+    curve = _sampled(np.sin(np.linspace(0, 6, 90)) * 5)
+
+    counts = [len(simplify.simplify_curve(curve, t)) for t in (0.001, 0.01, 0.1)]
+
+    assert counts == sorted(counts, reverse=True)
+    assert counts[0] > counts[-1]
+
+
+def test_linear_curve_keeps_end_keys() -> None:
+    curve = _sampled(np.arange(10.0))
+
+    reduced = simplify.simplify_curve(curve, 0.001)
+
+    assert list(reduced.times) == [curve.times[0], curve.times[-1]]
+    assert list(reduced.values) == [0, 9]
+
+
+def test_zero_tolerance_keeps_all_keys() -> None:
+    curve = _sampled([0, 1, 0, 1])
+
+    assert simplify.simplify_curve(curve, 0) is curve
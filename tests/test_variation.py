@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from shot_shaker import variation
+from shot_shaker.curves import Curve
+
+FPS = 10
+
+
+def _curve(*values: float) -> Curve:
+    times = [i / FPS for i in range(len(values))]
+    tangents = [1.0] * len(values)
+    return Curve(times, list(values), tangents, list(tangents))
+
+
+def test_draw_is_deterministic_per_seed() -> None:
+    first = variation.draw(7, 10, 0.2, 0.1)
+
+    assert variation.draw(7, 10, 0.2, 0.1) == first
+    assert variation.draw(8, 10, 0.2, 0.1) != first
+    assert 0 <= first.time_offset <= 10
+    assert 0.9 <= first.rate <= 1.1
+    assert all(0.8 <= a <= 1.2 for a in first.amplitude)
+
+
+def test_variants_do_not_depend_on_count() -> None:
+    curves = (_curve(0, 1, 2, 3, 4, 5), _curve(5, 4, 3, 2, 1, 0), _curve(1, 1))
+    variations = [variation.draw(seed, 2, 0.2, 0.1) for seed in range(4)]
+
+    together = variation.apply(curves, variations, FPS)
+    alone = variation.apply(curves, variations[2:3], FPS)
+
+    for curve, expected in zip(alone[0], together[2]):
+        assert list(curve.times) == pytest.approx(list(expected.times))
+        assert list(curve.values) == pytest.approx(list(expected.values))
+
+
+def test_identity_variation_keeps_curves() -> None:
+    curves = (_curve(0, 1, 2), _curve(3, 4, 5), _curve(6))
+
+    (variant,) = variation.apply(curves, [variation.Variation(0, 0, 1, (1, 1, 1))], FPS)
+
+    for curve, expected in zip(variant, curves):
+        assert list(curve.times) == pytest.approx(expected.times)
+        assert list(curve.values) == list(expected.values)
+
+
+def test_apply_offset_rate_and_amplitude() -> None:
+    curves = (_curve(0, 1, 2, 3, 4), _curve(0), _curve(0))
+    varied = variation.Variation(seed=0, time_offset=2, rate=2, amplitude=(3, 1, 1))
+
+    ((x, y, z),) = variation.apply(curves, [varied], FPS)
+
+    # The first two frames are skipped and the rest plays twice as fast.
+    assert list(x.times) == pytest.approx([0, 0.05, 0.1])
+    assert list(x.values) == [6, 9, 12]
+    assert list(x.out_tangents) == [6, 6, 6]
+    # Single keys are kept at the start so no curve is empty.
+    assert list(y.times) == list(z.times) == [0]
+
+
+def test_amplitude_axes_of_other_channels() -> None:
+    fov = _curve(1, 2)
+    varied = variation.Variation(seed=0, time_offset=0, rate=1, amplitude=(2, 3, 4))
+
+    ((x, scaled_fov),) = variation.apply(
+        (_curve(1, 2), fov), [varied], FPS, amplitude_axes=[0, 0]
+    )
+
+    assert np.array_equal(scaled_fov.values, x.values)
+    assert list(scaled_fov.values) == [2, 4]